@@ -0,0 +1,143 @@
+"""Benchmark blocked fuzzy candidate generation on a synthetic France partition.
+
+Usage:
+
+    python scripts/benchmark_fuzzy_candidates.py --rows 50000
+
+The synthetic partition mimics a France guide year: restaurants cluster around
+a few thousand postal-code centroids, and a share of the following year is
+renamed, relocated, added, or removed. Every row is passed to
+``fuzzy_candidates`` as unmatched, which is the worst case for a churned year.
+The quadratic reference is timed only at sizes where it remains tractable, and
+its output is checked against the blocked engine.
+"""
+
+from __future__ import annotations
+
+import argparse
+from difflib import SequenceMatcher
+import time
+
+import numpy as np
+import pandas as pd
+
+from data_pipeline.changes.matching import (
+    FuzzyMatchCandidate,
+    distance_km,
+    fuzzy_candidates,
+    prepare_matching_frame,
+)
+
+
+SYLLABLES = (
+    "la", "le", "mai", "son", "au", "ber", "ge", "bis", "tro", "cha", "teau",
+    "ta", "ble", "jar", "din", "co", "mp", "toir", "pe", "tit", "gran", "ma",
+    "ri", "ne", "vi", "gne", "fleur", "sel", "pin", "roc",
+)
+STREETS = ("rue", "avenue", "place", "quai", "boulevard", "chemin")
+
+
+def _names(generator: np.random.Generator, count: int) -> list[str]:
+    lengths = generator.integers(2, 5, size=count)
+    picks = generator.integers(0, len(SYLLABLES), size=(count, 4))
+    return [
+        "".join(SYLLABLES[pick] for pick in row[:length]).title()
+        for row, length in zip(picks, lengths)
+    ]
+
+
+def synthetic_partition(rows: int, *, seed: int = 2026) -> pd.DataFrame:
+    generator = np.random.default_rng(seed)
+    postal_count = max(rows // 12, 1)
+    postal_codes = np.array([f"{code:05d}" for code in generator.choice(np.arange(1000, 96000), postal_count, replace=False)])
+    centroids_lat = generator.uniform(42.4, 51.0, size=postal_count)
+    centroids_lon = generator.uniform(-4.6, 8.0, size=postal_count)
+    area = generator.integers(0, postal_count, size=rows)
+    numbers = generator.integers(1, 200, size=rows)
+    streets = generator.integers(0, len(STREETS), size=rows)
+    street_names = _names(generator, rows)
+    return pd.DataFrame({
+        "name": _names(generator, rows),
+        "address": [
+            f"{number} {STREETS[street]} {street_name}, {postal_codes[code]}"
+            for number, street, street_name, code in zip(numbers, streets, street_names, area)
+        ],
+        "location": [f"Ville, {postal_codes[code]}" for code in area],
+        "latitude": centroids_lat[area] + generator.normal(0, 0.01, size=rows),
+        "longitude": centroids_lon[area] + generator.normal(0, 0.01, size=rows),
+    })
+
+
+def churned_partition(previous: pd.DataFrame, *, seed: int = 2027) -> pd.DataFrame:
+    generator = np.random.default_rng(seed)
+    current = previous.sample(frac=0.9, random_state=seed).reset_index(drop=True)
+    renamed = generator.random(len(current)) < 0.3
+    current.loc[renamed, "name"] = current.loc[renamed, "name"] + " " + np.array(_names(generator, int(renamed.sum())))
+    moved = generator.random(len(current)) < 0.1
+    current.loc[moved, "latitude"] += generator.normal(0, 0.02, size=int(moved.sum()))
+    additions = synthetic_partition(len(previous) // 10, seed=seed + 1)
+    return pd.concat([current, additions], ignore_index=True)
+
+
+def reference_fuzzy_candidates(
+    previous: pd.DataFrame,
+    current: pd.DataFrame,
+    previous_available: set[int],
+    current_available: set[int],
+) -> tuple[FuzzyMatchCandidate, ...]:
+    """The original all-pairs implementation, kept for comparison."""
+    candidates: list[FuzzyMatchCandidate] = []
+    for current_index in sorted(current_available):
+        new = current.loc[current_index]
+        scored: list[tuple[float, float, int, str]] = []
+        for previous_index in sorted(previous_available):
+            old = previous.loc[previous_index]
+            distance = distance_km(old, new)
+            same_postal = bool(old["postal_code"] and old["postal_code"] == new["postal_code"])
+            same_address = bool(old["normalized_address"] and old["normalized_address"] == new["normalized_address"])
+            if not (same_postal or same_address or distance <= 2.0):
+                continue
+            score = SequenceMatcher(None, old["normalized_name"], new["normalized_name"]).ratio()
+            if score < 0.72:
+                continue
+            evidence = f"name_similarity={score:.3f};distance_km={distance:.3f};same_postal={same_postal};same_address={same_address}"
+            scored.append((score, -distance, previous_index, evidence))
+        for score, _negative_distance, previous_index, evidence in sorted(scored, reverse=True)[:3]:
+            candidates.append(FuzzyMatchCandidate(previous_index, current_index, score, evidence))
+    return tuple(candidates)
+
+
+def _timed(function, *arguments) -> tuple[float, tuple[FuzzyMatchCandidate, ...]]:
+    started = time.perf_counter()
+    result = function(*arguments)
+    return time.perf_counter() - started, result
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=50_000)
+    parser.add_argument(
+        "--reference-limit", type=int, default=1_000,
+        help="largest size at which the quadratic reference is also timed",
+    )
+    args = parser.parse_args(argv)
+
+    sizes = sorted({size for size in (1_000, 2_000, 5_000, 10_000, 25_000, args.rows) if size <= args.rows})
+    print(f"{'rows':>8} {'candidates':>11} {'blocked_s':>10} {'reference_s':>12}")
+    for size in sizes:
+        previous = prepare_matching_frame(synthetic_partition(size))
+        current = prepare_matching_frame(churned_partition(previous[["name", "address", "location", "latitude", "longitude"]]))
+        arguments = (previous, current, set(previous.index), set(current.index))
+        blocked_seconds, blocked = _timed(fuzzy_candidates, *arguments)
+        reference = "-"
+        if size <= args.reference_limit:
+            reference_seconds, expected = _timed(reference_fuzzy_candidates, *arguments)
+            if expected != blocked:
+                raise SystemExit(f"Blocked candidates differ from the reference at {size} rows")
+            reference = f"{reference_seconds:.2f}"
+        print(f"{size:>8} {len(blocked):>11} {blocked_seconds:>10.2f} {reference:>12}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
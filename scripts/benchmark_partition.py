@@ -0,0 +1,139 @@
+"""Benchmark smallest-wins AOC partitioning on dense overlapping regions.
+
+Usage:
+
+    python scripts/benchmark_partition.py --input tmp/wine/<run>/candidates/aoc_regions.gpkg
+    python scripts/benchmark_partition.py --synthetic 400
+
+With ``--input`` the largest Stage 1 regions by appellation count are taken
+through repair, dissolve, closing, and simplification with the canonical
+distances, and only the partition step is timed. Without it, synthetic
+regions mimic a Burgundy-style hierarchy: a few broad regional appellations,
+village appellations inside them, and many small crus inside the villages,
+all with dense boundaries. The original accumulated-union engine is timed
+alongside the STRtree engine and every per-appellation result is checked
+against it.
+"""
+
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+import time
+
+import geopandas as gpd
+import numpy as np
+from shapely.geometry import Polygon
+from shapely.ops import unary_union
+
+from wine_pipeline.aoc_simplification.transform import (
+    OUTPUT_COLUMNS,
+    SimplificationParameters,
+    partition_appellations_smallest_first,
+    repair_geometry,
+    select_region,
+    simplify_region,
+)
+
+
+def _blob(generator: np.random.Generator, x: float, y: float, radius: float, vertices: int):
+    angles = np.linspace(0, 2 * np.pi, vertices, endpoint=False)
+    radii = radius * (1 + 0.25 * np.sin(angles * generator.integers(2, 7) + generator.uniform(0, 2 * np.pi)))
+    radii *= 1 + generator.normal(0, 0.02, size=vertices)
+    return repair_geometry(Polygon(np.column_stack((x + radii * np.cos(angles), y + radii * np.sin(angles)))))
+
+
+def synthetic_region(appellations: int, *, seed: int = 2026, vertices: int = 400) -> gpd.GeoDataFrame:
+    generator = np.random.default_rng(seed)
+    broad = max(appellations // 40, 1)
+    villages = max(appellations // 8, 1)
+    rows = []
+    centres = []
+    for index in range(appellations):
+        if index < broad:
+            x, y, radius = 800_000 + index * 20_000, 6_650_000, 40_000
+        elif index < broad + villages:
+            x, y = 800_000 + generator.uniform(-30_000, 30_000 + broad * 20_000), 6_650_000 + generator.uniform(-30_000, 30_000)
+            radius = generator.uniform(3_000, 8_000)
+        else:
+            cx, cy = centres[generator.integers(broad, broad + villages)]
+            x, y = cx + generator.normal(0, 2_000), cy + generator.normal(0, 2_000)
+            radius = generator.uniform(150, 1_200)
+        centres.append((x, y))
+        geometry = _blob(generator, x, y, radius, vertices)
+        rows.append({
+            "region": "Synthetic",
+            "app": f"App {index:04d}",
+            "display_name": f"App {index:04d}",
+            "colour": "#8a6f96",
+            "categorie": "AOP",
+            "source_area_m2": float(geometry.area),
+            "geometry": geometry,
+        })
+    return gpd.GeoDataFrame(rows, columns=OUTPUT_COLUMNS, geometry="geometry", crs="EPSG:2154")
+
+
+def stage1_regions(path: Path, count: int) -> list[gpd.GeoDataFrame]:
+    source = gpd.read_file(path, layer="aocs_france")
+    largest = source["region"].astype(str).value_counts().index[:count]
+    frames = []
+    for region in largest:
+        stages = simplify_region(select_region(source, region), parameters=SimplificationParameters(overlap_strategy="none"))
+        frames.append(stages.simplified)
+    return frames
+
+
+def reference_partition(gdf: gpd.GeoDataFrame) -> list[tuple[str, float, bool]]:
+    """The original accumulated-union engine, kept for comparison."""
+    working = gdf[OUTPUT_COLUMNS].copy().reset_index(drop=True)
+    working["_source_order"] = range(len(working))
+    working["_priority_area_m2"] = working.geometry.area.astype(float)
+    working["_app_sort"] = working["app"].astype(str)
+    working = working.sort_values(["_priority_area_m2", "_app_sort", "_source_order"], kind="mergesort")
+    results = []
+    claimed_geometry = None
+    for _, row in working.iterrows():
+        original_geometry = row.geometry
+        candidate_geometry = original_geometry if claimed_geometry is None else original_geometry.difference(claimed_geometry)
+        accepted_geometry = repair_geometry(candidate_geometry)
+        became_empty = accepted_geometry is None or accepted_geometry.is_empty
+        results.append((str(row["app"]), 0.0 if accepted_geometry is None else float(accepted_geometry.area), became_empty))
+        claimed_geometry = original_geometry if claimed_geometry is None else unary_union([claimed_geometry, original_geometry])
+    return results
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--input", type=Path, help="Stage 1 aoc_regions.gpkg; defaults to synthetic regions")
+    parser.add_argument("--regions", type=int, default=3, help="number of largest Stage 1 regions to benchmark")
+    parser.add_argument("--synthetic", type=int, default=300, help="appellations per synthetic region")
+    parser.add_argument("--skip-reference", action="store_true", help="time only the STRtree engine")
+    args = parser.parse_args(argv)
+
+    if args.input is not None:
+        frames = stage1_regions(args.input, args.regions)
+    else:
+        frames = [synthetic_region(size) for size in sorted({args.synthetic // 4, args.synthetic // 2, args.synthetic})]
+
+    print(f"{'region':<28} {'apps':>6} {'vertices':>10} {'strtree_s':>10} {'reference_s':>12}")
+    for frame in frames:
+        started = time.perf_counter()
+        _partitioned, report = partition_appellations_smallest_first(frame)
+        strtree_seconds = time.perf_counter() - started
+        reference = "-"
+        if not args.skip_reference:
+            started = time.perf_counter()
+            expected = reference_partition(frame)
+            reference = f"{time.perf_counter() - started:.2f}"
+            observed = [(item.app, item.final_area_m2, item.became_empty) for item in report.per_app]
+            for (app, area, empty), (expected_app, expected_area, expected_empty) in zip(observed, expected):
+                if app != expected_app or empty != expected_empty or not np.isclose(area, expected_area, rtol=1e-9, atol=1e-6):
+                    raise SystemExit(f"Partition of {app} differs from the reference engine")
+        vertices = int(frame.geometry.count_coordinates().sum())
+        region = str(frame["region"].iloc[0])
+        print(f"{region:<28} {len(frame):>6} {vertices:>10} {strtree_seconds:>10.2f} {reference:>12}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
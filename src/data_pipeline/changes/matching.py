@@ -2,13 +2,15 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from difflib import SequenceMatcher
 import math
 import re
 import unicodedata
 from urllib.parse import urlsplit, urlunsplit
 
+import numpy as np
+from numpy.typing import ArrayLike
 import pandas as pd
 
 
@@ -20,6 +22,13 @@ EXACT_MATCH_METHODS = (
     (("normalized_address",), "exact_address"),
     (("normalized_name", "latitude", "longitude"), "exact_name_coordinates"),
 )
+EARTH_RADIUS_KM = 6371.0
+FUZZY_RADIUS_KM = 2.0
+FUZZY_MINIMUM_SIMILARITY = 0.72
+FUZZY_CANDIDATES_PER_RESTAURANT = 3
+DISTANCE_MATRIX_CHUNK_ROWS = 1024
+# Widens the latitude band so rounding can never exclude a pair the gate accepts.
+_RADIUS_SLACK_KM = 1e-6
 
 
 @dataclass(frozen=True)
@@ -70,12 +79,44 @@ def postal_code(value: object) -> str:
     return match.group(0) if match else ""
 
 
+def distance_km_many(
+    latitude1: ArrayLike, longitude1: ArrayLike, latitude2: ArrayLike, longitude2: ArrayLike,
+) -> np.ndarray:
+    """Haversine distances in kilometres between broadcastable coordinate arrays."""
+    lat1, lon1, lat2, lon2 = (
+        np.radians(np.atleast_1d(np.asarray(values, dtype=float)))
+        for values in (latitude1, longitude1, latitude2, longitude2)
+    )
+    value = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return EARTH_RADIUS_KM * 2 * np.arctan2(np.sqrt(value), np.sqrt(1 - value))
+
+
+def distance_km_matrix(
+    latitude1: ArrayLike, longitude1: ArrayLike, latitude2: ArrayLike, longitude2: ArrayLike,
+    *, chunk_rows: int = DISTANCE_MATRIX_CHUNK_ROWS,
+) -> np.ndarray:
+    """Pairwise distances, shape ``(len(latitude1), len(latitude2))``.
+
+    Rows are evaluated in chunks so kernel temporaries stay bounded by
+    ``chunk_rows * len(latitude2)`` regardless of the first operand's size.
+    """
+    if chunk_rows < 1:
+        raise ValueError("chunk_rows must be positive")
+    lat1, lon1 = np.asarray(latitude1, dtype=float), np.asarray(longitude1, dtype=float)
+    lat2, lon2 = np.asarray(latitude2, dtype=float), np.asarray(longitude2, dtype=float)
+    result = np.empty((len(lat1), len(lat2)), dtype=float)
+    for start in range(0, len(lat1), chunk_rows):
+        stop = start + chunk_rows
+        result[start:stop] = distance_km_many(
+            lat1[start:stop, None], lon1[start:stop, None], lat2[None, :], lon2[None, :]
+        )
+    return result
+
+
 def distance_km(previous: pd.Series, current: pd.Series) -> float:
-    lat1, lon1 = math.radians(previous["latitude"]), math.radians(previous["longitude"])
-    lat2, lon2 = math.radians(current["latitude"]), math.radians(current["longitude"])
-    delta_lat, delta_lon = lat2 - lat1, lon2 - lon1
-    value = math.sin(delta_lat / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin(delta_lon / 2) ** 2
-    return 6371.0 * 2 * math.atan2(math.sqrt(value), math.sqrt(1 - value))
+    return float(distance_km_many(
+        previous["latitude"], previous["longitude"], current["latitude"], current["longitude"]
+    )[0])
 
 
 def prepare_matching_frame(frame: pd.DataFrame) -> pd.DataFrame:
@@ -94,29 +135,71 @@ def prepare_matching_frame(frame: pd.DataFrame) -> pd.DataFrame:
     return prepared
 
 
+def _composite_keys(frame: pd.DataFrame, columns: tuple[str, ...]) -> pd.Series:
+    """Pipe-joined keys for rows where every key column is non-empty."""
+    values = frame.loc[:, list(columns)].fillna("").astype(str)
+    keys = values[columns[0]]
+    for column in columns[1:]:
+        keys = keys + "|" + values[column]
+    return keys[values.ne("").all(axis=1)]
+
+
+@dataclass
+class MatchKeyCache:
+    """Composite exact-match keys for a frame pair, factorized once per column set.
+
+    Codes are shared between both frames and ordered like the key strings, so
+    joins on codes reproduce the string-keyed ordering.
+    """
+
+    previous: pd.DataFrame
+    current: pd.DataFrame
+    _codes: dict[tuple[str, ...], tuple[pd.Series, pd.Series]] = field(
+        default_factory=dict, init=False, repr=False
+    )
+
+    def for_frames(self, previous: pd.DataFrame, current: pd.DataFrame) -> "MatchKeyCache":
+        if self.previous is not previous or self.current is not current:
+            raise ValueError("MatchKeyCache was built for a different previous/current frame pair")
+        return self
+
+    def codes(self, columns: tuple[str, ...]) -> tuple[pd.Series, pd.Series]:
+        if columns not in self._codes:
+            old = _composite_keys(self.previous, columns)
+            new = _composite_keys(self.current, columns)
+            codes, _uniques = pd.factorize(pd.concat([old, new], ignore_index=True), sort=True)
+            self._codes[columns] = (
+                pd.Series(codes[:len(old)], index=old.index, dtype="int64"),
+                pd.Series(codes[len(old):], index=new.index, dtype="int64"),
+            )
+        return self._codes[columns]
+
+
+def _available_codes(codes: pd.Series, available: set[int]) -> pd.Series:
+    return codes[codes.index.isin(list(available))]
+
+
 def duplicate_conflict_count(
     previous: pd.DataFrame,
     current: pd.DataFrame,
     previous_available: set[int],
     current_available: set[int],
     columns: tuple[str, ...],
+    *,
+    keys: MatchKeyCache | None = None,
 ) -> int:
     if not previous_available or not current_available:
         return 0
-    old_values = previous.loc[sorted(previous_available), list(columns)].fillna("").astype(str)
-    new_values = current.loc[sorted(current_available), list(columns)].fillna("").astype(str)
-    old = old_values[old_values.ne("").all(axis=1)].apply(
-        lambda row: "|".join(row.tolist()), axis=1
+    old_codes, new_codes = (MatchKeyCache(previous, current) if keys is None else keys.for_frames(previous, current)).codes(columns)
+    counts = pd.concat(
+        [
+            _available_codes(old_codes, previous_available).value_counts(),
+            _available_codes(new_codes, current_available).value_counts(),
+        ],
+        axis=1, join="inner",
     )
-    new = new_values[new_values.ne("").all(axis=1)].apply(
-        lambda row: "|".join(row.tolist()), axis=1
-    )
-    old_counts, new_counts = old.value_counts(), new.value_counts()
-    conflicts = 0
-    for value in sorted(set(old_counts.index) & set(new_counts.index)):
-        if old_counts[value] != 1 or new_counts[value] != 1:
-            conflicts += int(old_counts[value] + new_counts[value])
-    return conflicts
+    conflicted = counts[counts.ne(1).any(axis=1)]
+    return int(conflicted.to_numpy().sum())
 
 
 def unique_matches(
@@ -125,21 +208,80 @@ def unique_matches(
     previous_available: set[int],
     current_available: set[int],
     columns: tuple[str, ...],
+    *,
+    keys: MatchKeyCache | None = None,
 ) -> list[tuple[int, int]]:
     if not previous_available or not current_available:
         return []
-    old_values = previous.loc[sorted(previous_available), list(columns)].fillna("").astype(str)
-    new_values = current.loc[sorted(current_available), list(columns)].fillna("").astype(str)
-    old = old_values[old_values.ne("").all(axis=1)].apply(
-        lambda row: "|".join(row.tolist()), axis=1
-    )
-    new = new_values[new_values.ne("").all(axis=1)].apply(
-        lambda row: "|".join(row.tolist()), axis=1
+    old_codes, new_codes = (MatchKeyCache(previous, current) if keys is None else keys.for_frames(previous, current)).codes(columns)
+    old = _available_codes(old_codes, previous_available)
+    new = _available_codes(new_codes, current_available)
+    old, new = old[~old.duplicated(keep=False)], new[~new.duplicated(keep=False)]
+    pairs = pd.merge(
+        pd.DataFrame({"key": old.to_numpy(), "previous": old.index}),
+        pd.DataFrame({"key": new.to_numpy(), "current": new.index}),
+        on="key",
+    ).sort_values("key")
+    return list(zip(pairs["previous"].tolist(), pairs["current"].tolist()))
+
+
+@dataclass(frozen=True)
+class _FuzzyBlocks:
+    """Previous-year rows bucketed by every key that can pass the fuzzy gate."""
+
+    indices: tuple[int, ...]
+    names: tuple[str, ...]
+    addresses: np.ndarray
+    postal_codes: np.ndarray
+    latitudes: np.ndarray
+    longitudes: np.ndarray
+    by_postal: dict[str, list[int]]
+    by_address: dict[str, list[int]]
+    latitude_order: np.ndarray
+    sorted_latitudes: np.ndarray
+
+
+def _fuzzy_blocks(previous: pd.DataFrame, previous_available: set[int]) -> _FuzzyBlocks:
+    indices = tuple(sorted(previous_available))
+    rows = previous.loc[list(indices)]
+    postal_codes = rows["postal_code"].to_numpy(dtype=object)
+    addresses = rows["normalized_address"].to_numpy(dtype=object)
+    by_postal: dict[str, list[int]] = {}
+    by_address: dict[str, list[int]] = {}
+    for position, (postal, address) in enumerate(zip(postal_codes, addresses)):
+        if postal:
+            by_postal.setdefault(postal, []).append(position)
+        if address:
+            by_address.setdefault(address, []).append(position)
+    latitudes = rows["latitude"].to_numpy(dtype=float)
+    longitudes = rows["longitude"].to_numpy(dtype=float)
+    latitude_order = np.argsort(latitudes, kind="stable")
+    return _FuzzyBlocks(
+        indices=indices,
+        names=tuple(rows["normalized_name"].tolist()),
+        addresses=addresses,
+        postal_codes=postal_codes,
+        latitudes=latitudes,
+        longitudes=longitudes,
+        by_postal=by_postal,
+        by_address=by_address,
+        latitude_order=latitude_order,
+        sorted_latitudes=latitudes[latitude_order],
     )
-    old_counts, new_counts = old.value_counts(), new.value_counts()
-    old_map = {value: index for index, value in old.items() if old_counts[value] == 1}
-    new_map = {value: index for index, value in new.items() if new_counts[value] == 1}
-    return [(old_map[value], new_map[value]) for value in sorted(set(old_map) & set(new_map))]
+
+
+def _latitude_band(blocks: _FuzzyBlocks, latitude: float) -> np.ndarray:
+    """Return previous positions whose latitude alone allows the fuzzy radius.
+
+    Great-circle distance is never shorter than the latitude difference, so
+    the band is a superset of every row within the radius.
+    """
+    if math.isnan(latitude):
+        return np.empty(0, dtype=np.intp)
+    band = math.degrees((FUZZY_RADIUS_KM + _RADIUS_SLACK_KM) / EARTH_RADIUS_KM)
+    start = np.searchsorted(blocks.sorted_latitudes, latitude - band, side="left")
+    stop = np.searchsorted(blocks.sorted_latitudes, latitude + band, side="right")
+    return blocks.latitude_order[start:stop]
 
 
 def fuzzy_candidates(
@@ -148,23 +290,54 @@ def fuzzy_candidates(
     previous_available: set[int],
     current_available: set[int],
 ) -> tuple[FuzzyMatchCandidate, ...]:
+    """Rank previous rows that plausibly renamed into each unmatched current row.
+
+    Only pairs sharing a postal code or normalized address, or lying within
+    the fuzzy radius, are scored, so the cost follows block sizes rather than
+    the product of both unmatched sets.
+    """
+    if not previous_available or not current_available:
+        return ()
+    blocks = _fuzzy_blocks(previous, previous_available)
+    current_indices = sorted(current_available)
+    rows = current.loc[current_indices]
     candidates: list[FuzzyMatchCandidate] = []
-    for current_index in sorted(current_available):
-        new = current.loc[current_index]
+    matcher = SequenceMatcher(None)
+    for current_index, new_name, new_address, new_postal, new_latitude, new_longitude in zip(
+        current_indices,
+        rows["normalized_name"].tolist(),
+        rows["normalized_address"].tolist(),
+        rows["postal_code"].tolist(),
+        rows["latitude"].to_numpy(dtype=float).tolist(),
+        rows["longitude"].to_numpy(dtype=float).tolist(),
+    ):
+        keyed = blocks.by_postal.get(new_postal, []) + blocks.by_address.get(new_address, [])
+        positions = np.union1d(_latitude_band(blocks, new_latitude), np.asarray(keyed, dtype=np.intp))
+        if not len(positions):
+            continue
+        distances = distance_km_many(
+            blocks.latitudes[positions], blocks.longitudes[positions], new_latitude, new_longitude
+        )
+        same_postal = (blocks.postal_codes[positions] == new_postal) & bool(new_postal)
+        same_address = (blocks.addresses[positions] == new_address) & bool(new_address)
+        passed = same_postal | same_address | (distances <= FUZZY_RADIUS_KM)
+        if not passed.any():
+            continue
+        matcher.set_seq2(new_name)
         scored: list[tuple[float, float, int, str]] = []
-        for previous_index in sorted(previous_available):
-            old = previous.loc[previous_index]
-            distance = distance_km(old, new)
-            same_postal = bool(old["postal_code"] and old["postal_code"] == new["postal_code"])
-            same_address = bool(old["normalized_address"] and old["normalized_address"] == new["normalized_address"])
-            if not (same_postal or same_address or distance <= 2.0):
-                continue
-            score = SequenceMatcher(None, old["normalized_name"], new["normalized_name"]).ratio()
-            if score < 0.72:
+        for position, distance, postal_agrees, address_agrees in zip(
+            positions[passed].tolist(), distances[passed].tolist(),
+            same_postal[passed].tolist(), same_address[passed].tolist(),
+        ):
+            matcher.set_seq1(blocks.names[position])
+            score = matcher.ratio()
+            if score < FUZZY_MINIMUM_SIMILARITY:
                 continue
-            evidence = f"name_similarity={score:.3f};distance_km={distance:.3f};same_postal={same_postal};same_address={same_address}"
-            scored.append((score, -distance, previous_index, evidence))
-        for score, _negative_distance, previous_index, evidence in sorted(scored, reverse=True)[:3]:
+            evidence = f"name_similarity={score:.3f};distance_km={distance:.3f};same_postal={postal_agrees};same_address={address_agrees}"
+            scored.append((score, -distance, blocks.indices[position], evidence))
+        for score, _negative_distance, previous_index, evidence in sorted(scored, reverse=True)[
+            :FUZZY_CANDIDATES_PER_RESTAURANT
+        ]:
             candidates.append(FuzzyMatchCandidate(previous_index, current_index, score, evidence))
     return tuple(candidates)
 
@@ -186,16 +359,24 @@ def reconcile_restaurants(
         previous_available.remove(match.previous_index)
         current_available.remove(match.current_index)
 
+    keys = MatchKeyCache(previous, current)
     for columns, method in EXACT_MATCH_METHODS:
-        for old, new in unique_matches(previous, current, previous_available, current_available, columns):
+        for old, new in unique_matches(
+            previous, current, previous_available, current_available, columns, keys=keys
+        ):
             matches.append(RestaurantMatch(old, new, method, 1.0, "+".join(columns)))
             previous_available.remove(old)
             current_available.remove(new)
 
-    for old, new in unique_matches(
-        previous, current, previous_available, current_available, ("normalized_name",)
-    ):
-        distance = distance_km(previous.loc[old], current.loc[new])
+    name_matches = unique_matches(
+        previous, current, previous_available, current_available, ("normalized_name",), keys=keys
+    )
+    old_rows = previous.loc[[old for old, _new in name_matches]]
+    new_rows = current.loc[[new for _old, new in name_matches]]
+    name_distances = distance_km_many(
+        old_rows["latitude"], old_rows["longitude"], new_rows["latitude"], new_rows["longitude"]
+    ).tolist()
+    for (old, new), distance in zip(name_matches, name_distances):
         if distance <= 5.0:
             matches.append(RestaurantMatch(
                 old, new, "exact_name_nearby", 1.0,
@@ -207,7 +388,7 @@ def reconcile_restaurants(
     duplicate_conflicts = 0
     for columns, _method in (*EXACT_MATCH_METHODS, (("normalized_name",), "exact_name_nearby")):
         duplicate_conflicts += duplicate_conflict_count(
-            previous, current, previous_available, current_available, columns
+            previous, current, previous_available, current_available, columns, keys=keys
         )
 
     return RestaurantReconciliation(
@@ -9,6 +9,7 @@ from pathlib import Path
 import shutil
 import tempfile
 
+import numpy as np
 import pandas as pd
 from pandas.testing import assert_frame_equal
 
@@ -121,101 +122,116 @@ def _read_overrides(
     return result
 
 
-def _classification(stars: float) -> str:
-    if stars >= 1:
-        return "starred"
-    if stars == 0.5:
-        return "bib_gourmand"
-    if stars == 0.25:
-        return "selected"
-    return "other"
-
-
-def _optional_green(row: pd.Series) -> int | None:
-    if "greenstar" not in row.index or pd.isna(row["greenstar"]):
-        return None
-    return int(row["greenstar"])
-
-
-def _change_types(previous: pd.Series, current: pd.Series) -> list[str]:
-    changes: list[str] = []
-    old_stars, new_stars = float(previous["stars"]), float(current["stars"])
-    if old_stars < 1 <= new_stars:
-        changes.extend(("newly_starred", "promoted"))
-    elif old_stars >= 1 and new_stars >= 1 and new_stars > old_stars:
-        changes.append("promoted")
-    elif old_stars >= 1 and new_stars < old_stars:
-        changes.append("demoted")
-    if _classification(old_stars) != _classification(new_stars):
-        changes.append("classification_changed")
-    if previous["normalized_name"] != current["normalized_name"]:
-        changes.append("renamed")
-    if (
-        previous["normalized_address"] != current["normalized_address"]
-        or previous["postal_code"] != current["postal_code"]
-    ):
-        changes.append("relocated")
-    old_green, new_green = _optional_green(previous), _optional_green(current)
-    if old_green is not None and new_green is not None:
-        if old_green == 0 and new_green == 1:
-            changes.append("green_star_gained")
-        elif old_green == 1 and new_green == 0:
-            changes.append("green_star_lost")
-    return changes or ["unchanged"]
-
-
-def _material(change_types: list[str], previous_stars: float | None, current_stars: float | None) -> bool:
-    material_types = {
-        "promoted", "demoted", "newly_starred", "green_star_gained", "green_star_lost",
-    }
-    if material_types.intersection(change_types):
-        return True
-    if "new_entry" in change_types and (current_stars or 0) >= 1:
-        return True
-    if "removed_from_guide" in change_types and (previous_stars or 0) >= 1:
-        return True
-    if "needs_review" in change_types and max(previous_stars or 0, current_stars or 0) >= 1:
-        return True
-    return False
-
-
-def _record(
-    *, previous_year: int, current_year: int,
-    previous: pd.Series | None, current: pd.Series | None,
-    record_type: str, changes: list[str], method: str,
-    confidence: float, review_status: str, evidence: str,
-) -> dict[str, object]:
-    def value(row: pd.Series | None, column: str) -> object:
-        return None if row is None or column not in row.index or pd.isna(row[column]) else row[column]
-    previous_stars = value(previous, "stars")
-    current_stars = value(current, "stars")
-    return {
-        "record_type": record_type,
+SIDE_COLUMNS = (
+    "source_row", "name", "address", "location", "department", "region", "award",
+    "stars", "greenstar", "normalized_name", "normalized_address", "postal_code",
+)
+MATERIAL_CHANGE_TYPES = (
+    "promoted", "demoted", "newly_starred", "green_star_gained", "green_star_lost",
+)
+
+
+def _classification(stars: pd.Series) -> pd.Series:
+    return pd.Series(
+        np.select(
+            [stars.ge(1), stars.eq(0.5), stars.eq(0.25)],
+            ["starred", "bib_gourmand", "selected"],
+            default="other",
+        ),
+        index=stars.index,
+    )
+
+
+def _has_change_type(change_types: pd.Series, *labels: str) -> pd.Series:
+    return change_types.str.contains(r"(?:^|\|)(?:" + "|".join(labels) + r")(?:\||$)")
+
+
+def _aligned(frame: pd.DataFrame, labels: list[int | None]) -> pd.DataFrame:
+    """Report-side columns of ``frame`` in record order; absent rows and columns are missing."""
+    return frame.reindex(columns=list(SIDE_COLUMNS)).reindex(labels).reset_index(drop=True)
+
+
+def _change_types(previous: pd.DataFrame, current: pd.DataFrame) -> pd.Series:
+    """Pipe-joined change types for aligned matched rows."""
+    old_stars, new_stars = previous["stars"].astype(float), current["stars"].astype(float)
+    newly_starred = old_stars.lt(1) & new_stars.ge(1)
+    promoted = ~newly_starred & old_stars.ge(1) & new_stars.ge(1) & new_stars.gt(old_stars)
+    demoted = ~newly_starred & ~promoted & old_stars.ge(1) & new_stars.lt(old_stars)
+    # An absent greenstar column, or a missing value, is unknown rather than zero.
+    green_known = previous["greenstar"].notna() & current["greenstar"].notna()
+    old_green = np.trunc(previous["greenstar"].astype(float))
+    new_green = np.trunc(current["greenstar"].astype(float))
+    flags = (
+        (newly_starred, "newly_starred"),
+        (newly_starred | promoted, "promoted"),
+        (demoted, "demoted"),
+        (_classification(old_stars).ne(_classification(new_stars)), "classification_changed"),
+        (previous["normalized_name"].ne(current["normalized_name"]), "renamed"),
+        (
+            previous["normalized_address"].ne(current["normalized_address"])
+            | previous["postal_code"].ne(current["postal_code"]),
+            "relocated",
+        ),
+        (green_known & old_green.eq(0) & new_green.eq(1), "green_star_gained"),
+        (green_known & old_green.eq(1) & new_green.eq(0), "green_star_lost"),
+    )
+    joined = pd.Series("", index=previous.index, dtype=object)
+    for flag, label in flags:
+        joined = joined + np.where(flag, label + "|", "")
+    return joined.str[:-1].mask(joined.eq(""), "unchanged")
+
+
+def _material(change_types: pd.Series, previous_stars: pd.Series, current_stars: pd.Series) -> pd.Series:
+    old_stars, new_stars = previous_stars.astype(float).fillna(0), current_stars.astype(float).fillna(0)
+    return (
+        _has_change_type(change_types, *MATERIAL_CHANGE_TYPES)
+        | (_has_change_type(change_types, "new_entry") & new_stars.ge(1))
+        | (_has_change_type(change_types, "removed_from_guide") & old_stars.ge(1))
+        | (_has_change_type(change_types, "needs_review") & np.maximum(old_stars, new_stars).ge(1))
+    )
+
+
+def _first_present(preferred: pd.Series, fallback: pd.Series) -> pd.Series:
+    return preferred.where(preferred.notna() & preferred.ne(""), fallback)
+
+
+def _records(
+    previous: pd.DataFrame, current: pd.DataFrame, *,
+    previous_year: int, current_year: int,
+    previous_labels: list[int | None], current_labels: list[int | None],
+    record_types: list[str], change_types: pd.Series, methods: list[str],
+    confidences: list[float], review_statuses: list[str], evidence: list[str],
+) -> pd.DataFrame:
+    old = _aligned(previous, previous_labels)
+    new = _aligned(current, current_labels)
+    change_types = change_types.reset_index(drop=True)
+    return pd.DataFrame({
+        "record_type": record_types,
         "previous_year": previous_year,
         "current_year": current_year,
-        "previous_row": value(previous, "source_row"),
-        "current_row": value(current, "source_row"),
-        "previous_name": value(previous, "name"),
-        "current_name": value(current, "name"),
-        "previous_address": value(previous, "address"),
-        "current_address": value(current, "address"),
-        "previous_location": value(previous, "location"),
-        "current_location": value(current, "location"),
-        "department": value(current, "department") or value(previous, "department"),
-        "region": value(current, "region") or value(previous, "region"),
-        "previous_award": value(previous, "award"),
-        "current_award": value(current, "award"),
-        "previous_stars": previous_stars,
-        "current_stars": current_stars,
-        "previous_greenstar": value(previous, "greenstar"),
-        "current_greenstar": value(current, "greenstar"),
-        "change_types": "|".join(changes),
-        "material": _material(changes, previous_stars, current_stars),
-        "matching_method": method,
-        "matching_confidence": round(confidence, 4),
-        "review_status": review_status,
+        "previous_row": old["source_row"],
+        "current_row": new["source_row"],
+        "previous_name": old["name"],
+        "current_name": new["name"],
+        "previous_address": old["address"],
+        "current_address": new["address"],
+        "previous_location": old["location"],
+        "current_location": new["location"],
+        "department": _first_present(new["department"], old["department"]),
+        "region": _first_present(new["region"], old["region"]),
+        "previous_award": old["award"],
+        "current_award": new["award"],
+        "previous_stars": old["stars"],
+        "current_stars": new["stars"],
+        "previous_greenstar": old["greenstar"],
+        "current_greenstar": new["greenstar"],
+        "change_types": change_types,
+        "material": _material(change_types, old["stars"], new["stars"]),
+        "matching_method": methods,
+        "matching_confidence": [round(confidence, 4) for confidence in confidences],
+        "review_status": review_statuses,
         "match_evidence": evidence,
-    }
+    }, columns=list(OUTPUT_COLUMNS))
 
 
 def compare_products(
@@ -232,44 +248,56 @@ def compare_products(
     except ValueError as error:
         raise ChangesValidationError(str(error)) from error
 
-    records: list[dict[str, object]] = []
-    for match in sorted(reconciliation.matches, key=lambda item: (item.previous_index, item.current_index)):
-        old, new = match.previous_index, match.current_index
-        changes = _change_types(previous.loc[old], current.loc[new])
-        records.append(_record(
-            previous_year=previous_year, current_year=current_year,
-            previous=previous.loc[old], current=current.loc[new], record_type="comparison",
-            changes=changes, method=match.method, confidence=match.confidence,
-            review_status="reviewed" if match.method == "override" else "not_required",
-            evidence=match.evidence,
-        ))
-    for index in reconciliation.previous_unmatched:
-        records.append(_record(
-            previous_year=previous_year, current_year=current_year,
-            previous=previous.loc[index], current=None, record_type="comparison",
-            changes=["removed_from_guide"], method="unmatched", confidence=0.0,
-            review_status="unmatched", evidence="no deterministic match",
-        ))
-    for index in reconciliation.current_unmatched:
-        records.append(_record(
-            previous_year=previous_year, current_year=current_year,
-            previous=None, current=current.loc[index], record_type="comparison",
-            changes=["new_entry"], method="unmatched", confidence=0.0,
-            review_status="unmatched", evidence="no deterministic match",
-        ))
-    fuzzy = [
-        _record(
-            previous_year=previous_year, current_year=current_year,
-            previous=previous.loc[candidate.previous_index],
-            current=current.loc[candidate.current_index],
-            record_type="match_candidate", changes=["needs_review"],
-            method="fuzzy_candidate", confidence=candidate.confidence,
-            review_status="needs_review", evidence=candidate.evidence,
-        )
-        for candidate in reconciliation.fuzzy_candidates
-    ]
-    records.extend(fuzzy)
-    changes = pd.DataFrame(records, columns=OUTPUT_COLUMNS)
+    matches = sorted(reconciliation.matches, key=lambda item: (item.previous_index, item.current_index))
+    candidates = reconciliation.fuzzy_candidates
+    previous_unmatched = list(reconciliation.previous_unmatched)
+    current_unmatched = list(reconciliation.current_unmatched)
+    matched_changes = _change_types(
+        _aligned(previous, [match.previous_index for match in matches]),
+        _aligned(current, [match.current_index for match in matches]),
+    )
+    primary_count = len(matches) + len(previous_unmatched) + len(current_unmatched)
+    changes = _records(
+        previous, current, previous_year=previous_year, current_year=current_year,
+        previous_labels=[
+            *(match.previous_index for match in matches), *previous_unmatched,
+            *([None] * len(current_unmatched)), *(candidate.previous_index for candidate in candidates),
+        ],
+        current_labels=[
+            *(match.current_index for match in matches), *([None] * len(previous_unmatched)),
+            *current_unmatched, *(candidate.current_index for candidate in candidates),
+        ],
+        record_types=["comparison"] * primary_count + ["match_candidate"] * len(candidates),
+        change_types=pd.concat([
+            matched_changes,
+            pd.Series(
+                ["removed_from_guide"] * len(previous_unmatched)
+                + ["new_entry"] * len(current_unmatched)
+                + ["needs_review"] * len(candidates),
+                dtype=object,
+            ),
+        ], ignore_index=True),
+        methods=[
+            *(match.method for match in matches),
+            *(["unmatched"] * (len(previous_unmatched) + len(current_unmatched))),
+            *(["fuzzy_candidate"] * len(candidates)),
+        ],
+        confidences=[
+            *(match.confidence for match in matches),
+            *([0.0] * (len(previous_unmatched) + len(current_unmatched))),
+            *(candidate.confidence for candidate in candidates),
+        ],
+        review_statuses=[
+            *("reviewed" if match.method == "override" else "not_required" for match in matches),
+            *(["unmatched"] * (len(previous_unmatched) + len(current_unmatched))),
+            *(["needs_review"] * len(candidates)),
+        ],
+        evidence=[
+            *(match.evidence for match in matches),
+            *(["no deterministic match"] * (len(previous_unmatched) + len(current_unmatched))),
+            *(candidate.evidence for candidate in candidates),
+        ],
+    )
     changes.sort_values(
         ["record_type", "material", "change_types", "current_name", "previous_name"],
         ascending=[True, False, True, True, True], na_position="last", inplace=True,
@@ -292,7 +320,7 @@ def compare_products(
         new_entries=len(new), removed_entries=len(removed),
         exact_matches=int(matched["matching_method"].ne("override").sum()),
         overridden_matches=int(matched["matching_method"].eq("override").sum()),
-        fuzzy_candidates=len(fuzzy), unresolved_starred=unresolved_starred,
+        fuzzy_candidates=len(candidates), unresolved_starred=unresolved_starred,
     )
     return changes, validation
 
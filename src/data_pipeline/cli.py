@@ -7,10 +7,12 @@ from datetime import date
 from pathlib import Path
 import sys
 
+from .geometry_cache import GEOMETRY_CACHE_ROOT
 from .stage1.fidelity import compare_partition_roots
 from .stage1.acquisition import run_stage1_acquisition
 from .stage1.pipeline import Stage1PublicationError, run_stage1, validate_stage1
 from .stage1.validation import Stage1ValidationError
+from .stage2.aggregation import LOCATIONS_ENCODINGS
 from .stage2.pipeline import Stage2PublicationError, run_stage2, validate_stage2
 from .stage2.monaco import run_monaco_stage2, validate_monaco_stage2
 from .stage2.validation import Stage2ValidationError
@@ -114,6 +116,23 @@ def _parser() -> argparse.ArgumentParser:
         default=Path("data/products"),
         help="publication root (default: data/products)",
     )
+    departments.add_argument(
+        "--geometry-cache-root",
+        type=Path,
+        default=GEOMETRY_CACHE_ROOT,
+        help=f"disposable prepared-geometry cache keyed by source SHA-256 (default: {GEOMETRY_CACHE_ROOT})",
+    )
+    departments.add_argument(
+        "--no-geometry-cache",
+        action="store_true",
+        help="always parse and validate boundary GeoJSON",
+    )
+    departments.add_argument(
+        "--locations-encoding",
+        choices=LOCATIONS_ENCODINGS,
+        default="dict",
+        help="locations payload: historical Python dict string or JSON encoded polylines (default: dict)",
+    )
     departments.add_argument(
         "--validate-only",
         action="store_true",
@@ -141,6 +160,7 @@ def _parser() -> argparse.ArgumentParser:
     monaco.add_argument(
         "--output-root", type=Path, default=Path("data/products")
     )
+    monaco.add_argument("--locations-encoding", choices=LOCATIONS_ENCODINGS, default="dict")
     monaco.add_argument("--validate-only", action="store_true")
     monaco.add_argument("--replace", action="store_true")
 
@@ -171,6 +191,9 @@ def _parser() -> argparse.ArgumentParser:
         "--paris-geometry-path", type=Path,
         default=Path("data/raw/geodata/paris_arrondissements.geojson"),
     )
+    arrondissements.add_argument("--geometry-cache-root", type=Path, default=GEOMETRY_CACHE_ROOT)
+    arrondissements.add_argument("--no-geometry-cache", action="store_true")
+    arrondissements.add_argument("--locations-encoding", choices=LOCATIONS_ENCODINGS, default="dict")
     arrondissements.add_argument("--validate-only", action="store_true")
     arrondissements.add_argument("--replace", action="store_true")
 
@@ -352,6 +375,8 @@ def _run_departments(args: argparse.Namespace) -> int:
         "insee_year": args.insee_year,
         "geometry_path": args.geometry_path,
         "region_geometry_path": args.region_geometry_path,
+        "locations_encoding": args.locations_encoding,
+        "geometry_cache_root": None if args.no_geometry_cache else args.geometry_cache_root,
     }
     try:
         if args.validate_only:
@@ -392,6 +417,7 @@ def _run_monaco(args: argparse.Namespace) -> int:
         "year": args.year,
         "partition_root": args.partition_root,
         "geometry_path": args.geometry_path,
+        "locations_encoding": args.locations_encoding,
     }
     try:
         if args.validate_only:
@@ -433,6 +459,8 @@ def _run_arrondissements(args: argparse.Namespace) -> int:
             "department_reference_path": args.department_reference_path,
             "department_geometry_path": args.department_geometry_path,
             "paris_geometry_path": args.paris_geometry_path,
+            "locations_encoding": args.locations_encoding,
+            "geometry_cache_root": None if args.no_geometry_cache else args.geometry_cache_root,
         }
         if args.validate_only:
             result = validate_stage3(**inputs)
@@ -0,0 +1,147 @@
+"""Disposable on-disk cache of validated, reprojected boundary geometry.
+
+Boundary GeoJSON is parsed, validated, and reprojected to Lambert-93 on every
+Stage 2 and Stage 3 run. ``load_prepared_geometry`` stores the result of
+that work keyed by the source file's SHA-256, so repeat runs over an unchanged
+source only hash the file and decode WKB. Entries are never trusted across
+source changes, and the cache root is always safe to delete.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from dataclasses import dataclass
+import hashlib
+import json
+import os
+from pathlib import Path
+import tempfile
+import zipfile
+
+import geopandas as gpd
+import numpy as np
+import pandas as pd
+import shapely
+
+
+GEOMETRY_CACHE_ROOT = Path("tmp/geometry_cache")
+PROJECTED_CRS = "EPSG:2154"
+CACHE_FORMAT_VERSION = 1
+
+
+@dataclass(frozen=True)
+class PreparedGeometry:
+    """Validated source-CRS features with aligned Lambert-93 geometry and areas."""
+
+    frame: gpd.GeoDataFrame
+    projected: gpd.GeoSeries
+    area_sq_km: np.ndarray
+
+    def spatial_index(self) -> shapely.STRtree:
+        """Lambert-93 tree; STR packing is cheap next to parsing, so it is rebuilt."""
+
+        return shapely.STRtree(self.projected.to_numpy())
+
+
+def sha256_file(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as handle:
+        for chunk in iter(lambda: handle.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def load_prepared_geometry(
+    path: Path,
+    *,
+    kind: str,
+    prepare: Callable[[gpd.GeoDataFrame], gpd.GeoDataFrame],
+    cache_root: Path | None = None,
+) -> PreparedGeometry:
+    """Read, validate, and reproject ``path``, reusing a cached result if present.
+
+    ``prepare`` receives the raw GeoDataFrame and returns the validated frame
+    or raises; only frames it accepts are cached. ``kind`` names the preparation
+    and must change whenever ``prepare`` changes what it accepts or returns.
+    ``cache_root=None`` disables the cache.
+    """
+
+    entry = None
+    if cache_root is not None:
+        entry = cache_root / f"{kind}-v{CACHE_FORMAT_VERSION}-{sha256_file(path)}.npz"
+        if entry.is_file():
+            try:
+                return _read_entry(entry)
+            except (OSError, ValueError, KeyError, zipfile.BadZipFile, shapely.errors.GEOSException):
+                entry.unlink(missing_ok=True)
+
+    frame = prepare(gpd.read_file(path))
+    projected = frame.geometry.to_crs(PROJECTED_CRS)
+    prepared = PreparedGeometry(frame, projected, projected.area.to_numpy() / 1_000_000)
+    if entry is not None:
+        _write_entry(entry, prepared)
+    return prepared
+
+
+def _packed_wkb(geometry: gpd.GeoSeries) -> tuple[np.ndarray, np.ndarray]:
+    encoded = shapely.to_wkb(geometry.to_numpy())
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(value) for value in encoded], out=offsets[1:])
+    return np.frombuffer(b"".join(encoded), dtype=np.uint8), offsets
+
+
+def _unpacked_wkb(buffer: np.ndarray, offsets: np.ndarray) -> np.ndarray:
+    data = buffer.tobytes()
+    return shapely.from_wkb([data[start:stop] for start, stop in zip(offsets[:-1].tolist(), offsets[1:].tolist())])
+
+
+def _write_entry(entry: Path, prepared: PreparedGeometry) -> None:
+    frame = prepared.frame
+    attributes = pd.DataFrame(frame.drop(columns=frame.geometry.name))
+    metadata = {
+        "geometry_column": frame.geometry.name,
+        "order": frame.columns.tolist(),
+        "crs": frame.crs.to_wkt() if frame.crs is not None else None,
+        "index": None if frame.index.equals(pd.RangeIndex(len(frame))) else frame.index.tolist(),
+        "columns": {column: str(dtype) for column, dtype in attributes.dtypes.items()},
+        "values": {column: attributes[column].astype(object).where(attributes[column].notna(), None).tolist()
+                   for column in attributes.columns},
+    }
+    source_wkb, source_offsets = _packed_wkb(frame.geometry)
+    projected_wkb, projected_offsets = _packed_wkb(prepared.projected)
+    entry.parent.mkdir(parents=True, exist_ok=True)
+    descriptor, temporary = tempfile.mkstemp(prefix=f".{entry.stem}-", suffix=".npz", dir=entry.parent)
+    try:
+        with os.fdopen(descriptor, "wb") as handle:
+            np.savez(
+                handle,
+                metadata=np.array(json.dumps(metadata, ensure_ascii=False)),
+                source_wkb=source_wkb,
+                source_offsets=source_offsets,
+                projected_wkb=projected_wkb,
+                projected_offsets=projected_offsets,
+                area_sq_km=prepared.area_sq_km,
+            )
+        os.replace(temporary, entry)
+    except BaseException:
+        Path(temporary).unlink(missing_ok=True)
+        raise
+
+
+def _read_entry(entry: Path) -> PreparedGeometry:
+    with np.load(entry, allow_pickle=False) as archive:
+        metadata = json.loads(str(archive["metadata"]))
+        source = _unpacked_wkb(archive["source_wkb"], archive["source_offsets"])
+        projected = _unpacked_wkb(archive["projected_wkb"], archive["projected_offsets"])
+        area_sq_km = archive["area_sq_km"]
+    index = pd.RangeIndex(len(area_sq_km)) if metadata["index"] is None else pd.Index(metadata["index"])
+    attributes = pd.DataFrame(
+        {column: pd.Series(metadata["values"][column], index=index, dtype=object).astype(dtype)
+         for column, dtype in metadata["columns"].items()},
+        index=index,
+    )
+    name = metadata["geometry_column"]
+    attributes[name] = gpd.GeoSeries(source, index=index, crs=metadata["crs"])
+    frame = gpd.GeoDataFrame(attributes.loc[:, metadata["order"]], geometry=name, crs=metadata["crs"])
+    projected_geometry = gpd.GeoSeries(projected, index=index, crs=PROJECTED_CRS, name=name)
+    return PreparedGeometry(frame, projected_geometry, area_sq_km)
@@ -10,6 +10,7 @@ import re
 import shutil
 import tempfile
 
+import numpy as np
 import pandas as pd
 import requests
 
@@ -162,6 +163,32 @@ def download_upstream_snapshot(
     return SourceInfo(url=source_url, revision=revision)
 
 
+def _normalized_values(values: pd.Series) -> pd.Series:
+    """normalized_text for a column, evaluated once per distinct value."""
+    codes, uniques = pd.factorize(values)
+    normalized = np.array([normalized_text(value) for value in uniques] + [""], dtype=object)
+    return pd.Series(normalized[codes], index=values.index)
+
+
+def _columns_changed(
+    previous: pd.DataFrame,
+    candidate: pd.DataFrame,
+    columns: tuple[str, ...],
+    *,
+    normalize: bool,
+) -> pd.Series:
+    """Flag aligned rows differing in any of ``columns`` present in both frames."""
+    changed = pd.Series(False, index=previous.index)
+    for column in columns:
+        if column not in previous.columns or column not in candidate.columns:
+            continue
+        old, new = previous[column], candidate[column]
+        if normalize:
+            old, new = _normalized_values(old), _normalized_values(new)
+        changed |= old.ne(new)
+    return changed
+
+
 def compare_france_partitions(
     previous: pd.DataFrame,
     candidate: pd.DataFrame,
@@ -180,38 +207,30 @@ def compare_france_partitions(
     candidate_matched = prepare_matching_frame(candidate)
     reconciliation = reconcile_restaurants(previous_matched, candidate_matched)
 
-    award_change_count = 0
-    other_change_count = 0
-    unchanged_count = 0
-    categories: set[str] = set()
-    transition_counts: dict[str, int] = {}
-
-    for match in reconciliation.matches:
-        previous_row = previous_matched.loc[match.previous_index]
-        candidate_row = candidate_matched.loc[match.current_index]
-        award_changed = any(
-            previous_row[column] != candidate_row[column]
-            for column in AWARD_COMPARISON_COLUMNS
-            if column in previous_row.index and column in candidate_row.index
-        )
-        if award_changed:
-            award_change_count += 1
-            previous_award = str(previous_row["award"])
-            candidate_award = str(candidate_row["award"])
-            categories.update((previous_award, candidate_award))
-            transition = f"{previous_award} -> {candidate_award}"
-            transition_counts[transition] = transition_counts.get(transition, 0) + 1
-            continue
-
-        non_award_changed = any(
-            normalized_text(previous_row[column]) != normalized_text(candidate_row[column])
-            for column in NON_AWARD_COMPARISON_COLUMNS
-            if column in previous_row.index and column in candidate_row.index
-        )
-        if non_award_changed:
-            other_change_count += 1
-        else:
-            unchanged_count += 1
+    previous_pairs = previous_matched.loc[
+        [match.previous_index for match in reconciliation.matches]
+    ].reset_index(drop=True)
+    candidate_pairs = candidate_matched.loc[
+        [match.current_index for match in reconciliation.matches]
+    ].reset_index(drop=True)
+    award_changed = _columns_changed(
+        previous_pairs, candidate_pairs, AWARD_COMPARISON_COLUMNS, normalize=False
+    )
+    non_award_changed = ~award_changed & _columns_changed(
+        previous_pairs, candidate_pairs, NON_AWARD_COMPARISON_COLUMNS, normalize=True
+    )
+    award_change_count = int(award_changed.sum())
+    other_change_count = int(non_award_changed.sum())
+    unchanged_count = len(award_changed) - award_change_count - other_change_count
+    transitions = pd.DataFrame({
+        "previous_award": previous_pairs.loc[award_changed, "award"].astype(str),
+        "candidate_award": candidate_pairs.loc[award_changed, "award"].astype(str),
+    }).groupby(["previous_award", "candidate_award"]).size()
+    categories = {award for pair in transitions.index for award in pair}
+    transition_counts = {
+        f"{previous_award} -> {candidate_award}": int(count)
+        for (previous_award, candidate_award), count in transitions.items()
+    }
 
     matched_count = len(reconciliation.matches)
     match_denominator = max(len(previous), len(candidate), 1)
@@ -0,0 +1,187 @@
+"""Shared Michelin category counts and coordinate payloads for Stage 2 and Stage 3 products."""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+import json
+from pathlib import Path
+
+import geopandas as gpd
+import numpy as np
+import pandas as pd
+
+from .schema import star_categories
+
+
+def star_category_codes(stars: pd.Series, year: int) -> np.ndarray:
+    """Position of each ``stars`` value in ``star_categories(year)``, or -1."""
+
+    values = pd.Index([value for value, _label, _column in star_categories(year)])
+    return values.get_indexer(stars.to_numpy(dtype=float))
+
+
+def star_category_counts(
+    restaurants: pd.DataFrame,
+    key: str | Sequence[str],
+    *,
+    year: int,
+) -> pd.DataFrame:
+    """Count categories, stars, and Green Stars per group in a single pass.
+
+    Groups are the sorted distinct values of ``key`` present in ``restaurants``,
+    as with ``groupby(key, sort=True)``, which also drops rows with any null
+    key part. Rows whose ``stars`` value is not a
+    category of ``year`` are not counted; callers that must reject them
+    validate first. ``green_stars`` is only produced from 2025 onwards.
+    """
+
+    categories = star_categories(year)
+    if isinstance(key, str):
+        group_codes, groups = pd.factorize(restaurants[key], sort=True)
+        groups = pd.Index(groups, name=key)
+    else:
+        keys = restaurants.loc[:, list(key)]
+        # groupby drops a row when any key part is null; MultiIndex.factorize would keep it.
+        complete = keys.notna().all(axis=1).to_numpy()
+        group_codes = np.full(len(keys), -1, dtype=np.intp)
+        group_codes[complete], groups = pd.MultiIndex.from_frame(keys.loc[complete]).factorize(sort=True)
+        groups = groups.set_names(list(key))
+    category_codes = star_category_codes(restaurants["stars"], year)
+
+    counted = (group_codes >= 0) & (category_codes >= 0)
+    cells = group_codes[counted] * len(categories) + category_codes[counted]
+    counts = np.bincount(cells, minlength=len(groups) * len(categories)).reshape(len(groups), len(categories))
+
+    result = pd.DataFrame(counts, columns=[column for _value, _label, column in categories], index=groups)
+    if year >= 2025:
+        grouped = group_codes >= 0
+        green = restaurants["greenstar"].eq(1).to_numpy()[grouped]
+        result["green_stars"] = np.bincount(group_codes[grouped], weights=green, minlength=len(groups)).astype(int)
+    star_weights = np.array([int(value) if value >= 1 else 0 for value, _label, _column in categories])
+    result["total_stars"] = counts @ star_weights
+    result["starred_restaurants"] = counts @ (star_weights > 0).astype(int)
+    return result.reset_index()
+
+
+LOCATIONS_ENCODINGS = ("dict", "polyline")
+POLYLINE_PRECISION = 7
+
+
+def location_payloads(
+    restaurants: pd.DataFrame,
+    key: str,
+    groups: pd.Series,
+    *,
+    year: int,
+    labels: Sequence[tuple[float, object]] | None = None,
+    encoding: str = "dict",
+) -> list[str]:
+    """Build one ``locations`` payload per entry of ``groups``.
+
+    ``labels`` pairs a ``stars`` value with its payload key and defaults to the
+    category labels of ``year``. Restaurants are ordered by (group, category)
+    with a single stable sort, so coordinates keep their source order inside
+    each list. ``encoding="dict"`` reproduces the historical ``str(dict)`` of
+    ``(latitude, longitude)`` tuples; ``encoding="polyline"`` emits a JSON
+    object of encoded polylines (precision 7) read by ``decode_locations``.
+    Categories without restaurants are ``None``/``null`` in both encodings.
+    """
+
+    if encoding not in LOCATIONS_ENCODINGS:
+        raise ValueError(f"Unsupported locations encoding: {encoding!r}")
+    if labels is None:
+        labels = [(value, label) for value, label, _column in star_categories(year)]
+    group_codes, group_values = pd.factorize(restaurants[key])
+    category_codes = pd.Index([value for value, _label in labels]).get_indexer(
+        restaurants["stars"].to_numpy(dtype=float)
+    )
+    counted = (group_codes >= 0) & (category_codes >= 0)
+    cells = group_codes[counted] * len(labels) + category_codes[counted]
+    order = np.argsort(cells, kind="stable")
+    cells = cells[order]
+    latitudes = restaurants["latitude"].to_numpy(dtype=float)[counted][order]
+    longitudes = restaurants["longitude"].to_numpy(dtype=float)[counted][order]
+    starts = np.flatnonzero(np.r_[True, cells[1:] != cells[:-1]]) if len(cells) else np.array([], dtype=int)
+    stops = np.r_[starts[1:], len(cells)]
+
+    coordinates: dict[int, object] = {}
+    if encoding == "dict":
+        latitude_values, longitude_values = latitudes.tolist(), longitudes.tolist()
+        for start, stop in zip(starts.tolist(), stops.tolist()):
+            coordinates[int(cells[start])] = list(zip(latitude_values[start:stop], longitude_values[start:stop]))
+    else:
+        for start, stop in zip(starts.tolist(), stops.tolist()):
+            coordinates[int(cells[start])] = encode_polyline(latitudes[start:stop], longitudes[start:stop])
+
+    payloads: list[str] = []
+    for code in pd.Index(group_values).get_indexer(groups).tolist():
+        payload = {
+            label: coordinates.get(code * len(labels) + position) if code >= 0 else None
+            for position, (_value, label) in enumerate(labels)
+        }
+        payloads.append(str(payload) if encoding == "dict" else json.dumps(payload, ensure_ascii=False))
+    return payloads
+
+
+def encode_polyline(latitudes: np.ndarray, longitudes: np.ndarray) -> str:
+    """Encode coordinates with the encoded-polyline algorithm at ``POLYLINE_PRECISION``."""
+
+    scale = 10 ** POLYLINE_PRECISION
+    points = np.column_stack((
+        np.rint(np.asarray(latitudes, dtype=float) * scale),
+        np.rint(np.asarray(longitudes, dtype=float) * scale),
+    )).astype(np.int64)
+    deltas = np.diff(points, axis=0, prepend=np.zeros((1, 2), dtype=np.int64)).ravel()
+    shifted = np.where(deltas < 0, ~(deltas << 1), deltas << 1)
+    characters: list[str] = []
+    for value in shifted.tolist():
+        while value >= 0x20:
+            characters.append(chr((0x20 | (value & 0x1F)) + 63))
+            value >>= 5
+        characters.append(chr(value + 63))
+    return "".join(characters)
+
+
+def decode_polyline(encoded: str) -> list[tuple[float, float]]:
+    """Decode an encoded polyline at ``POLYLINE_PRECISION`` into ``(latitude, longitude)`` pairs."""
+
+    values: list[int] = []
+    value = shift = 0
+    for character in encoded:
+        chunk = ord(character) - 63
+        value |= (chunk & 0x1F) << shift
+        shift += 5
+        if chunk < 0x20:
+            values.append(~(value >> 1) if value & 1 else value >> 1)
+            value = shift = 0
+    if value or shift or len(values) % 2:
+        raise ValueError("Truncated encoded polyline")
+    scale = 10 ** POLYLINE_PRECISION
+    points = np.cumsum(np.array(values, dtype=np.int64).reshape(-1, 2), axis=0)
+    return [(latitude / scale, longitude / scale) for latitude, longitude in points.tolist()]
+
+
+def decode_locations(payload: str | dict) -> dict[str, list[tuple[float, float]] | None]:
+    """Decode a ``locations`` value written with ``encoding="polyline"``.
+
+    GeoJSON writers store the JSON text as a native object, so the value read
+    back from a published product may already be a ``dict``.
+    """
+
+    encoded_categories = json.loads(payload) if isinstance(payload, str) else payload
+    return {
+        label: None if encoded is None else decode_polyline(encoded)
+        for label, encoded in encoded_categories.items()
+    }
+
+
+def read_product(path: Path) -> gpd.GeoDataFrame:
+    """Read a published GeoJSON product with ``locations`` restored to text."""
+
+    product = gpd.read_file(path)
+    if "locations" in product.columns:
+        product["locations"] = [
+            json.dumps(value, ensure_ascii=False) if isinstance(value, dict) else value
+            for value in product["locations"]
+        ]
+    return product
@@ -14,6 +14,7 @@ from geopandas.testing import assert_geodataframe_equal
 import pandas as pd
 from pandas.testing import assert_frame_equal
 
+from .aggregation import location_payloads, read_product, star_category_counts
 from .pipeline import Stage2PublicationError
 from .schema import STATS_COLUMNS, departmental_property_columns, star_categories
 from .validation import Stage2ValidationError, require_columns
@@ -137,46 +138,30 @@ def aggregate_monaco(
     geometry: gpd.GeoDataFrame,
     *,
     year: int,
+    locations_encoding: str = "dict",
 ) -> gpd.GeoDataFrame:
     _validate_monaco_geometry(geometry)
-    working = restaurants.copy()
     allowed_stars = {category[0] for category in star_categories(year)}
-    unexpected_stars = sorted(set(working["stars"]) - allowed_stars)
+    unexpected_stars = sorted(set(restaurants["stars"]) - allowed_stars)
     if unexpected_stars:
         raise Stage2ValidationError(
             f"Monaco restaurants contain unexpected stars values: {unexpected_stars}"
         )
-    if year >= 2025 and not working["greenstar"].isin((0, 1)).all():
+    if year >= 2025 and not restaurants["greenstar"].isin((0, 1)).all():
         raise Stage2ValidationError("Monaco restaurants contain unexpected Green Star values")
-    count_columns: list[str] = []
-    for star_value, _label, column in star_categories(year):
-        working[column] = working["stars"].eq(star_value).astype(int)
-        count_columns.append(column)
-    if year >= 2025:
-        working["green_stars"] = working["greenstar"].eq(1).astype(int)
-        count_columns.append("green_stars")
-
-    grouped = working.groupby(["department_num", "department"], sort=True)[count_columns].sum().reset_index()
+    grouped = star_category_counts(restaurants, ["department_num", "department"], year=year)
     if len(grouped) != 1:
         raise Stage2ValidationError("Monaco aggregation must produce exactly one administrative row")
-    if int(grouped.loc[0, [category[2] for category in star_categories(year)]].sum()) != len(working):
+    if int(grouped.loc[0, [category[2] for category in star_categories(year)]].sum()) != len(restaurants):
         raise Stage2ValidationError("Monaco Michelin category counts do not reconcile to restaurant rows")
     grouped["capital"] = "Monaco"
     grouped["region"] = MONACO_REGION
-    grouped["total_stars"] = grouped["1_star"] + 2 * grouped["2_star"] + 3 * grouped["3_star"]
-    grouped["starred_restaurants"] = grouped["1_star"] + grouped["2_star"] + grouped["3_star"]
     for column in STATS_COLUMNS:
         grouped[column] = 0.0
 
-    coordinate_groups = (
-        working.groupby("stars", sort=False)[["latitude", "longitude"]]
-        .apply(lambda frame: list(zip(frame["latitude"], frame["longitude"])))
-        .to_dict()
+    grouped["locations"] = location_payloads(
+        restaurants, "department_num", grouped["department_num"], year=year, encoding=locations_encoding
     )
-    grouped["locations"] = str({
-        label: coordinate_groups.get(star_value)
-        for star_value, label, _column in star_categories(year)
-    })
     grouped.rename(columns={"department_num": "code"}, inplace=True)
     grouped["geometry"] = geometry.geometry.iloc[0]
     product = gpd.GeoDataFrame(
@@ -197,6 +182,7 @@ def validate_monaco_stage2(
     year: int,
     partition_root: Path = Path("data/partitions"),
     geometry_path: Path = Path("data/raw/geodata/monaco.geojson"),
+    locations_encoding: str = "dict",
 ) -> MonacoResult:
     if year < 2025:
         raise Stage2ValidationError(
@@ -209,7 +195,7 @@ def validate_monaco_stage2(
     partition = pd.read_csv(partition_path)
     geometry = gpd.read_file(geometry_path)
     restaurants = prepare_monaco_restaurants(partition, year=year)
-    aggregate = aggregate_monaco(restaurants, geometry, year=year)
+    aggregate = aggregate_monaco(restaurants, geometry, year=year, locations_encoding=locations_encoding)
     return MonacoResult(
         year=year,
         restaurants=restaurants,
@@ -233,7 +219,7 @@ def _write_monaco_products(result: MonacoResult, root: Path) -> dict[str, Path]:
         )
         assert_geodataframe_equal(
             result.aggregate.reset_index(drop=True),
-            gpd.read_file(paths["aggregate"]),
+            read_product(paths["aggregate"]),
             check_dtype=False,
             check_less_precise=True,
         )
@@ -249,9 +235,11 @@ def run_monaco_stage2(
     geometry_path: Path = Path("data/raw/geodata/monaco.geojson"),
     output_root: Path = Path("data/products"),
     replace: bool = False,
+    locations_encoding: str = "dict",
 ) -> MonacoResult:
     prepared = validate_monaco_stage2(
-        year=year, partition_root=partition_root, geometry_path=geometry_path
+        year=year, partition_root=partition_root, geometry_path=geometry_path,
+        locations_encoding=locations_encoding,
     )
     final = monaco_product_paths(year, output_root)
     existing = {name: path for name, path in final.items() if path.exists()}
@@ -3,7 +3,6 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-import hashlib
 import json
 import os
 from pathlib import Path
@@ -13,9 +12,12 @@ import tempfile
 
 import geopandas as gpd
 from geopandas.testing import assert_geodataframe_equal
+import numpy as np
 import pandas as pd
 from pandas.testing import assert_frame_equal
 
+from ..geometry_cache import PreparedGeometry, load_prepared_geometry, sha256_file
+from .aggregation import location_payloads, read_product, star_category_counts
 from .schema import (
     FRANCE_INSEE_METRIC_COLUMNS,
     FRANCE_INSEE_PRODUCT_COLUMNS,
@@ -31,6 +33,7 @@ from .validation import (
     Stage2Validation,
     Stage2ValidationError,
     require_columns,
+    validate_department_geometry,
     validate_department_output,
     validate_reference_data,
     validate_region_geometry,
@@ -73,14 +76,6 @@ def product_paths(year: int, output_root: Path) -> dict[str, Path]:
     }
 
 
-def _sha256_file(path: Path) -> str:
-    digest = hashlib.sha256()
-    with path.open("rb") as file:
-        for chunk in iter(lambda: file.read(1024 * 1024), b""):
-            digest.update(chunk)
-    return digest.hexdigest()
-
-
 def _insee_product_paths(root: Path, year: int) -> InseeProductSelection:
     year_root = root / str(year)
     return InseeProductSelection(
@@ -151,7 +146,7 @@ def load_insee_product(selection: InseeProductSelection) -> pd.DataFrame:
             f"INSEE product manifest row count {manifest.get('rows')} does not match CSV rows {len(product)}"
         )
     expected_hash = manifest.get("output_hash")
-    if expected_hash and expected_hash != _sha256_file(selection.csv_path):
+    if expected_hash and expected_hash != sha256_file(selection.csv_path):
         raise Stage2ValidationError("INSEE product CSV hash does not match manifest output_hash")
 
     require_columns(product, FRANCE_INSEE_PRODUCT_COLUMNS, "INSEE departmental product")
@@ -179,44 +174,98 @@ def load_insee_product(selection: InseeProductSelection) -> pd.DataFrame:
     return product.loc[:, FRANCE_INSEE_PRODUCT_COLUMNS]
 
 
-def _strip_nbsp(value: object) -> object:
-    return value.replace("\xa0", "") if isinstance(value, str) else value
+def _strip_nbsp(frame: pd.DataFrame) -> pd.DataFrame:
+    stripped = frame.copy()
+    for column in stripped.columns[stripped.dtypes.eq(object)]:
+        values = stripped[column]
+        inferred = pd.api.types.infer_dtype(values, skipna=True)
+        if inferred == "string":
+            stripped[column] = values.str.replace("\xa0", "", regex=False)
+        elif inferred == "mixed":
+            # A mixed column need not hold any text, so the .str accessor may refuse it.
+            stripped[column] = values.map(lambda value: value.replace("\xa0", "") if isinstance(value, str) else value)
+    return stripped
+
+
+def _split_addresses(addresses: pd.Series) -> pd.DataFrame:
+    """Split text on its last three commas, stripping each comma-separated part."""
+    parts = addresses.str.rsplit(",", n=3, expand=True).reindex(columns=range(4))
+    return pd.DataFrame({
+        "normalized_address": parts[0].str.strip().str.replace(r"\s*,\s*", ", ", regex=True),
+        "parsed_city": parts[1].str.strip(),
+        "postal_code": parts[2].str.strip(),
+        "country": parts[3].str.strip(),
+    }, index=addresses.index)
+
+
+def _address_errors(addresses: pd.Series) -> pd.Series:
+    """First failed address contract per row, or NA when the address parses."""
+    is_text = addresses.map(type).eq(str)
+    text = addresses.where(is_text, "")
+    postal_counts = text.str.count(POSTAL_CODE_PATTERN.pattern)
+    postal_codes = text.str.extract(f"({POSTAL_CODE_PATTERN.pattern})", expand=False)
+    splittable = text.str.count(",").ge(3)
+    parts = _split_addresses(text.where(splittable, ",,,"))
+    ambiguous = (
+        parts["normalized_address"].eq("")
+        | parts["parsed_city"].eq("")
+        | parts["postal_code"].ne(postal_codes)
+        | parts["country"].ne("France")
+    )
+    quoted = addresses.map(repr)
+    errors = np.select(
+        [~is_text, postal_counts.ne(1), ~splittable, ambiguous],
+        [
+            "Restaurant address is not text: " + quoted,
+            "Restaurant address must contain exactly one postal code: " + quoted,
+            "Restaurant address cannot be split into address, city, postal code, country: " + quoted,
+            "Ambiguous restaurant address: " + quoted,
+        ],
+        default="",
+    )
+    return pd.Series(errors, index=addresses.index, dtype=object).replace("", pd.NA)
 
 
-def _parse_address(address: object) -> tuple[str, str, str]:
-    if not isinstance(address, str):
-        raise Stage2ValidationError(f"Restaurant address is not text: {address!r}")
-    cleaned = address.replace("\xa0", "")
-    postal_codes = POSTAL_CODE_PATTERN.findall(cleaned)
-    if len(postal_codes) != 1:
-        raise Stage2ValidationError(
-            f"Restaurant address must contain exactly one postal code: {address!r}"
-        )
-    parts = [part.strip() for part in cleaned.split(",")]
-    if len(parts) < 4:
+def parse_restaurant_addresses(restaurants: pd.DataFrame, *, year: int) -> pd.DataFrame:
+    """Parse every restaurant address, applying confirmed overrides by key.
+
+    Every malformed address is reported in a single Stage2ValidationError.
+    """
+
+    overrides = pd.DataFrame(
+        [
+            (name, address, *parsed)
+            for (override_year, name, address), parsed in LACAVE_ADDRESS_OVERRIDES.items()
+            if override_year == year
+        ],
+        columns=["name", "address", "normalized_address", "parsed_city", "postal_code"],
+    )
+    keyed = restaurants.loc[:, ["name", "address"]].merge(
+        overrides, on=["name", "address"], how="left", validate="many_to_one", sort=False,
+    )
+    keyed.index = restaurants.index
+    overridden = keyed["postal_code"].notna()
+
+    errors = _address_errors(restaurants.loc[~overridden, "address"]).dropna()
+    if not errors.empty:
+        if len(errors) == 1:
+            raise Stage2ValidationError(errors.iloc[0])
         raise Stage2ValidationError(
-            f"Restaurant address cannot be split into address, city, postal code, country: {address!r}"
+            f"{len(errors)} restaurant addresses are malformed: " + "; ".join(errors)
         )
-    main_address = ", ".join(parts[:-3])
-    city, postal_code, country = parts[-3:]
-    if not main_address or not city or postal_code != postal_codes[0] or country != "France":
-        raise Stage2ValidationError(f"Ambiguous restaurant address: {address!r}")
-    return main_address, city, postal_code
-
 
-def _parse_restaurant_address(row: pd.Series, year: int) -> tuple[str, str, str]:
-    override = LACAVE_ADDRESS_OVERRIDES.get((year, row["name"], row["address"]))
-    if override is not None:
-        return override
-    return _parse_address(row["address"])
+    parsed = keyed.loc[:, ["normalized_address", "parsed_city", "postal_code"]].astype(object)
+    split = _split_addresses(restaurants.loc[~overridden, "address"])
+    parsed.loc[~overridden] = split.drop(columns="country")
+    return parsed
 
 
-def _department_code(postal_code: str) -> str:
-    if postal_code.startswith(("200", "201")):
-        return "2A"
-    if postal_code.startswith("202"):
-        return "2B"
-    return postal_code[:2]
+def _department_codes(postal_codes: pd.Series) -> pd.Series:
+    return (
+        postal_codes.str[:2]
+        .mask(postal_codes.str.startswith(("200", "201")), "2A")
+        .mask(postal_codes.str.startswith("202"), "2B")
+    )
 
 
 def enrich_restaurants(
@@ -232,19 +281,13 @@ def enrich_restaurants(
         invalid = sorted(partition.loc[~partition["country"].eq("France"), "country"].unique())
         raise Stage2ValidationError(f"France partition contains other countries: {invalid}")
 
-    working = partition.loc[:, restaurant_input_columns(year)].copy()
-    working = working.map(_strip_nbsp)
-    parsed = working.apply(_parse_restaurant_address, axis=1, year=year)
-    parsed_frame = pd.DataFrame(
-        parsed.tolist(),
-        columns=["normalized_address", "parsed_city", "postal_code"],
-        index=working.index,
-    )
+    working = _strip_nbsp(partition.loc[:, restaurant_input_columns(year)])
+    parsed_frame = parse_restaurant_addresses(working, year=year)
     working["address"] = parsed_frame["normalized_address"]
     working["location"] = (
         parsed_frame["parsed_city"] + ", " + parsed_frame["postal_code"]
     )
-    working["department_num"] = parsed_frame["postal_code"].map(_department_code)
+    working["department_num"] = _department_codes(parsed_frame["postal_code"])
 
     reference = departments.copy()
     reference["department_num"] = reference["department_num"].astype("string")
@@ -277,23 +320,12 @@ def aggregate_departments(
     geometry: gpd.GeoDataFrame,
     *,
     year: int,
+    locations_encoding: str = "dict",
 ) -> gpd.GeoDataFrame:
     """Build counts, coordinate groups, accepted statistics, and geometry."""
 
-    working = restaurants.copy()
-    count_columns: list[str] = []
-    for star_value, _label, column in star_categories(year):
-        working[column] = working["stars"].eq(star_value).astype(int)
-        count_columns.append(column)
-    if year >= 2025:
-        working["green_stars"] = working["greenstar"].eq(1).astype(int)
-        count_columns.append("green_stars")
-
-    grouped = (
-        working.groupby("department_num", sort=True)[count_columns]
-        .sum()
-        .reset_index()
-    )
+    grouped = star_category_counts(restaurants, "department_num", year=year)
+    count_columns = [column for column in grouped.columns if column != "department_num"]
 
     accepted = statistics.copy()
     accepted["department_code"] = accepted["department_code"].astype("string")
@@ -307,30 +339,12 @@ def aggregate_departments(
     )
     departmental["department"] = departmental["department_name"]
     departmental[count_columns] = departmental[count_columns].fillna(0).astype(int)
-    departmental["total_stars"] = (
-        departmental["1_star"]
-        + departmental["2_star"] * 2
-        + departmental["3_star"] * 3
-    )
-    departmental["starred_restaurants"] = (
-        departmental["1_star"] + departmental["2_star"] + departmental["3_star"]
-    )
 
-    coordinate_groups = (
-        working.groupby(["department_num", "stars"], sort=False)[["latitude", "longitude"]]
-        .apply(lambda frame: list(zip(frame["latitude"], frame["longitude"])))
-        .to_dict()
+    departmental["locations"] = location_payloads(
+        restaurants, "department_num", departmental["department_code"],
+        year=year, encoding=locations_encoding,
     )
 
-    def location_payload(department_num: str) -> str:
-        payload = {
-            label: coordinate_groups.get((department_num, star_value))
-            for star_value, label, _column in star_categories(year)
-        }
-        return str(payload)
-
-    departmental["locations"] = departmental["department_code"].map(location_payload)
-
     category_columns = [category[2] for category in star_categories(year)]
     ordered = ["department_code", "department", "capital", "region"]
     ordered.extend(category_columns)
@@ -369,21 +383,11 @@ def aggregate_regions(
     geometry: gpd.GeoDataFrame,
     *,
     year: int,
+    locations_encoding: str = "dict",
 ) -> gpd.GeoDataFrame:
     """Aggregate restaurant and population-weighted statistics by region."""
 
-    working = restaurants.copy()
-    count_columns: list[str] = []
-    for star_value, _label, column in star_categories(year):
-        working[column] = working["stars"].eq(star_value).astype(int)
-        count_columns.append(column)
-    if year >= 2025:
-        working["green_stars"] = working["greenstar"].eq(1).astype(int)
-        count_columns.append("green_stars")
-
-    counts = working.groupby("region", sort=True)[count_columns].sum().reset_index()
-    counts["total_stars"] = counts["1_star"] + 2 * counts["2_star"] + 3 * counts["3_star"]
-    counts["starred_restaurants"] = counts["1_star"] + counts["2_star"] + counts["3_star"]
+    counts = star_category_counts(restaurants, "region", year=year)
 
     stats = statistics.copy()
     population = "municipal_population"
@@ -412,16 +416,8 @@ def aggregate_regions(
         regional_stats[column] = regional_stats.pop(f"_{column}") / regional_stats[population]
 
     regional = counts.merge(regional_stats, on="region", how="left", validate="one_to_one")
-    coordinate_groups = (
-        working.groupby(["region", "stars"], sort=False)[["latitude", "longitude"]]
-        .apply(lambda frame: list(zip(frame["latitude"], frame["longitude"])))
-        .to_dict()
-    )
-    regional["locations"] = regional["region"].map(
-        lambda region: str({
-            label: coordinate_groups.get((region, star_value))
-            for star_value, label, _column in star_categories(year)
-        })
+    regional["locations"] = location_payloads(
+        restaurants, "region", regional["region"], year=year, encoding=locations_encoding,
     )
     regional["region"] = regional["region"].replace(REGION_TRANSLATIONS)
 
@@ -444,6 +440,29 @@ def aggregate_regions(
     return product
 
 
+def _validated_department_geometry(geometry: gpd.GeoDataFrame) -> gpd.GeoDataFrame:
+    validate_department_geometry(geometry)
+    geometry["code"] = geometry["code"].astype("string")
+    return geometry
+
+
+def _validated_region_geometry(geometry: gpd.GeoDataFrame) -> gpd.GeoDataFrame:
+    validate_region_geometry(geometry)
+    return geometry
+
+
+def load_department_geometry(path: Path, *, cache_root: Path | None = None) -> PreparedGeometry:
+    return load_prepared_geometry(
+        path, kind="stage2-departments", prepare=_validated_department_geometry, cache_root=cache_root
+    )
+
+
+def load_region_geometry(path: Path, *, cache_root: Path | None = None) -> PreparedGeometry:
+    return load_prepared_geometry(
+        path, kind="stage2-regions", prepare=_validated_region_geometry, cache_root=cache_root
+    )
+
+
 def _load_inputs(
     *,
     year: int,
@@ -453,6 +472,7 @@ def _load_inputs(
     insee_year: int | None,
     geometry_path: Path,
     region_geometry_path: Path,
+    geometry_cache_root: Path | None = None,
 ) -> tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame, gpd.GeoDataFrame, gpd.GeoDataFrame]:
     insee_product = resolve_insee_product(product_root=insee_product_root, insee_year=insee_year)
     paths = {
@@ -468,11 +488,9 @@ def _load_inputs(
     partition = pd.read_csv(paths["France partition"])
     departments = pd.read_csv(departments_path, dtype={"department_num": "string"})
     statistics = load_insee_product(insee_product)
-    geometry = gpd.read_file(geometry_path)
-    region_geometry = gpd.read_file(region_geometry_path)
-    geometry["code"] = geometry["code"].astype("string")
-    validate_reference_data(departments, statistics, geometry)
-    validate_region_geometry(region_geometry)
+    geometry = load_department_geometry(geometry_path, cache_root=geometry_cache_root).frame
+    region_geometry = load_region_geometry(region_geometry_path, cache_root=geometry_cache_root).frame
+    validate_reference_data(departments, statistics, geometry, geometry_validated=True)
     return partition, departments, statistics, geometry, region_geometry
 
 
@@ -485,6 +503,8 @@ def validate_stage2(
     insee_year: int | None = None,
     geometry_path: Path = Path("data/raw/geodata/departments.geojson"),
     region_geometry_path: Path = Path("data/raw/geodata/regions.geojson"),
+    locations_encoding: str = "dict",
+    geometry_cache_root: Path | None = None,
 ) -> Stage2Result:
     if year < 2025:
         raise Stage2ValidationError(
@@ -499,6 +519,7 @@ def validate_stage2(
         insee_year=insee_year,
         geometry_path=geometry_path,
         region_geometry_path=region_geometry_path,
+        geometry_cache_root=geometry_cache_root,
     )
     restaurants = enrich_restaurants(partition, departments, year=year)
     department_product = aggregate_departments(
@@ -506,8 +527,11 @@ def validate_stage2(
         statistics,
         geometry,
         year=year,
+        locations_encoding=locations_encoding,
+    )
+    region_product = aggregate_regions(
+        restaurants, statistics, region_geometry, year=year, locations_encoding=locations_encoding
     )
-    region_product = aggregate_regions(restaurants, statistics, region_geometry, year=year)
     validation = Stage2Validation(
         restaurant_rows=len(restaurants),
         department_rows=len(department_product),
@@ -541,14 +565,14 @@ def _write_staged_products(result: Stage2Result, staging_root: Path) -> dict[str
             check_dtype=False,
             check_like=False,
         )
-        reloaded_departments = gpd.read_file(paths["departments"])
+        reloaded_departments = read_product(paths["departments"])
         assert_geodataframe_equal(
             result.departments.reset_index(drop=True),
             reloaded_departments,
             check_dtype=False,
             check_like=False,
         )
-        reloaded_regions = gpd.read_file(paths["regions"])
+        reloaded_regions = read_product(paths["regions"])
         assert_geodataframe_equal(
             result.regions.reset_index(drop=True),
             reloaded_regions,
@@ -632,6 +656,8 @@ def run_stage2(
     region_geometry_path: Path = Path("data/raw/geodata/regions.geojson"),
     output_root: Path = Path("data/products"),
     replace: bool = False,
+    locations_encoding: str = "dict",
+    geometry_cache_root: Path | None = None,
 ) -> Stage2Result:
     prepared = validate_stage2(
         year=year,
@@ -641,6 +667,8 @@ def run_stage2(
         insee_year=insee_year,
         geometry_path=geometry_path,
         region_geometry_path=region_geometry_path,
+        locations_encoding=locations_encoding,
+        geometry_cache_root=geometry_cache_root,
     )
     paths = _publish_products(prepared, output_root=output_root, replace=replace)
     return Stage2Result(
@@ -39,7 +39,16 @@ def validate_reference_data(
     departments: pd.DataFrame,
     statistics: pd.DataFrame,
     geometry: gpd.GeoDataFrame,
+    *,
+    geometry_validated: bool = False,
 ) -> None:
+    """Check the reference inputs agree on department codes, names, and regions.
+
+    The department geometry checks of ``validate_department_geometry`` also run
+    unless ``geometry_validated`` says the caller has already applied them, as
+    ``load_department_geometry`` does before caching a source.
+    """
+
     require_columns(
         departments,
         ("department_num", "department", "capital", "region"),
@@ -88,6 +97,12 @@ def validate_reference_data(
                 f"Reference {column} values disagree for codes: {mismatched}"
             )
 
+    if not geometry_validated:
+        validate_department_geometry(geometry)
+
+
+def validate_department_geometry(geometry: gpd.GeoDataFrame) -> None:
+    require_columns(geometry, ("code", "nom", "geometry"), "department geometry")
     if geometry.crs is None or geometry.crs.to_epsg() != 4326:
         raise Stage2ValidationError(f"Department geometry must use EPSG:4326, found {geometry.crs}")
     if geometry.geometry.isna().any() or geometry.geometry.is_empty.any():
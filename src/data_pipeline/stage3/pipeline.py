@@ -10,9 +10,14 @@ import tempfile
 
 import geopandas as gpd
 from geopandas.testing import assert_geodataframe_equal
+import numpy as np
 import pandas as pd
 from pandas.testing import assert_frame_equal
+import shapely
 
+from data_pipeline.geometry_cache import PreparedGeometry, load_prepared_geometry
+from data_pipeline.stage2.aggregation import location_payloads, read_product, star_category_counts
+from data_pipeline.stage2.pipeline import load_department_geometry
 from data_pipeline.stage2.schema import REGION_TRANSLATIONS, star_categories
 from data_pipeline.stage2.validation import Stage2ValidationError, require_columns
 
@@ -53,8 +58,7 @@ def stage3_paths(year: int, output_root: Path) -> dict[str, Path]:
     }
 
 
-def load_arrondissement_geometry(path: Path) -> gpd.GeoDataFrame:
-    geometry = gpd.read_file(path)
+def _validated_arrondissement_geometry(geometry: gpd.GeoDataFrame) -> gpd.GeoDataFrame:
     require_columns(geometry, ("code", "nom", "geometry"), "arrondissement geometry")
     geometry = geometry[~geometry["code"].str.startswith("97")].sort_values("code").reset_index(drop=True)
     if len(geometry) != 320 or geometry["code"].duplicated().any():
@@ -66,6 +70,12 @@ def load_arrondissement_geometry(path: Path) -> gpd.GeoDataFrame:
     return geometry
 
 
+def load_arrondissement_geometry(path: Path, *, cache_root: Path | None = None) -> PreparedGeometry:
+    return load_prepared_geometry(
+        path, kind="stage3-arrondissements", prepare=_validated_arrondissement_geometry, cache_root=cache_root
+    )
+
+
 def build_arrondissement_reference(geometry: gpd.GeoDataFrame) -> gpd.GeoDataFrame:
     reference = geometry.loc[:, ["code", "nom", "geometry"]].copy()
     reference["nom"] = reference["nom"].replace({"Briey": "Val-de-Briey"})
@@ -73,44 +83,75 @@ def build_arrondissement_reference(geometry: gpd.GeoDataFrame) -> gpd.GeoDataFra
     return gpd.GeoDataFrame(reference, geometry="geometry", crs=geometry.crs)
 
 
+@dataclass(frozen=True)
+class ArrondissementIndex:
+    """STR-packed trees over arrondissement polygons, built once per run.
+
+    ``geographic`` answers the primary point-in-polygon join in EPSG:4326 and
+    ``projected`` answers the Lambert-93 coastal fallback distance queries.
+    """
+
+    codes: np.ndarray
+    names: np.ndarray
+    geographic: shapely.STRtree
+    projected: shapely.STRtree
+
+
+def build_arrondissement_index(
+    geometry: gpd.GeoDataFrame, *, projected: gpd.GeoSeries | None = None
+) -> ArrondissementIndex:
+    if projected is None:
+        projected = geometry.geometry.to_crs(2154)
+    return ArrondissementIndex(
+        codes=geometry["code"].astype(str).to_numpy(),
+        names=geometry["nom"].to_numpy(),
+        geographic=shapely.STRtree(geometry.geometry.to_numpy()),
+        projected=shapely.STRtree(projected.to_numpy()),
+    )
+
+
 def assign_restaurants(
-    restaurants: pd.DataFrame, geometry: gpd.GeoDataFrame
+    restaurants: pd.DataFrame,
+    geometry: gpd.GeoDataFrame,
+    *,
+    index: ArrondissementIndex | None = None,
 ) -> tuple[pd.DataFrame, tuple[str, ...]]:
     require_columns(restaurants, ("name", "department_num", "longitude", "latitude"), "Stage 2 restaurants")
     if restaurants[["longitude", "latitude"]].isna().any().any():
         raise Stage2ValidationError("Stage 2 restaurants contain missing coordinates")
-    points = gpd.GeoDataFrame(
-        restaurants.copy(),
-        geometry=gpd.points_from_xy(restaurants["longitude"], restaurants["latitude"]),
-        crs="EPSG:4326",
-    )
-    joined = gpd.sjoin(points, geometry[["code", "nom", "geometry"]], predicate="within", how="left")
-    if joined.index.duplicated().any():
+    if index is None:
+        index = build_arrondissement_index(geometry)
+    points = gpd.points_from_xy(restaurants["longitude"], restaurants["latitude"], crs="EPSG:4326")
+    point_positions, polygon_positions = index.geographic.query(points, predicate="within")
+    if len(np.unique(point_positions)) != len(point_positions):
         raise Stage2ValidationError("A restaurant matched multiple arrondissement geometries")
+    matched = np.full(len(restaurants), -1, dtype=np.int64)
+    matched[point_positions] = polygon_positions
+
     fallback_names: list[str] = []
-    unmatched = joined["code"].isna()
-    if unmatched.any():
-        projected_geometry = geometry.to_crs(2154)
-        projected_points = points.to_crs(2154)
-        for index in joined.index[unmatched]:
-            department = str(joined.at[index, "department_num"])
-            candidates = projected_geometry[projected_geometry["code"].str.startswith(department)]
-            distances = candidates.geometry.distance(projected_points.at[index, "geometry"]).sort_values()
-            if distances.empty or distances.iloc[0] > COASTAL_FALLBACK_MAX_METRES:
-                continue
-            if len(distances) > 1 and distances.iloc[1] <= COASTAL_FALLBACK_MAX_METRES:
-                raise Stage2ValidationError(
-                    f"Ambiguous coastal arrondissement assignment for {joined.at[index, 'name']!r}"
-                )
-            match = candidates.loc[distances.index[0]]
-            joined.at[index, "code"] = match["code"]
-            joined.at[index, "nom"] = match["nom"]
-            fallback_names.append(str(joined.at[index, "name"]))
-    still_unmatched = joined.loc[joined["code"].isna(), "name"].astype(str).tolist()
+    unmatched = np.flatnonzero(matched < 0)
+    if len(unmatched):
+        projected_points = gpd.GeoSeries(points[unmatched]).to_crs(2154).to_numpy()
+        pairs = index.projected.query(projected_points, predicate="dwithin", distance=COASTAL_FALLBACK_MAX_METRES)
+        departments = restaurants["department_num"].astype(str).to_numpy()[unmatched]
+        same_department = np.array([
+            code.startswith(department)
+            for code, department in zip(index.codes[pairs[1]], departments[pairs[0]])
+        ], dtype=bool)
+        candidate_points, candidate_polygons = pairs[:, same_department]
+        candidate_counts = np.bincount(candidate_points, minlength=len(unmatched))
+        names = restaurants["name"].to_numpy()
+        if (candidate_counts > 1).any():
+            first = unmatched[np.flatnonzero(candidate_counts > 1)[0]]
+            raise Stage2ValidationError(f"Ambiguous coastal arrondissement assignment for {names[first]!r}")
+        matched[unmatched[candidate_points]] = candidate_polygons
+        fallback_names = [str(names[position]) for position in unmatched[np.sort(candidate_points)]]
+
+    still_unmatched = restaurants.loc[matched < 0, "name"].astype(str).tolist()
     if still_unmatched:
         raise Stage2ValidationError(f"Spatially unmatched restaurants: {still_unmatched}")
-    result = pd.DataFrame(joined.drop(columns=["geometry", "index_right", "code"]))
-    result.rename(columns={"nom": "arrondissement"}, inplace=True)
+    result = restaurants.copy()
+    result["arrondissement"] = index.names[matched]
     return result, tuple(fallback_names)
 
 
@@ -142,18 +183,12 @@ def enrich_paris_labels(restaurants: pd.DataFrame, reference: pd.DataFrame) -> p
     return result
 
 
-def _add_category_counts(frame: pd.DataFrame, year: int) -> tuple[pd.DataFrame, list[str]]:
-    working = frame.copy()
-    categories: list[str] = []
+def _category_counts(frame: pd.DataFrame, year: int) -> tuple[pd.DataFrame, list[str]]:
     allowed = {value for value, _label, _column in star_categories(year)}
-    if set(working["stars"]) - allowed:
+    if set(frame["stars"]) - allowed:
         raise Stage2ValidationError("Unexpected Michelin stars value in Stage 3 input")
-    for value, _label, column in star_categories(year):
-        working[column] = working["stars"].eq(value).astype(int)
-        categories.append(column)
-    if year >= 2025:
-        working["green_stars"] = working["greenstar"].eq(1).astype(int)
-    return working, categories
+    categories = [column for _value, _label, column in star_categories(year)]
+    return star_category_counts(frame, "arrondissement", year=year), categories
 
 
 def build_arrondissement_product(
@@ -162,13 +197,11 @@ def build_arrondissement_product(
     departments: pd.DataFrame,
     *,
     year: int,
+    locations_encoding: str = "dict",
 ) -> gpd.GeoDataFrame:
-    working, categories = _add_category_counts(assigned, year)
+    counts, categories = _category_counts(assigned, year)
     count_columns = [*categories, *( ["green_stars"] if year >= 2025 else [])]
-    counts = working.groupby("arrondissement", sort=True)[count_columns].sum().reset_index()
-    counts["total_stars"] = counts["1_star"] + 2 * counts["2_star"] + 3 * counts["3_star"]
-    counts["starred_restaurants"] = counts["1_star"] + counts["2_star"] + counts["3_star"]
-    if int(counts[categories].to_numpy().sum()) != len(working):
+    if int(counts[categories].to_numpy().sum()) != len(assigned):
         raise Stage2ValidationError("National Michelin category counts do not reconcile to restaurant rows")
 
     base = reference.copy()
@@ -182,12 +215,9 @@ def build_arrondissement_product(
     fill_columns = [*count_columns, "total_stars", "starred_restaurants"]
     base[fill_columns] = base[fill_columns].fillna(0).astype(int)
 
-    coordinate_groups = (
-        working.groupby(["arrondissement", "stars"], sort=False)[["latitude", "longitude"]]
-        .apply(lambda value: list(zip(value["latitude"], value["longitude"]))).to_dict()
-    )
-    base["locations"] = base["arrondissement"].map(
-        lambda name: str({value: coordinate_groups.get((name, value)) for value in (1, 2, 3)})
+    base["locations"] = location_payloads(
+        assigned, "arrondissement", base["arrondissement"], year=year,
+        labels=[(value, value) for value in (1, 2, 3)], encoding=locations_encoding,
     )
     columns = ["code", "arrondissement", "department_num", "department", "capital", "region", *categories,
                "total_stars", "starred_restaurants"]
@@ -212,19 +242,17 @@ def build_paris_product(
     reference: pd.DataFrame,
     *,
     year: int,
+    locations_encoding: str = "dict",
 ) -> gpd.GeoDataFrame:
     require_columns(geometry, ("c_ar", "c_arinsee", "geometry"), "Paris geometry")
     if len(geometry) != 20 or set(geometry["c_ar"].astype(int)) != set(range(1, 21)):
         raise Stage2ValidationError("Paris geometry must cover municipal arrondissements 1 through 20")
     if geometry.crs is None or geometry.crs.to_epsg() != 4326 or (~geometry.geometry.is_valid).any():
         raise Stage2ValidationError("Paris geometry must be valid EPSG:4326 geometry")
-    paris = restaurants[restaurants["department_num"].astype(str).eq("75")].copy()
-    working, categories = _add_category_counts(paris, year)
+    paris = restaurants[restaurants["department_num"].astype(str).eq("75")]
+    counts, categories = _category_counts(paris, year)
     count_columns = [*( ["green_stars"] if year >= 2025 else []), *categories]
-    counts = working.groupby("arrondissement", sort=True)[count_columns].sum().reset_index()
-    counts["total_stars"] = counts["1_star"] + 2 * counts["2_star"] + 3 * counts["3_star"]
-    counts["starred_restaurants"] = counts["1_star"] + counts["2_star"] + counts["3_star"]
-    if int(counts[categories].to_numpy().sum()) != len(working):
+    if int(counts[categories].to_numpy().sum()) != len(paris):
         raise Stage2ValidationError("Paris Michelin category counts do not reconcile to restaurant rows")
 
     labels = reference.set_index("arrondissement_number")["label"]
@@ -239,14 +267,9 @@ def build_paris_product(
     base = base.merge(counts, on="arrondissement", how="left", validate="one_to_one")
     fill = [*count_columns, "total_stars", "starred_restaurants"]
     base[fill] = base[fill].fillna(0).astype(int)
-    coordinate_groups = (
-        working.groupby(["arrondissement", "stars"], sort=False)[["latitude", "longitude"]]
-        .apply(lambda value: list(zip(value["latitude"], value["longitude"]))).to_dict()
+    base["locations"] = location_payloads(
+        paris, "arrondissement", base["arrondissement"], year=year, encoding=locations_encoding,
     )
-    base["locations"] = base["arrondissement"].map(lambda name: str({
-        label: coordinate_groups.get((name, value))
-        for value, label, _column in star_categories(year)
-    }))
     columns = ["code", "arrondissement", "department_num", "department", "capital", "region"]
     if year >= 2025:
         columns.append("green_stars")
@@ -268,6 +291,8 @@ def validate_stage3(
     department_reference_path: Path = Path("data/raw/demographics/departments.csv"),
     department_geometry_path: Path = Path("data/raw/geodata/departments.geojson"),
     paris_geometry_path: Path = Path("data/raw/geodata/paris_arrondissements.geojson"),
+    locations_encoding: str = "dict",
+    geometry_cache_root: Path | None = None,
 ) -> Stage3Result:
     if year < 2025:
         raise Stage2ValidationError("Stage 3 is supported from 2025 under the current Stage 2 schema")
@@ -278,9 +303,10 @@ def validate_stage3(
     if missing:
         raise FileNotFoundError("Missing Stage 3 inputs: " + ", ".join(missing))
     source = pd.read_csv(restaurant_path, dtype={"department_num": "string"})
-    geometry = load_arrondissement_geometry(arrondissement_geometry_path)
-    reference = build_arrondissement_reference(geometry)
-    assigned, fallbacks = assign_restaurants(source, reference)
+    arrondissement_geometry = load_arrondissement_geometry(arrondissement_geometry_path, cache_root=geometry_cache_root)
+    reference = build_arrondissement_reference(arrondissement_geometry.frame)
+    index = build_arrondissement_index(reference, projected=arrondissement_geometry.projected)
+    assigned, fallbacks = assign_restaurants(source, reference, index=index)
     paris_reference = load_paris_reference(paris_reference_path)
     enriched = enrich_paris_labels(assigned, paris_reference)
     output_columns = ["name", "address", "location", "arrondissement", "department_num", "department",
@@ -288,8 +314,7 @@ def validate_stage3(
                       "longitude", "latitude"]
     enriched = enriched.loc[:, output_columns]
     departments = pd.read_csv(department_reference_path, dtype={"department_num": "string"})
-    department_geometry = gpd.read_file(department_geometry_path)
-    require_columns(department_geometry, ("code", "nom", "geometry"), "department geometry")
+    department_geometry = load_department_geometry(department_geometry_path, cache_root=geometry_cache_root).frame
     department_geometry["code"] = department_geometry["code"].astype(str)
     department_names = departments[["department_num", "department"]].merge(
         department_geometry[["code", "nom"]],
@@ -300,9 +325,13 @@ def validate_stage3(
         or not department_names["department"].eq(department_names["nom"]).all()
     ):
         raise Stage2ValidationError("Department reference and geometry names/codes disagree")
-    national = build_arrondissement_product(assigned, reference, departments, year=year)
+    national = build_arrondissement_product(
+        assigned, reference, departments, year=year, locations_encoding=locations_encoding
+    )
     paris_geometry = gpd.read_file(paris_geometry_path)
-    paris = build_paris_product(enriched, paris_geometry, paris_reference, year=year)
+    paris = build_paris_product(
+        enriched, paris_geometry, paris_reference, year=year, locations_encoding=locations_encoding
+    )
     return Stage3Result(year, enriched, national, paris, Stage3Validation(
         len(enriched), len(national), len(paris), fallbacks
     ), {})
@@ -317,8 +346,8 @@ def _write_products(result: Stage3Result, root: Path) -> dict[str, Path]:
     result.paris.to_file(paths["paris"], driver="GeoJSON")
     try:
         assert_frame_equal(result.restaurants, pd.read_csv(paths["restaurants"], dtype={"department_num": "string"}), check_dtype=False)
-        assert_geodataframe_equal(result.arrondissements, gpd.read_file(paths["arrondissements"]), check_dtype=False, check_less_precise=True)
-        assert_geodataframe_equal(result.paris, gpd.read_file(paths["paris"]), check_dtype=False, check_less_precise=True)
+        assert_geodataframe_equal(result.arrondissements, read_product(paths["arrondissements"]), check_dtype=False, check_less_precise=True)
+        assert_geodataframe_equal(result.paris, read_product(paths["paris"]), check_dtype=False, check_less_precise=True)
     except AssertionError as error:
         raise Stage3PublicationError("Serialized Stage 3 products failed reload validation") from error
     return paths
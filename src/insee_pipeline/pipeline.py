@@ -16,6 +16,7 @@ from .paths import PipelinePaths
 from .product import build_product
 from .sources import INSEE_DATASETS, acquire_sources
 from .transform import (
+    GEOMETRY_CACHE_ROOT,
     assemble_departmental_table,
     load_department_geometry,
     load_filosofi,
@@ -86,6 +87,7 @@ def build(
     source_cache_root: Path | None = None,
     legacy_statistics_path: Path = Path("data/raw/demographics/departmental_stats_2023.csv"),
     replace: bool = False,
+    geometry_cache_root: Path | None = None,
 ) -> BuildResult:
     paths = PipelinePaths.create(
         year=year,
@@ -107,7 +109,7 @@ def build(
 
     artifacts = acquire_sources(paths)
 
-    geometry = load_department_geometry(paths.geometry_path, year=year)
+    geometry = load_department_geometry(paths.geometry_path, year=year, cache_root=geometry_cache_root)
     department_codes = set(geometry.frame["department_code"])
     wages = load_wages(paths.insee_zip(INSEE_DATASETS["wages"]), year=year, department_codes=department_codes)
     filosofi = load_filosofi(paths.insee_zip(INSEE_DATASETS["filosofi"]), year=year, department_codes=department_codes)
@@ -204,6 +206,13 @@ def _parser() -> argparse.ArgumentParser:
     build_parser.add_argument("--candidate-root", type=Path, default=Path("data/candidates/insee"))
     build_parser.add_argument("--geometry-path", type=Path, default=Path("data/raw/geodata/departments.geojson"))
     build_parser.add_argument("--source-cache-root", type=Path)
+    build_parser.add_argument(
+        "--geometry-cache-root",
+        type=Path,
+        default=GEOMETRY_CACHE_ROOT,
+        help=f"disposable department-area cache keyed by source SHA-256 (default: {GEOMETRY_CACHE_ROOT})",
+    )
+    build_parser.add_argument("--no-geometry-cache", action="store_true")
     build_parser.add_argument("--legacy-statistics-path", type=Path, default=Path("data/raw/demographics/departmental_stats_2023.csv"))
     build_parser.add_argument("--replace", action="store_true")
     product_parser = subparsers.add_parser("product", help="build a Michelin-consumable product from a validated candidate")
@@ -227,6 +236,7 @@ def main(argv: list[str] | None = None) -> int:
                 source_cache_root=args.source_cache_root,
                 legacy_statistics_path=args.legacy_statistics_path,
                 replace=args.replace,
+                geometry_cache_root=None if args.no_geometry_cache else args.geometry_cache_root,
             )
             print(f"Built INSEE/OECD departmental candidate for {result.year}: {result.rows} rows")
             for name, path in result.paths.items():
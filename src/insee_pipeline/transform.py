@@ -3,13 +3,18 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+import json
+import os
+from pathlib import Path
 import re
+import tempfile
 import unicodedata
 
 import geopandas as gpd
 import pandas as pd
 
 from .load import load_departmental_zip_data, read_oecd_csv, require_columns, to_numeric
+from .sources import sha256_file
 from .validate import Check, InseeValidationError, require_check
 
 
@@ -91,7 +96,11 @@ def _status_counts(frame: pd.DataFrame, columns: tuple[str, ...]) -> dict[str, d
     }
 
 
-def load_department_geometry(geometry_path, *, year: int) -> SourceFrame:
+GEOMETRY_CACHE_ROOT = Path("tmp/geometry_cache")
+DEPARTMENT_AREA_CACHE_VERSION = 1
+
+
+def _department_areas(geometry_path: Path) -> pd.DataFrame:
     geometry = gpd.read_file(geometry_path)
     require_columns(geometry, ("code", "nom", "geometry"), "department geometry")
     if geometry.crs is None or geometry.crs.to_epsg() != 4326:
@@ -101,12 +110,39 @@ def load_department_geometry(geometry_path, *, year: int) -> SourceFrame:
     if geometry.geometry.isna().any() or geometry.geometry.is_empty.any() or (~geometry.geometry.is_valid).any():
         raise InseeValidationError("Department geometry contains null, empty, or invalid features")
     l93 = geometry.to_crs("EPSG:2154")
-    frame = (
+    return (
         l93[["code", "nom", "geometry"]]
         .assign(area_sq_km=lambda df: df.geometry.area / 1_000_000)
         .drop(columns="geometry")
         .rename(columns={"code": "department_code", "nom": "department_name"})
     )
+
+
+def _cached_department_areas(geometry_path: Path, cache_root: Path) -> pd.DataFrame:
+    """Validated department areas, reused from ``cache_root`` while the source SHA-256 is unchanged."""
+
+    entry = cache_root / f"insee-department-areas-v{DEPARTMENT_AREA_CACHE_VERSION}-{sha256_file(geometry_path)}.json"
+    if entry.is_file():
+        try:
+            return pd.DataFrame(json.loads(entry.read_text(encoding="utf-8")), columns=["department_code", "department_name", "area_sq_km"])
+        except (OSError, ValueError):
+            entry.unlink(missing_ok=True)
+    frame = _department_areas(geometry_path)
+    entry.parent.mkdir(parents=True, exist_ok=True)
+    descriptor, temporary = tempfile.mkstemp(prefix=f".{entry.stem}-", suffix=".json", dir=entry.parent)
+    try:
+        with os.fdopen(descriptor, "w", encoding="utf-8") as handle:
+            json.dump(frame.to_dict(orient="list"), handle, ensure_ascii=False)
+        os.replace(temporary, entry)
+    except BaseException:
+        Path(temporary).unlink(missing_ok=True)
+        raise
+    return frame
+
+
+def load_department_geometry(geometry_path, *, year: int, cache_root: Path | None = None) -> SourceFrame:
+    geometry_path = Path(geometry_path)
+    frame = _department_areas(geometry_path) if cache_root is None else _cached_department_areas(geometry_path, cache_root)
     frame = sort_by_department_code(frame)
     if frame["area_sq_km"].isna().any() or frame["area_sq_km"].le(0).any():
         raise InseeValidationError("Department area contains null or non-positive values")
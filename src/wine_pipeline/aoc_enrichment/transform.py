@@ -11,6 +11,7 @@ import pandas as pd
 from ..config import OUTPUT_LAYER, TARGET_CRS
 from ..validation import Check, WinePipelineError, geometry_profile, validate_and_repair_geometry
 from .mappings import FALLBACK_REGIONS_BY_DT, REGION_OVERRIDES_BY_ID, WINE_REGION_COLORS
+from .overlap import majority_overlap
 from .validate import ENRICHED_COLUMNS, validate_enriched_artifact, validate_regional_source
 
 
@@ -36,39 +37,6 @@ def prepare_regional_polygons(region_data: gpd.GeoDataFrame) -> tuple[gpd.GeoDat
     return repaired, checks, {"regional_geometry_repair_counts": repair_counts, "regional_profile": geometry_profile(repaired)}
 
 
-def _majority_overlap(
-    aoc_data: gpd.GeoDataFrame,
-    regions: gpd.GeoDataFrame,
-    progress: Callable[[str], None] | None = None,
-) -> gpd.GeoDataFrame:
-    progress = progress or (lambda message: None)
-    progress(f"running polygon overlay for {len(aoc_data)} AOCs and {len(regions)} regional polygons")
-    overlap_candidates = gpd.overlay(
-        aoc_data[["aoc_key", "app", "id_app", "dt", "aoc_area", "categorie", "geometry"]],
-        regions[["region", "geometry"]],
-        how="intersection",
-        keep_geom_type=False,
-    )
-    progress(f"overlay produced {len(overlap_candidates)} raw intersection rows")
-    if overlap_candidates.empty:
-        return gpd.GeoDataFrame(columns=["aoc_key", "region", "overlap_area", "overlap_ratio"], geometry=[])
-    overlap_candidates["overlap_area"] = overlap_candidates.geometry.area
-    overlap_candidates["overlap_ratio"] = overlap_candidates["overlap_area"] / overlap_candidates["aoc_area"]
-    overlap_candidates = overlap_candidates[overlap_candidates["overlap_area"] > 0].copy()
-    progress(f"kept {len(overlap_candidates)} positive-area intersection rows")
-    majority_region = (
-        overlap_candidates.sort_values(
-            ["aoc_key", "overlap_area", "region"],
-            ascending=[True, False, True],
-            kind="stable",
-        )
-        .drop_duplicates(subset="aoc_key", keep="first")
-        [["aoc_key", "region", "overlap_area", "overlap_ratio"]]
-    )
-    progress(f"selected majority-overlap regions for {len(majority_region)} AOCs")
-    return majority_region
-
-
 def _apply_overrides(aoc_enriched: gpd.GeoDataFrame, overrides_by_id: dict[str, str]) -> tuple[gpd.GeoDataFrame, dict[str, object]]:
     result = aoc_enriched.copy()
     duplicate_override_rows = result[result["aoc_key"].isin(overrides_by_id)].duplicated(subset="aoc_key", keep=False)
@@ -121,6 +89,7 @@ def enrich_aoc_regions(
     fallbacks_by_dt: dict[str, str] = FALLBACK_REGIONS_BY_DT,
     colors: dict[str, str] = WINE_REGION_COLORS,
     progress: Callable[[str], None] | None = None,
+    jobs: int = 1,
 ) -> tuple[gpd.GeoDataFrame, list[Check], dict[str, object]]:
     progress = progress or (lambda message: None)
     checks: list[Check] = []
@@ -145,7 +114,7 @@ def enrich_aoc_regions(
     aoc_data["aoc_area"] = aoc_data.geometry.area
     aoc_data["aoc_key"] = aoc_data["id_app"].astype("string").str.strip()
 
-    majority_region = _majority_overlap(aoc_data, regions, progress=progress)
+    majority_region = majority_overlap(aoc_data, regions, jobs=jobs, progress=progress)
     progress("joining majority-overlap regions back to complete AOC geometries")
     aoc_enriched = aoc_data.merge(majority_region, on="aoc_key", how="left", validate="one_to_one")
     aoc_enriched["region_method"] = pd.NA
@@ -198,7 +167,7 @@ def enrich_aoc_regions(
         "aoc_geometry_repair_counts": aoc_repair_counts,
         "final_geometry_repair_counts": final_repair_counts,
         "regional_assignment": {
-            "primary_method": "geopandas.overlay intersection; select largest overlap area per id_app",
+            "primary_method": "STRtree intersecting pairs; contains_properly or intersection area; select largest overlap area per id_app",
             "zero_area_intersections_removed": True,
             "explicit_overrides_by_id": overrides_by_id,
             "fallback_regions_by_dt": fallbacks_by_dt,
@@ -226,6 +195,7 @@ def write_enriched_candidate(
     fallbacks_by_dt: dict[str, str] = FALLBACK_REGIONS_BY_DT,
     colors: dict[str, str] = WINE_REGION_COLORS,
     progress: Callable[[str], None] | None = None,
+    jobs: int = 1,
 ) -> tuple[gpd.GeoDataFrame, list[Check], dict[str, object]]:
     progress = progress or (lambda message: None)
     final, checks, metadata = enrich_aoc_regions(
@@ -235,6 +205,7 @@ def write_enriched_candidate(
         fallbacks_by_dt=fallbacks_by_dt,
         colors=colors,
         progress=progress,
+        jobs=jobs,
     )
     output_path.parent.mkdir(parents=True, exist_ok=True)
     if output_path.exists():
@@ -4,8 +4,10 @@ from __future__ import annotations
 
 from dataclasses import dataclass, asdict
 from datetime import datetime, timezone
-from pathlib import Path, PurePosixPath
+from pathlib import Path, PurePath, PurePosixPath
+import hashlib
 import tarfile
+from typing import BinaryIO
 import zipfile
 
 import requests
@@ -16,6 +18,9 @@ from ..validation import WinePipelineError
 
 
 REQUIRED_SHAPEFILE_SUFFIXES = {".shp", ".shx", ".dbf", ".prj"}
+SHAPEFILE_SIDECAR_SUFFIXES = REQUIRED_SHAPEFILE_SUFFIXES | {".cpg"}
+INAO_EXTRACT_MODES = ("all", "sidecars", "archive")
+ARCHIVE_BLOCK_SIZE = 1024 * 1024
 
 
 @dataclass(frozen=True)
@@ -40,9 +45,22 @@ class DownloadedSource:
 class ExtractedShapefile:
     shapefile_path: Path
     members: list[dict[str, object]]
+    archive_path: Path | None = None
+
+    @property
+    def dataset_path(self) -> str:
+        """Path GDAL opens: the extracted file, or a ``/vsizip/`` path into the archive."""
+
+        if self.archive_path is None:
+            return str(self.shapefile_path)
+        return f"/vsizip/{self.archive_path.resolve()}/{self.shapefile_path.as_posix()}"
 
     def to_json(self) -> dict[str, object]:
-        return {"shapefile_path": str(self.shapefile_path), "members": self.members}
+        payload: dict[str, object] = {"shapefile_path": str(self.shapefile_path), "members": self.members}
+        if self.archive_path is not None:
+            payload["archive_path"] = str(self.archive_path)
+            payload["dataset_path"] = self.dataset_path
+        return payload
 
 
 def _interesting_headers(headers: requests.structures.CaseInsensitiveDict[str]) -> dict[str, str]:
@@ -111,9 +129,34 @@ def _safe_target(root: Path, member_name: str) -> Path:
     return target
 
 
-def extract_archive_safely(archive_path: Path, destination_dir: Path) -> list[Path]:
+def _copy_and_hash(source: BinaryIO, output: BinaryIO | None = None) -> str:
+    digest = hashlib.sha256()
+    for block in iter(lambda: source.read(ARCHIVE_BLOCK_SIZE), b""):
+        digest.update(block)
+        if output is not None:
+            output.write(block)
+    return digest.hexdigest()
+
+
+def _is_sidecar(member_name: str) -> bool:
+    return PurePosixPath(member_name).suffix.lower() in SHAPEFILE_SIDECAR_SUFFIXES
+
+
+def extract_archive_members(
+    archive_path: Path,
+    destination_dir: Path,
+    *,
+    sidecars_only: bool = False,
+) -> dict[Path, str]:
+    """Stream archive members to disk in fixed-size blocks, hashing them as they are written.
+
+    With ``sidecars_only`` only shapefile sidecar members are written. Every
+    member name is still checked against the extraction root. Returns the
+    SHA-256 of each extracted file.
+    """
+
     destination_dir.mkdir(parents=True, exist_ok=True)
-    extracted: list[Path] = []
+    extracted: dict[Path, str] = {}
     archive_type = detect_archive_type(archive_path)
     if archive_type == "zip":
         with zipfile.ZipFile(archive_path) as archive:
@@ -122,58 +165,105 @@ def extract_archive_safely(archive_path: Path, destination_dir: Path) -> list[Pa
                 if info.is_dir():
                     target.mkdir(parents=True, exist_ok=True)
                     continue
+                if sidecars_only and not _is_sidecar(info.filename):
+                    continue
                 target.parent.mkdir(parents=True, exist_ok=True)
                 with archive.open(info) as source, target.open("wb") as output:
-                    output.write(source.read())
-                extracted.append(target)
+                    extracted[target] = _copy_and_hash(source, output)
     elif archive_type == "tar":
         with tarfile.open(archive_path) as archive:
-            for member in archive.getmembers():
+            for member in archive:
                 target = _safe_target(destination_dir, member.name)
                 if member.isdir():
                     target.mkdir(parents=True, exist_ok=True)
                     continue
-                if not member.isfile():
+                if not member.isfile() or (sidecars_only and not _is_sidecar(member.name)):
                     continue
                 target.parent.mkdir(parents=True, exist_ok=True)
                 source = archive.extractfile(member)
                 if source is None:
                     continue
                 with source, target.open("wb") as output:
-                    output.write(source.read())
-                extracted.append(target)
+                    extracted[target] = _copy_and_hash(source, output)
     return extracted
 
 
-def locate_shapefile(extracted_root: Path) -> ExtractedShapefile:
-    shp_files = sorted(extracted_root.rglob("*.shp"))
+def extract_archive_safely(archive_path: Path, destination_dir: Path, *, sidecars_only: bool = False) -> list[Path]:
+    return list(extract_archive_members(archive_path, destination_dir, sidecars_only=sidecars_only))
+
+
+def _shapefile_dataset(paths: list[PurePath]) -> tuple[PurePath, list[PurePath]]:
+    shp_files = sorted(path for path in paths if path.suffix == ".shp")
     if len(shp_files) != 1:
         raise WinePipelineError(f"Expected exactly one INAO shapefile dataset, found {len(shp_files)}")
     shp_path = shp_files[0]
     stem = shp_path.with_suffix("")
-    related = sorted(shp_path.parent.glob(f"{shp_path.stem}.*"))
+    related = sorted(path for path in paths if path.parent == shp_path.parent and path.with_suffix("") == stem)
     suffixes = {path.suffix.lower() for path in related}
     missing = sorted(REQUIRED_SHAPEFILE_SUFFIXES - suffixes)
     if missing:
         raise WinePipelineError(f"Shapefile dataset is missing required members: {missing}")
+    return shp_path, related
+
+
+def locate_shapefile(extracted_root: Path, *, member_hashes: dict[Path, str] | None = None) -> ExtractedShapefile:
+    """Find the single shapefile dataset, reusing ``member_hashes`` from extraction when given."""
+
+    member_hashes = member_hashes or {}
+    shp_path, related = _shapefile_dataset([path for path in extracted_root.rglob("*") if path.is_file()])
     members = [
-        {"name": str(path.relative_to(extracted_root)), "size_bytes": path.stat().st_size, "sha256": sha256_file(path)}
+        {
+            "name": str(path.relative_to(extracted_root)),
+            "size_bytes": path.stat().st_size,
+            "sha256": member_hashes.get(path.resolve()) or sha256_file(path),
+        }
         for path in related
-        if path.with_suffix("") == stem
     ]
     return ExtractedShapefile(shapefile_path=shp_path, members=members)
 
 
-def extract_inao_source(run_dir: Path, *, session: requests.Session | None = None) -> tuple[DownloadedSource, ExtractedShapefile]:
+def locate_archived_shapefile(archive_path: Path) -> ExtractedShapefile:
+    """Find the single shapefile dataset inside a ZIP archive and hash its members without extracting."""
+
+    with zipfile.ZipFile(archive_path) as archive:
+        infos = {PurePosixPath(info.filename): info for info in archive.infolist() if not info.is_dir()}
+        for name in infos:
+            _safe_target(Path("."), str(name))
+        shp_path, related = _shapefile_dataset(list(infos))
+        members = []
+        for path in related:
+            with archive.open(infos[path]) as source:
+                members.append({"name": str(path), "size_bytes": infos[path].file_size, "sha256": _copy_and_hash(source)})
+    return ExtractedShapefile(shapefile_path=Path(shp_path), members=members, archive_path=archive_path)
+
+
+def extract_inao_source(
+    run_dir: Path,
+    *,
+    session: requests.Session | None = None,
+    mode: str = "sidecars",
+) -> tuple[DownloadedSource, ExtractedShapefile]:
+    """Download the INAO archive and locate its shapefile.
+
+    ``mode`` is ``"all"`` to extract every member, ``"sidecars"`` to extract
+    only the shapefile sidecar set, or ``"archive"`` to read the shapefile in
+    place through GDAL's ``/vsizip/``. TAR archives, which are not read in
+    place, fall back to ``"sidecars"``.
+    """
+
+    if mode not in INAO_EXTRACT_MODES:
+        raise ValueError(f"INAO extract mode must be one of {INAO_EXTRACT_MODES}, got {mode!r}.")
     downloaded = stream_download(
         configured_url=INAO_RESOURCE_URL,
         destination_dir=run_dir / "downloads" / "inao",
         fallback_filename="inao_aoc_archive",
         session=session,
     )
+    if mode == "archive" and downloaded.archive_type == "zip":
+        return downloaded, locate_archived_shapefile(downloaded.path)
     extracted_root = run_dir / "extracted" / "inao"
-    extract_archive_safely(downloaded.path, extracted_root)
-    shapefile = locate_shapefile(extracted_root)
+    member_hashes = extract_archive_members(downloaded.path, extracted_root, sidecars_only=mode != "all")
+    shapefile = locate_shapefile(extracted_root, member_hashes=member_hashes)
     return downloaded, shapefile
 
 
@@ -0,0 +1,111 @@
+"""Per-appellation fingerprints of the wine parcels behind each Stage 1 build."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from pathlib import Path
+
+import geopandas as gpd
+import pandas as pd
+import shapely
+
+
+FINGERPRINT_FORMAT_VERSION = 1
+FINGERPRINT_SUFFIX = ".fingerprints.json"
+FINGERPRINT_ATTRIBUTES = ["app", "dt", "categorie"]
+
+
+def appellation_fingerprints(parcels: gpd.GeoDataFrame) -> dict[str, str]:
+    """SHA-256 per ``id_app`` of its parcels' attributes and normalized WKB, in source order.
+
+    Normalizing removes ring start and orientation differences only. Parcel
+    order is kept because the packaged ``categorie`` comes from the first
+    source row, so a reordering is reported as a change.
+    """
+
+    identities = parcels["id_app"].astype("string").str.strip()
+    attributes = pd.DataFrame(
+        {column: parcels[column].astype("string").str.strip() for column in FINGERPRINT_ATTRIBUTES}
+    )
+    attributes = attributes.astype(object).where(attributes.notna(), None).to_numpy().tolist()
+    wkb = shapely.to_wkb(shapely.normalize(parcels.geometry.to_numpy())).tolist()
+    digests = {}
+    for id_app, values, geometry in zip(identities.tolist(), attributes, wkb):
+        digest = digests.setdefault(id_app, hashlib.sha256())
+        digest.update(json.dumps(values, ensure_ascii=False).encode("utf-8"))
+        digest.update(len(geometry or b"").to_bytes(8, "little"))
+        digest.update(geometry or b"")
+    return {id_app: digests[id_app].hexdigest() for id_app in sorted(digests)}
+
+
+def fingerprint_index(
+    fingerprints: dict[str, str],
+    enriched: gpd.GeoDataFrame,
+    *,
+    run_id: str,
+    source_sha256: str,
+) -> dict[str, object]:
+    regions = enriched.groupby(enriched["id_app"].astype(str))["region"].agg(
+        lambda values: sorted({str(value) for value in values.dropna()})
+    )
+    return {
+        "format_version": FINGERPRINT_FORMAT_VERSION,
+        "run_id": run_id,
+        "inao_archive_sha256": source_sha256,
+        "appellations": {
+            id_app: {"fingerprint": fingerprint, "regions": regions.get(id_app, [])}
+            for id_app, fingerprint in fingerprints.items()
+        },
+    }
+
+
+def fingerprint_path(provenance_path: Path) -> Path:
+    return provenance_path.with_name(provenance_path.name.removesuffix(".provenance.json") + FINGERPRINT_SUFFIX)
+
+
+def latest_fingerprint_index(report_root: Path, *, exclude_run_id: str) -> dict[str, object] | None:
+    """Most recent readable index under ``report_root`` by run id, other than ``exclude_run_id``."""
+
+    indexes = []
+    for path in report_root.glob(f"*{FINGERPRINT_SUFFIX}"):
+        try:
+            index = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            continue
+        if index.get("format_version") == FINGERPRINT_FORMAT_VERSION and index.get("run_id") != exclude_run_id:
+            indexes.append(index)
+    return max(indexes, key=lambda index: str(index.get("run_id")), default=None)
+
+
+def compare_fingerprint_indexes(previous: dict[str, object] | None, current: dict[str, object]) -> dict[str, object]:
+    """Appellations added, removed, changed, or reassigned since ``previous``, and the regions they touch.
+
+    Without a previous index every appellation is new and every region is affected.
+    """
+
+    before = dict((previous or {}).get("appellations") or {})
+    after = dict(current["appellations"])
+    added = sorted(set(after) - set(before))
+    removed = sorted(set(before) - set(after))
+    common = sorted(set(before) & set(after))
+    changed = [id_app for id_app in common if before[id_app]["fingerprint"] != after[id_app]["fingerprint"]]
+    reassigned = [
+        id_app
+        for id_app in common
+        if id_app not in changed and before[id_app]["regions"] != after[id_app]["regions"]
+    ]
+    affected = set()
+    for id_app in [*added, *changed, *reassigned]:
+        affected.update(after[id_app]["regions"])
+    for id_app in [*removed, *changed, *reassigned]:
+        affected.update(before[id_app]["regions"])
+    return {
+        "previous_run_id": (previous or {}).get("run_id"),
+        "added": added,
+        "removed": removed,
+        "changed": changed,
+        "reassigned": reassigned,
+        "unchanged_count": len(common) - len(changed) - len(reassigned),
+        "affected_regions": sorted(affected),
+    }
@@ -4,8 +4,13 @@ from __future__ import annotations
 
 from pathlib import Path
 from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
 
 import geopandas as gpd
+import numpy as np
+import pandas as pd
+import pyogrio
+import shapely
 from shapely.ops import unary_union
 
 from ..config import AOC_SIMPLIFICATION_TOLERANCE, OUTPUT_LAYER
@@ -17,46 +22,199 @@ from .validate import (
     validate_source_aoc,
 )
 
+try:
+    import pyarrow  # noqa: F401
+except ImportError:  # pragma: no cover
+    PYOGRIO_USE_ARROW = False
+else:
+    PYOGRIO_USE_ARROW = True
+
 
 GROUP_FIELDS = ["app", "id_app"]
+ATTRIBUTE_COLUMNS = [column for column in PACKAGE_COLUMNS if column != "geometry"]
+PACKAGE_CHUNKS_PER_JOB = 4
 
 
 def _distinct_non_null_counts(frame: gpd.GeoDataFrame, column: str):
     return frame.groupby(GROUP_FIELDS, sort=True, dropna=False)[column].nunique(dropna=True)
 
 
-def package_aoc_geometries(raw_aoc: gpd.GeoDataFrame) -> tuple[gpd.GeoDataFrame, list[Check], dict[str, object]]:
-    checks = validate_source_aoc(raw_aoc)
+def _wine_category_mask(categorie: pd.Series) -> pd.Series:
+    return categorie.str.contains(WINE_CATEGORY_PATTERN, case=False, na=False, regex=True)
+
+
+def _sql_literal(value: str) -> str:
+    return "'" + value.replace("'", "''") + "'"
+
+
+def read_wine_parcels(shapefile_path: Path | str) -> tuple[gpd.GeoDataFrame, pd.DataFrame, dict[str, object]]:
+    """Read only the wine parcels and package columns of the INAO shapefile.
+
+    A geometry-free pass reads every row's attributes, which the packaging
+    filter report needs. The geometry pass projects to ``PACKAGE_COLUMNS``
+    and filters with an attribute ``where`` that lists the distinct raw
+    ``categorie`` values matching ``WINE_CATEGORY_PATTERN``, so non-wine
+    parcels are never materialized as geometries. Both frames are indexed by
+    source FID for ``package_aoc_geometries(..., source_attributes=...)``.
+    Arrow is used when pyarrow is installed.
+    """
+
+    fields = set(pyogrio.read_info(shapefile_path)["fields"])
+    missing = sorted(set(ATTRIBUTE_COLUMNS) - fields)
+    if missing:
+        raise WinePipelineError(f"INAO shapefile is missing required columns: {missing}")
+    attributes = pyogrio.read_dataframe(
+        shapefile_path,
+        columns=ATTRIBUTE_COLUMNS,
+        read_geometry=False,
+        fid_as_index=True,
+        use_arrow=PYOGRIO_USE_ARROW,
+    )
+    categories = pd.Series(attributes["categorie"].dropna().unique(), dtype="string")
+    wine_categories = sorted(categories[_wine_category_mask(categories.str.strip())].tolist())
+    if not wine_categories:
+        raise WinePipelineError("AOC source filtering removed every row; no wine categories remain")
+    where = f'"categorie" IN ({", ".join(_sql_literal(value) for value in wine_categories)})'
+    parcels = gpd.read_file(
+        shapefile_path,
+        engine="pyogrio",
+        columns=ATTRIBUTE_COLUMNS,
+        where=where,
+        fid_as_index=True,
+        use_arrow=PYOGRIO_USE_ARROW,
+    )
+    metadata = {
+        "engine": "pyogrio",
+        "use_arrow": PYOGRIO_USE_ARROW,
+        "columns": PACKAGE_COLUMNS,
+        "where": where,
+        "source_rows": len(attributes),
+        "read_rows": len(parcels),
+    }
+    return parcels, attributes, metadata
+
+
+def _package_chunk(geometries: np.ndarray, group_codes: np.ndarray) -> dict[str, object]:
+    """Simplify, repair, and dissolve the parcels of whole appellation groups.
+
+    ``group_codes`` is sorted, so each group's parcels stay in source order.
+    Only the dissolved geometries leave the worker; the processed parcels are
+    summarised by their failure counts and bounds.
+    """
+
+    processed = shapely.buffer(
+        shapely.simplify(geometries, AOC_SIMPLIFICATION_TOLERANCE, preserve_topology=True),
+        0,
+    )
+    null_count = int(shapely.is_missing(processed).sum())
+    empty_count = int(shapely.is_empty(processed).sum())
+    invalid_count = int((~shapely.is_valid(processed)).sum())
+    codes, starts = np.unique(group_codes, return_index=True)
+    if null_count or empty_count or invalid_count:
+        merged = np.empty(0, dtype=object)
+    else:
+        merged = np.array(
+            [unary_union(parcels) for parcels in np.split(processed, starts[1:])],
+            dtype=object,
+        )
+    return {
+        "codes": codes,
+        "geometries": merged,
+        "null": null_count,
+        "empty": empty_count,
+        "invalid": invalid_count,
+        "bounds": shapely.total_bounds(processed),
+    }
+
+
+def _package_chunks(group_codes: np.ndarray, geometries: np.ndarray, *, jobs: int) -> list[np.ndarray]:
+    """Deal whole groups round-robin by descending coordinate count into row chunks."""
+
+    group_count = int(group_codes.max()) + 1
+    chunk_count = min(jobs * PACKAGE_CHUNKS_PER_JOB, group_count) if jobs > 1 else 1
+    weight = np.bincount(group_codes, weights=shapely.get_num_coordinates(geometries), minlength=group_count)
+    chunk_of_group = np.empty(group_count, dtype=np.int64)
+    chunk_of_group[np.argsort(-weight, kind="stable")] = np.arange(group_count) % chunk_count
+    row_order = np.lexsort((np.arange(len(group_codes)), group_codes))
+    row_chunk = chunk_of_group[group_codes[row_order]]
+    return [row_order[row_chunk == chunk] for chunk in range(chunk_count)]
+
+
+def _dissolve_groups(
+    group_codes: np.ndarray,
+    geometries: np.ndarray,
+    *,
+    jobs: int,
+    progress: Callable[[str], None],
+) -> list[dict[str, object]]:
+    chunks = _package_chunks(group_codes, geometries, jobs=jobs)
+    if len(chunks) == 1:
+        return [_package_chunk(geometries[chunks[0]], group_codes[chunks[0]])]
+    progress(f"packaging {len(chunks)} appellation chunks with {jobs} worker processes")
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        futures = [executor.submit(_package_chunk, geometries[rows], group_codes[rows]) for rows in chunks]
+        return [future.result() for future in futures]
+
+
+def package_aoc_geometries(
+    raw_aoc: gpd.GeoDataFrame,
+    *,
+    source_attributes: pd.DataFrame | None = None,
+    jobs: int = 1,
+    progress: Callable[[str], None] | None = None,
+) -> tuple[gpd.GeoDataFrame, list[Check], dict[str, object]]:
+    """Filter wine parcels, then simplify, repair, and dissolve them per ``app``/``id_app``.
+
+    When ``raw_aoc`` was already filtered at read time, ``source_attributes``
+    holds every source row's attributes under the same index; the filter is
+    then reported from it and must select exactly the rows of ``raw_aoc``.
+    Source checks and ``source_attribute_profile``, which replaces
+    ``source_profile`` on this path, describe every source row; geometry can
+    only be profiled for the read rows, in ``filtered_source_profile``.
+
+    Parcels are processed in chunks of whole appellation groups; with ``jobs``
+    above 1 the chunks run in worker processes. Dissolved groups are merged
+    back in sorted group order, so the result does not depend on ``jobs``.
+    """
+
+    progress = progress or (lambda message: None)
+    checks = validate_source_aoc(raw_aoc, source_attributes=source_attributes)
     working = raw_aoc[PACKAGE_COLUMNS].copy()
     working["_source_order"] = range(len(working))
-    for column in ("app", "id_app", "dt", "categorie"):
+    for column in ATTRIBUTE_COLUMNS:
         working[column] = working[column].astype("string").str.strip()
 
-    wine_category_mask = working["categorie"].str.contains(
-        WINE_CATEGORY_PATTERN,
-        case=False,
-        na=False,
-        regex=True,
-    )
+    if source_attributes is None:
+        source = working
+    else:
+        source = source_attributes[ATTRIBUTE_COLUMNS].copy()
+        for column in ATTRIBUTE_COLUMNS:
+            source[column] = source[column].astype("string").str.strip()
+    wine_category_mask = _wine_category_mask(source["categorie"])
     excluded_non_wine = (
-        working.loc[~wine_category_mask, ["app", "id_app", "categorie"]]
+        source.loc[~wine_category_mask, ["app", "id_app", "categorie"]]
         .drop_duplicates()
         .sort_values(["categorie", "app", "id_app"], kind="stable")
         .reset_index(drop=True)
     )
-    excluded_source_indexes = working.index[~wine_category_mask]
-    working = working.loc[wine_category_mask].copy()
-
-    retained_non_wine_count = int(
-        (
-            ~working["categorie"].str.contains(
-                WINE_CATEGORY_PATTERN,
-                case=False,
-                na=False,
-                regex=True,
+    excluded_source_indexes = source.index[~wine_category_mask]
+    if source_attributes is None:
+        working = working.loc[wine_category_mask].copy()
+    else:
+        expected_rows = source.loc[wine_category_mask, ATTRIBUTE_COLUMNS]
+        filtered_read_matches = expected_rows.index.equals(working.index) and expected_rows.equals(working[ATTRIBUTE_COLUMNS])
+        checks.append(
+            Check(
+                "aoc_package_filtered_read_matches_in_memory_filter",
+                filtered_read_matches,
+                observed=len(working),
+                expected=f"{len(expected_rows)} rows identical to the in-memory categorie filter",
             )
-        ).sum()
-    )
+        )
+        if not filtered_read_matches:
+            raise WinePipelineError("Filtered INAO read does not match the in-memory wine category filter")
+
+    retained_non_wine_count = int((~_wine_category_mask(working["categorie"])).sum())
     checks.extend(
         [
             Check(
@@ -80,14 +238,13 @@ def package_aoc_geometries(raw_aoc: gpd.GeoDataFrame) -> tuple[gpd.GeoDataFrame,
 
     filtered_source_profile = geometry_profile(working)
 
-    working["geometry"] = working.geometry.simplify(
-        tolerance=AOC_SIMPLIFICATION_TOLERANCE,
-        preserve_topology=True,
-    ).buffer(0)
+    group_codes = working.groupby(GROUP_FIELDS, sort=True, dropna=False).ngroup().to_numpy()
+    chunk_results = _dissolve_groups(group_codes, working.geometry.to_numpy(), jobs=jobs, progress=progress)
+    working = working.drop(columns="geometry")
 
-    null_after = int(working.geometry.isna().sum())
-    empty_after = int(working.geometry.is_empty.sum())
-    invalid_after = int((~working.geometry.is_valid).sum())
+    null_after = sum(result["null"] for result in chunk_results)
+    empty_after = sum(result["empty"] for result in chunk_results)
+    invalid_after = sum(result["invalid"] for result in chunk_results)
     checks.extend(
         [
             Check("aoc_package_geometry_processing_non_null", null_after == 0, observed=null_after, expected=0),
@@ -123,30 +280,33 @@ def package_aoc_geometries(raw_aoc: gpd.GeoDataFrame) -> tuple[gpd.GeoDataFrame,
         )
     )
 
-    grouped = working.groupby(GROUP_FIELDS, sort=True, dropna=False)
-    merged_geometries = grouped["geometry"].apply(unary_union)
+    merged_geometries = np.empty(int(group_codes.max()) + 1, dtype=object)
+    for result in chunk_results:
+        merged_geometries[result["codes"]] = result["geometries"]
     representative_rows = (
-        working.sort_values("_source_order", kind="stable")
-        .drop_duplicates(subset=GROUP_FIELDS, keep="first")
-        .set_index(GROUP_FIELDS)
-        .loc[merged_geometries.index]
+        working.assign(_group=group_codes)
+        .sort_values("_source_order", kind="stable")
+        .drop_duplicates(subset="_group", keep="first")
+        .sort_values("_group", kind="stable")
     )
     packaged = gpd.GeoDataFrame(
         {
-            "app": merged_geometries.index.get_level_values("app"),
-            "id_app": merged_geometries.index.get_level_values("id_app"),
+            "app": representative_rows["app"].to_numpy(),
+            "id_app": representative_rows["id_app"].to_numpy(),
             "dt": representative_rows["dt"].to_numpy(),
             "categorie": representative_rows["categorie"].to_numpy(),
-            "geometry": merged_geometries.to_numpy(),
+            "geometry": merged_geometries,
         },
-        crs=working.crs,
+        crs=raw_aoc.crs,
     )
     packaged = packaged.sort_values(["id_app", "app"], kind="stable").reset_index(drop=True)
     packaged = packaged[PACKAGE_COLUMNS]
 
     expected_groups = working[GROUP_FIELDS].drop_duplicates().shape[0]
     duplicate_keys = int(packaged.duplicated(subset=GROUP_FIELDS).sum())
-    bounds_difference = abs(working.total_bounds - packaged.total_bounds)
+    chunk_bounds = np.array([result["bounds"] for result in chunk_results])
+    processed_bounds = np.concatenate([chunk_bounds[:, :2].min(axis=0), chunk_bounds[:, 2:].max(axis=0)])
+    bounds_difference = abs(processed_bounds - packaged.total_bounds)
     checks.extend(
         [
             Check("aoc_package_group_count", len(packaged) == expected_groups, observed=len(packaged), expected=expected_groups),
@@ -159,7 +319,11 @@ def package_aoc_geometries(raw_aoc: gpd.GeoDataFrame) -> tuple[gpd.GeoDataFrame,
         raise WinePipelineError(f"AOC packaging validation failed: {[check.name for check in failed]}")
 
     metadata = {
-        "source_profile": geometry_profile(raw_aoc),
+        **(
+            {"source_profile": geometry_profile(raw_aoc)}
+            if source_attributes is None
+            else {"source_attribute_profile": {"rows": len(source_attributes), "columns": source_attributes.columns.tolist()}}
+        ),
         "filtered_source_profile": filtered_source_profile,
         "output_profile": geometry_profile(packaged),
         "transformation_parameters": {
@@ -168,6 +332,7 @@ def package_aoc_geometries(raw_aoc: gpd.GeoDataFrame) -> tuple[gpd.GeoDataFrame,
                 "column": "categorie",
                 "pattern": WINE_CATEGORY_PATTERN,
                 "case_sensitive": False,
+                "applied_at_read": source_attributes is not None,
                 "excluded_rows": int((~wine_category_mask).sum()),
                 "excluded_records": excluded_non_wine.to_dict(orient="records"),
             },
@@ -176,6 +341,7 @@ def package_aoc_geometries(raw_aoc: gpd.GeoDataFrame) -> tuple[gpd.GeoDataFrame,
             "geometry_repair": "buffer(0)",
             "grouping_fields": GROUP_FIELDS,
             "geometry_aggregation": "shapely.ops.unary_union",
+            "geometry_processing_chunks": len(chunk_results),
             "dt_aggregation_validation": "one distinct non-null value per app/id_app group",
             "categorie_aggregation_validation": (
                 "parcel-level mixed categorie values are reported; packaged value is retained "
@@ -191,10 +357,17 @@ def write_packaged_candidate(
     raw_aoc: gpd.GeoDataFrame,
     output_path: Path,
     *,
+    source_attributes: pd.DataFrame | None = None,
     progress: Callable[[str], None] | None = None,
+    jobs: int = 1,
 ) -> tuple[gpd.GeoDataFrame, list[Check], dict[str, object]]:
     progress = progress or (lambda message: None)
-    packaged, checks, metadata = package_aoc_geometries(raw_aoc)
+    packaged, checks, metadata = package_aoc_geometries(
+        raw_aoc,
+        source_attributes=source_attributes,
+        jobs=jobs,
+        progress=progress,
+    )
     output_path.parent.mkdir(parents=True, exist_ok=True)
     if output_path.exists():
         output_path.unlink()
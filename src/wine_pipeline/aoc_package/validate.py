@@ -5,6 +5,7 @@ from __future__ import annotations
 from pathlib import Path
 
 import geopandas as gpd
+import pandas as pd
 
 from ..config import OUTPUT_LAYER
 from ..validation import Check, WinePipelineError
@@ -14,24 +15,35 @@ PACKAGE_COLUMNS = ["app", "id_app", "dt", "categorie", "geometry"]
 WINE_CATEGORY_PATTERN = r"\bVin\b"
 
 
-def validate_source_aoc(gdf: gpd.GeoDataFrame) -> list[Check]:
+def validate_source_aoc(gdf: gpd.GeoDataFrame, *, source_attributes: pd.DataFrame | None = None) -> list[Check]:
+    """Validate the INAO source before packaging.
+
+    When ``gdf`` is a wine-filtered read, ``source_attributes`` holds every
+    source row's attributes: column, row, and identity checks then cover the
+    whole source, while geometry checks, which only the read rows can
+    support, are named ``aoc_source_read_*``.
+    """
+
     checks: list[Check] = []
+    source = gdf if source_attributes is None else source_attributes
     required = set(PACKAGE_COLUMNS)
-    missing = sorted(required - set(gdf.columns))
+    present = set(source.columns) | ({"geometry"} & set(gdf.columns))
+    missing = sorted(required - present)
     checks.append(Check("aoc_source_required_columns", not missing, observed=missing, expected=sorted(required)))
-    checks.append(Check("aoc_source_not_empty", not gdf.empty, observed=len(gdf), expected="> 0"))
+    checks.append(Check("aoc_source_not_empty", not source.empty, observed=len(source), expected="> 0"))
     epsg = gdf.crs.to_epsg() if gdf.crs is not None else None
     checks.append(Check("aoc_source_crs_epsg_2154", epsg == 2154, observed=epsg, expected=2154))
-    if missing or gdf.empty or epsg != 2154:
+    if missing or source.empty or epsg != 2154:
         raise WinePipelineError("AOC source failed required column, row, or CRS validation")
-    null_identity = {column: int(gdf[column].isna().sum()) for column in ("app", "id_app")}
+    null_identity = {column: int(source[column].isna().sum()) for column in ("app", "id_app")}
     checks.append(Check("aoc_source_identity_non_null", not any(null_identity.values()), observed=null_identity, expected=0))
+    scope = "aoc_source" if source_attributes is None else "aoc_source_read"
     null_geometry = int(gdf.geometry.isna().sum())
     empty_geometry = int(gdf.geometry.is_empty.sum())
     invalid_geometry = int((~gdf.geometry.is_valid).sum())
-    checks.append(Check("aoc_source_geometry_non_null", null_geometry == 0, observed=null_geometry, expected=0))
-    checks.append(Check("aoc_source_geometry_non_empty", empty_geometry == 0, observed=empty_geometry, expected=0))
-    checks.append(Check("aoc_source_invalid_geometry_reported", True, observed=invalid_geometry, expected="reported"))
+    checks.append(Check(f"{scope}_geometry_non_null", null_geometry == 0, observed=null_geometry, expected=0))
+    checks.append(Check(f"{scope}_geometry_non_empty", empty_geometry == 0, observed=empty_geometry, expected=0))
+    checks.append(Check(f"{scope}_invalid_geometry_reported", True, observed=invalid_geometry, expected="reported"))
     failed = [check for check in checks if not check.passed]
     if failed:
         raise WinePipelineError(f"AOC source validation failed: {[check.name for check in failed]}")
@@ -6,12 +6,14 @@ from .transform import (
     CANONICAL_SIMPLIFY_M,
     CANONICAL_OVERLAP_STRATEGY,
     OUTPUT_COLUMNS,
+    OVERLAP_STRATEGIES,
     STAGE1_COLUMNS,
     classify_residual_overlap,
     SimplificationParameters,
     simplify_region,
     slugify_region,
 )
+from .adaptive import SimplificationBudget, simplify_region_within_budget
 from .batch import run_batch
 from .serialization import (
     POST_REPROJECTION_ABSOLUTE_TOLERANCE_M2,
@@ -25,6 +27,8 @@ from .serialization import (
 )
 from .diagnostics import DiagnosticResult, run_diagnostics
 from .assembly import AssemblyResult, assemble_candidate
+from .stage_cache import StageCache
+from .sweep import SweepResult, run_sweep
 
 __all__ = [
     "CANONICAL_BUFFER_M",
@@ -32,12 +36,15 @@ __all__ = [
     "CANONICAL_SIMPLIFY_M",
     "CANONICAL_OVERLAP_STRATEGY",
     "OUTPUT_COLUMNS",
+    "OVERLAP_STRATEGIES",
     "STAGE1_COLUMNS",
     "SimplificationParameters",
     "classify_residual_overlap",
     "simplify_region",
     "slugify_region",
     "run_batch",
+    "SimplificationBudget",
+    "simplify_region_within_budget",
     "SERIALIZATION_CLEANUP_ABSOLUTE_TOLERANCE_M2",
     "SERIALIZATION_CLEANUP_RELATIVE_TOLERANCE",
     "POST_REPROJECTION_ABSOLUTE_TOLERANCE_M2",
@@ -50,4 +57,7 @@ __all__ = [
     "run_diagnostics",
     "AssemblyResult",
     "assemble_candidate",
+    "StageCache",
+    "SweepResult",
+    "run_sweep",
 ]
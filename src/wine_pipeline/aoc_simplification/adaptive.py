@@ -0,0 +1,173 @@
+"""Size-budget driven choice of the simplification tolerance."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field, replace
+import math
+
+import geopandas as gpd
+import shapely
+
+from .stage_cache import StageCache
+from .transform import RegionStages, SimplificationParameters, approximate_geojson_size_mb, simplify_region
+
+
+BUDGET_SCOPES = ("region", "total")
+DEFAULT_MAX_SIMPLIFY_M = 2000.0
+DEFAULT_SIMPLIFY_RESOLUTION_M = 5.0
+
+
+@dataclass(frozen=True)
+class SimplificationBudget:
+    """Size limits on a final candidate, per region or shared by a whole batch."""
+
+    max_coordinates: int | None = None
+    max_geojson_mb: float | None = None
+    scope: str = "region"
+    min_simplify_m: float = 0.0
+    max_simplify_m: float = DEFAULT_MAX_SIMPLIFY_M
+    resolution_m: float = DEFAULT_SIMPLIFY_RESOLUTION_M
+
+    def validate(self) -> None:
+        if self.max_coordinates is None and self.max_geojson_mb is None:
+            raise ValueError("A simplification budget needs a coordinate or GeoJSON size limit.")
+        if (self.max_coordinates is not None and self.max_coordinates <= 0) or (
+            self.max_geojson_mb is not None and self.max_geojson_mb <= 0
+        ):
+            raise ValueError("Simplification budget limits must be positive.")
+        if self.scope not in BUDGET_SCOPES:
+            raise ValueError(f"Unknown simplification budget scope: {self.scope!r}.")
+        if not 0 <= self.min_simplify_m <= self.max_simplify_m or self.resolution_m <= 0:
+            raise ValueError("Budget search needs 0 <= min_simplify_m <= max_simplify_m and a positive resolution.")
+
+    def allows(self, coordinate_count: int, geojson_mb: float) -> bool:
+        return (self.max_coordinates is None or coordinate_count <= self.max_coordinates) and (
+            self.max_geojson_mb is None or geojson_mb <= self.max_geojson_mb
+        )
+
+    def as_dict(self) -> dict[str, object]:
+        return {
+            "max_coordinates": self.max_coordinates,
+            "max_geojson_mb": self.max_geojson_mb,
+            "scope": self.scope,
+            "min_simplify_m": self.min_simplify_m,
+            "max_simplify_m": self.max_simplify_m,
+            "resolution_m": self.resolution_m,
+        }
+
+
+def allocate_budget(budget: SimplificationBudget, weights: dict[str, int]) -> dict[str, SimplificationBudget]:
+    """Split a total budget into per-region budgets in proportion to ``weights``.
+
+    Batches weight regions by their Stage 1 coordinate counts, so each region
+    keeps the same share of the published size that it has of the source.
+    """
+
+    budget.validate()
+    if budget.scope == "region":
+        return {region: budget for region in weights}
+    total = sum(weights.values())
+    allocated = {}
+    for region, weight in weights.items():
+        share = weight / total if total else 1 / len(weights)
+        allocated[region] = replace(
+            budget,
+            scope="region",
+            max_coordinates=None if budget.max_coordinates is None else max(int(budget.max_coordinates * share), 1),
+            max_geojson_mb=None if budget.max_geojson_mb is None else round(budget.max_geojson_mb * share, 6),
+        )
+    return allocated
+
+
+@dataclass(frozen=True)
+class AdaptiveSimplification:
+    budget: SimplificationBudget
+    requested_parameters: SimplificationParameters
+    chosen_simplify_m: float
+    coordinate_count: int
+    approx_geojson_size_mb: float
+    probes: list[dict[str, object]] = field(default_factory=list)
+
+    def as_dict(self) -> dict[str, object]:
+        return {
+            "budget": self.budget.as_dict(),
+            "requested_parameters": self.requested_parameters.as_dict(),
+            "chosen_simplify_m": self.chosen_simplify_m,
+            "coordinate_count": self.coordinate_count,
+            "approx_geojson_size_mb": self.approx_geojson_size_mb,
+            "probes": self.probes,
+        }
+
+
+def _candidate_size(final: gpd.GeoDataFrame) -> tuple[int, float]:
+    return int(shapely.get_num_coordinates(final.geometry.to_numpy()).sum()), round(approximate_geojson_size_mb(final), 6)
+
+
+def simplify_region_within_budget(
+    stage1_region: gpd.GeoDataFrame,
+    *,
+    budget: SimplificationBudget,
+    parameters: SimplificationParameters | None = None,
+    stage_cache: StageCache | None = None,
+) -> tuple[RegionStages, AdaptiveSimplification]:
+    """Find the smallest ``simplify_m`` whose final candidate fits ``budget``.
+
+    Tolerances are searched on a ``resolution_m`` grid between the budget's
+    bounds by bisection, assuming size falls as the tolerance grows. A probe
+    that fails ``simplify_region`` validation, including source-area and
+    residual-overlap checks, counts as over budget. Every probe shares one
+    stage cache, so repair, dissolve, and closing run once.
+    """
+
+    budget.validate()
+    parameters = parameters or SimplificationParameters()
+    stage_cache = stage_cache or StageCache()
+    steps = math.ceil((budget.max_simplify_m - budget.min_simplify_m) / budget.resolution_m)
+    probes: list[dict[str, object]] = []
+    accepted: dict[int, tuple[RegionStages, int, float]] = {}
+
+    def tolerance(step: int) -> float:
+        return round(min(budget.min_simplify_m + step * budget.resolution_m, budget.max_simplify_m), 6)
+
+    def fits(step: int) -> bool:
+        probe: dict[str, object] = {"simplify_m": tolerance(step), "coordinate_count": None, "approx_geojson_size_mb": None}
+        try:
+            stages = simplify_region(
+                stage1_region,
+                parameters=replace(parameters, simplify_m=tolerance(step)),
+                stage_cache=stage_cache,
+            )
+        except ValueError as error:
+            probes.append({**probe, "within_budget": False, "error": str(error)})
+            return False
+        coordinate_count, geojson_mb = _candidate_size(stages.final)
+        within = budget.allows(coordinate_count, geojson_mb)
+        probes.append({**probe, "coordinate_count": coordinate_count, "approx_geojson_size_mb": geojson_mb, "within_budget": within, "error": ""})
+        if within:
+            accepted.clear()
+            accepted[step] = (stages, coordinate_count, geojson_mb)
+        return within
+
+    if fits(0):
+        chosen = 0
+    elif not fits(steps):
+        last = probes[-1]
+        observed = last["error"] or f"{last['coordinate_count']} coordinates, {last['approx_geojson_size_mb']} MB"
+        raise ValueError(f"Simplification budget cannot be met at simplify_m {tolerance(steps):g}: {observed}.")
+    else:
+        low, chosen = 0, steps
+        while chosen - low > 1:
+            middle = (low + chosen) // 2
+            if fits(middle):
+                chosen = middle
+            else:
+                low = middle
+    stages, coordinate_count, geojson_mb = accepted[chosen]
+    return stages, AdaptiveSimplification(
+        budget=budget,
+        requested_parameters=parameters,
+        chosen_simplify_m=tolerance(chosen),
+        coordinate_count=coordinate_count,
+        approx_geojson_size_mb=geojson_mb,
+        probes=probes,
+    )
@@ -3,7 +3,8 @@
 from __future__ import annotations
 
 from collections.abc import Callable
-from dataclasses import dataclass
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, replace
 import csv
 import json
 from pathlib import Path
@@ -18,18 +19,22 @@ import pyogrio
 import shapely
 
 from .. import __version__
-from ..provenance import sha256_file
 from .runner import (
+    PLOT_MODES,
     _assert_child_path,
     _expected_artifacts,
     _install_run_directory,
     find_project_root,
     git_state,
     infer_stage1_run_id,
+    plot_status,
+    render_pending_plots,
     resolve_stage1_input,
     run_single_region,
     utc_now,
 )
+from .adaptive import SimplificationBudget, allocate_budget
+from .shards import Stage1Shards, shard_stage1_source
 from .transform import (
     CANONICAL_RUN_ID,
     OUTPUT_COLUMNS,
@@ -79,6 +84,8 @@ HUMAN_REVIEW_COLUMNS = [
 
 REVIEW_COLUMNS = [*MACHINE_REVIEW_COLUMNS, *HUMAN_REVIEW_COLUMNS]
 NEAR_TOTAL_REDUCTION_PERCENT = 99.0
+SHARD_DIRECTORY = ".stage1_shards"
+OBSOLETE_REGION_DIRECTORY = ".obsolete_regions"
 
 
 @dataclass(frozen=True)
@@ -126,6 +133,29 @@ def _effective_parameters_equal(observed: dict[str, object], expected: Simplific
     )
 
 
+def _parameters_match(
+    record: dict[str, object],
+    parameters: SimplificationParameters,
+    budget: SimplificationBudget | None,
+    *,
+    key: str = "effective_parameters",
+) -> bool:
+    """Whether ``record[key]`` matches the requested run, allowing an adaptive tolerance."""
+
+    adaptive = record.get("adaptive_simplification")
+    if budget is None:
+        return not adaptive and _effective_parameters_equal(dict(record.get(key) or {}), parameters)
+    if not isinstance(adaptive, dict) or adaptive.get("budget") != budget.as_dict():
+        return False
+    if not _effective_parameters_equal(dict(adaptive.get("requested_parameters") or {}), parameters):
+        return False
+    try:
+        effective = replace(parameters, simplify_m=float(adaptive["chosen_simplify_m"]))
+    except (KeyError, TypeError, ValueError):
+        return False
+    return _effective_parameters_equal(dict(record.get(key) or {}), effective)
+
+
 def _read_json(path: Path) -> dict[str, object]:
     return json.loads(path.read_text(encoding="utf-8"))
 
@@ -165,7 +195,16 @@ def validate_region_artifacts(
     region: str,
     source_sha256: str,
     parameters: SimplificationParameters,
+    budget: SimplificationBudget | None = None,
+    region_fingerprint: str | None = None,
 ) -> tuple[bool, str]:
+    """Whether ``region_dir`` is a complete, valid result for this run.
+
+    A result produced from a different Stage 1 source is still valid when its
+    recorded ``stage1_region_fingerprint`` equals ``region_fingerprint``, that
+    is, when the region's Stage 1 rows are unchanged.
+    """
+
     try:
         missing = [path.name for path in _expected_artifacts(region_dir) if not path.is_file()]
         if missing:
@@ -176,11 +215,14 @@ def validate_region_artifacts(
             return False, f"params run_id mismatch: {params.get('run_id')!r}"
         if params.get("region") != region:
             return False, f"params region mismatch: {params.get('region')!r}"
-        if params.get("stage1_source_sha256") != source_sha256:
+        if params.get("stage1_source_sha256") != source_sha256 and (
+            region_fingerprint is None or params.get("stage1_region_fingerprint") != region_fingerprint
+        ):
             return False, "stage1 source hash mismatch"
-        if not _effective_parameters_equal(dict(params.get("effective_parameters") or {}), parameters):
+        if not _parameters_match(params, parameters, budget):
             return False, "effective parameters mismatch"
-        if not _effective_parameters_equal(dict(metrics.get("parameters") or {}), parameters):
+        adaptive = {"adaptive_simplification": params.get("adaptive_simplification")}
+        if not _parameters_match({**adaptive, "parameters": metrics.get("parameters")}, parameters, budget, key="parameters"):
             return False, "metrics parameters mismatch"
         _validate_candidate(region_dir / "candidate.geojson")
         residual = _residual_overlap_payload(metrics)
@@ -198,6 +240,84 @@ def _region_metrics(region_dir: Path) -> dict[str, object] | None:
     return _read_json(path)
 
 
+def _adopt_region(region_dir: Path, *, source_path: Path, stage1_run_id: str | None, source_sha256: str) -> str:
+    """Point a region kept from an earlier Stage 1 source at the current one and return the earlier hash.
+
+    Only ``params.json`` changes; the candidate and every other artifact are
+    reused verbatim.
+    """
+
+    params = _read_json(region_dir / "params.json")
+    previous = str(params.get("stage1_source_sha256"))
+    params.update(
+        {
+            "stage1_run_id": stage1_run_id,
+            "stage1_source_path": str(source_path),
+            "stage1_source_sha256": source_sha256,
+            "reused_from_stage1_source_sha256": previous,
+        }
+    )
+    _write_json(region_dir / "params.json", params)
+    return previous
+
+
+def stage1_appellation_changes(source_path: Path) -> dict[str, object] | None:
+    """``appellation_changes`` from the run report of the Stage 1 build that wrote ``source_path``.
+
+    Stage 1 writes ``candidates/aoc_regions.gpkg`` beside ``run-report.json``;
+    the report is used only when it lists ``source_path`` as a candidate.
+    """
+
+    report_path = source_path.parent.parent / "run-report.json"
+    if source_path.parent.name != "candidates" or not report_path.is_file():
+        return None
+    report = _read_json(report_path)
+    candidates = {Path(path).resolve() for path in dict(report.get("candidates") or {}).values()}
+    changes = report.get("appellation_changes")
+    if source_path.resolve() not in candidates or not isinstance(changes, dict) or not changes.get("previous_run_id"):
+        return None
+    return changes
+
+
+def _set_aside_region(region_dir: Path, obsolete_root: Path) -> None:
+    """Move ``region_dir`` under ``obsolete_root``, replacing an older copy set aside by a failed resume."""
+
+    target = obsolete_root / region_dir.name
+    if target.exists():
+        shutil.rmtree(target)
+    obsolete_root.mkdir(exist_ok=True)
+    region_dir.rename(target)
+
+
+def _plot_render_errors(region_dirs: dict[str, Path], failures: dict[Path, str]) -> dict[str, str]:
+    return {region: failures[region_dir] for region, region_dir in region_dirs.items() if region_dir in failures}
+
+
+def refresh_plot_manifest(run_dir: Path, failures: dict[Path, str]) -> dict[str, object] | None:
+    """Rewrite the plot fields of a batch ``run.json`` after ``render_pending_plots``.
+
+    ``pending_plot_regions`` is recomputed from ``plot_status``.
+    ``plot_render_errors`` merges ``failures`` into the recorded errors and
+    keeps only regions that are still pending. Returns the updated payload,
+    or ``None`` when ``run_dir`` has no batch manifest.
+    """
+
+    path = run_dir / "run.json"
+    if not path.is_file():
+        return None
+    payload = _read_json(path)
+    region_dirs = {
+        str(region): run_dir / "regions" / slugify_region(str(region))
+        for region in payload.get("expected_region_inventory") or []
+    }
+    errors = {**dict(payload.get("plot_render_errors") or {}), **_plot_render_errors(region_dirs, failures)}
+    pending = [region for region, region_dir in region_dirs.items() if region_dir.is_dir() and plot_status(region_dir) == "pending"]
+    payload["pending_plot_regions"] = pending
+    payload["plot_render_errors"] = {region: errors[region] for region in pending if region in errors}
+    _write_json(path, payload)
+    return payload
+
+
 def _near_total_reductions(metrics: dict[str, object] | None) -> list[str]:
     partition = (metrics or {}).get("partition") or {}
     per_app = partition.get("per_app") or []
@@ -384,6 +504,7 @@ def validate_batch(
     expected_regions: list[str],
     source_sha256: str,
     parameters: SimplificationParameters,
+    budgets: dict[str, SimplificationBudget] | None = None,
 ) -> dict[str, object]:
     checks = []
     region_root = run_dir / "regions"
@@ -408,7 +529,7 @@ def validate_batch(
             params = _read_json(region_dir / "params.json")
             metrics = _read_json(region_dir / "metrics.json")
             source_hashes.append(params.get("stage1_source_sha256"))
-            parameter_matches.append(_effective_parameters_equal(dict(params.get("effective_parameters") or {}), parameters))
+            parameter_matches.append(_parameters_match(params, parameters, (budgets or {}).get(region)))
             complete_artifacts.append(all(path.is_file() for path in _expected_artifacts(region_dir)))
             candidate = gpd.read_file(region_dir / "candidate.geojson", engine="pyogrio")
             schema_matches.append(list(candidate.columns) == OUTPUT_COLUMNS)
@@ -504,6 +625,66 @@ def _prepare_run_dir(output_root: Path, run_id: str, *, resume: bool, overwrite:
     return final_dir, None
 
 
+def _simplify_regions(
+    regions: list[str],
+    *,
+    jobs: int,
+    progress: Callable[[str], None],
+    shards: Stage1Shards,
+    budgets: dict[str, SimplificationBudget] | None = None,
+    **region_kwargs: object,
+) -> dict[str, str]:
+    """Run ``run_single_region`` for each region and return ``{region: error}`` for failures.
+
+    With ``jobs > 1`` regions are fanned out to a process pool. Workers report
+    no stage progress; each region is announced as its result is collected, in
+    region order, so outcomes never depend on completion order.
+    """
+
+    failures: dict[str, str] = {}
+    jobs = min(jobs, len(regions))
+    if jobs <= 1:
+        for region in regions:
+            try:
+                run_single_region(
+                    region=region,
+                    progress=progress,
+                    regional_source=shards.paths[region],
+                    source_sha256=shards.source_sha256,
+                    region_fingerprint=shards.region_fingerprints[region],
+                    budget=(budgets or {}).get(region),
+                    **region_kwargs,
+                )
+            except Exception as error:
+                failures[region] = str(error)
+                progress(f"failed region {region}: {error}")
+        return failures
+
+    progress(f"simplifying {len(regions)} regions with {jobs} worker processes")
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        futures = {
+            region: executor.submit(
+                run_single_region,
+                region=region,
+                regional_source=shards.paths[region],
+                source_sha256=shards.source_sha256,
+                region_fingerprint=shards.region_fingerprints[region],
+                budget=(budgets or {}).get(region),
+                **region_kwargs,
+            )
+            for region in regions
+        }
+        for region, future in futures.items():
+            try:
+                future.result()
+            except Exception as error:
+                failures[region] = str(error)
+                progress(f"failed region {region}: {error}")
+            else:
+                progress(f"completed region: {region}")
+    return failures
+
+
 def run_batch(
     *,
     input_path: Path | None = None,
@@ -514,32 +695,65 @@ def run_batch(
     overwrite: bool = False,
     progress: Callable[[str], None] | None = None,
     command: list[str] | None = None,
+    jobs: int = 1,
+    budget: SimplificationBudget | None = None,
+    plots: str = "inline",
 ) -> BatchResult:
+    """Simplify every region of a Stage 1 candidate into one validated batch run.
+
+    With ``plots="deferred"`` regions are simplified without drawing plots,
+    then every pending plot set, including those of resumed regions, is
+    rendered by a pool of ``jobs`` workers before the batch is validated.
+
+    With ``resume`` after a new Stage 1 build, a region whose Stage 1 rows
+    are unchanged keeps its artifacts; only changed regions are simplified
+    again. When the new build's run report names the Stage 1 run a region was
+    last simplified from, a region it lists under ``affected_regions`` is
+    simplified again even if its rows hash the same. Directories of regions
+    no longer in the input are moved under
+    ``.obsolete_regions`` and deleted only once the batch passes validation.
+    """
+
     if resume and overwrite:
         raise ValueError("--resume and --overwrite are mutually exclusive.")
+    if jobs < 1:
+        raise ValueError("--jobs must be at least 1.")
+    if plots not in PLOT_MODES:
+        raise ValueError(f"Unknown plot mode: {plots!r}.")
     progress = progress or (lambda message: None)
     parameters = parameters or SimplificationParameters()
     project_root = find_project_root()
     source_path = resolve_stage1_input(input_path, project_root=project_root)
-    source_hash = sha256_file(source_path)
     stage1_run_id = infer_stage1_run_id(source_path, project_root=project_root)
-    source = gpd.read_file(source_path, layer="aocs_france")
-    regions = discover_regions(source)
-    input_counts = source.groupby("region").size().to_dict()
-    total_input_rows = len(source)
     run_id = slugify_region(run_id)
     if not run_id:
         raise ValueError("Run ID must contain at least one ASCII letter or number.")
     output_root = output_root or project_root / "tmp" / "wine" / "simplification"
+    shards = shard_stage1_source(source_path, shard_root=output_root / SHARD_DIRECTORY, progress=progress)
+    source_hash = shards.source_sha256
+    regions = shards.regions
+    input_counts = shards.input_counts
+    total_input_rows = shards.total_input_rows
+    budgets = allocate_budget(budget, shards.coordinate_counts) if budget is not None else None
     run_dir, temp_root = _prepare_run_dir(output_root, run_id, resume=resume, overwrite=overwrite)
     run_dir.mkdir(parents=True, exist_ok=True)
     started_at = utc_now()
     outcomes: list[RegionOutcome] = []
     review_rows: list[dict[str, str]] = []
     try:
+        pending: list[str] = []
+        reusable: set[str] = set()
+        adopted: dict[str, str] = {}
+        changes = stage1_appellation_changes(source_path) if resume else None
+        affected_but_unchanged: list[str] = []
+        if resume and (run_dir / "regions").is_dir():
+            expected_slugs = {slugify_region(region) for region in regions}
+            for obsolete in sorted((run_dir / "regions").iterdir()):
+                if obsolete.is_dir() and not obsolete.name.startswith(".") and obsolete.name not in expected_slugs:
+                    progress(f"moving aside region no longer in the Stage 1 input: {obsolete.name}")
+                    _set_aside_region(obsolete, run_dir / OBSOLETE_REGION_DIRECTORY)
         for region in regions:
-            slug = slugify_region(region)
-            region_dir = run_dir / "regions" / slug
+            region_dir = run_dir / "regions" / slugify_region(region)
             if resume and region_dir.exists():
                 valid, reason = validate_region_artifacts(
                     region_dir,
@@ -547,52 +761,89 @@ def run_batch(
                     region=region,
                     source_sha256=source_hash,
                     parameters=parameters,
+                    budget=(budgets or {}).get(region),
+                    region_fingerprint=shards.region_fingerprints[region],
                 )
+                params = _read_json(region_dir / "params.json") if valid else {}
+                if (
+                    valid
+                    and params.get("stage1_source_sha256") != source_hash
+                    and changes is not None
+                    and params.get("stage1_run_id") == changes["previous_run_id"]
+                    and region in changes.get("affected_regions", [])
+                ):
+                    affected_but_unchanged.append(region)
+                    valid, reason = False, f"Stage 1 {stage1_run_id} reports appellation changes since {changes['previous_run_id']}"
                 if valid:
-                    progress(f"skipping complete region: {region}")
-                    outcomes.append(RegionOutcome(region, slug, "skipped"))
-                    review_rows.append(
-                        _review_row(region=region, status="skipped", source_sha256=source_hash, region_dir=region_dir, input_rows=int(input_counts.get(region, 0)))
-                    )
+                    if params.get("stage1_source_sha256") != source_hash:
+                        adopted[region] = _adopt_region(
+                            region_dir,
+                            source_path=source_path,
+                            stage1_run_id=stage1_run_id,
+                            source_sha256=source_hash,
+                        )
+                        progress(f"reusing unchanged region from an earlier Stage 1 source: {region}")
+                    else:
+                        progress(f"skipping complete region: {region}")
+                    reusable.add(region)
                     continue
                 progress(f"regenerating stale region {region}: {reason}")
-            try:
-                run_single_region(
-                    region=region,
-                    input_path=source_path,
-                    run_id=run_id,
-                    output_root=run_dir.parent,
-                    parameters=parameters,
-                    overwrite=resume or overwrite,
-                    progress=progress,
-                    command=command,
-                )
-                outcomes.append(RegionOutcome(region, slug, "completed"))
-                review_rows.append(
-                    _review_row(region=region, status="completed", source_sha256=source_hash, region_dir=region_dir, input_rows=int(input_counts.get(region, 0)))
-                )
-            except Exception as error:
-                outcomes.append(RegionOutcome(region, slug, "failed", str(error)))
-                review_rows.append(
-                    _review_row(region=region, status="failed", source_sha256=source_hash, error=str(error), region_dir=region_dir, input_rows=int(input_counts.get(region, 0)))
-                )
-                progress(f"failed region {region}: {error}")
+            pending.append(region)
+        failures = _simplify_regions(
+            pending,
+            jobs=jobs,
+            progress=progress,
+            shards=shards,
+            budgets=budgets,
+            input_path=source_path,
+            run_id=run_id,
+            output_root=run_dir.parent,
+            parameters=parameters,
+            overwrite=resume or overwrite,
+            command=command,
+            plots=plots,
+        )
+        region_dirs = {region: run_dir / "regions" / slugify_region(region) for region in regions if region not in failures}
+        render_failures = render_pending_plots(list(region_dirs.values()), jobs=jobs, progress=progress) if plots != "off" else {}
+        pending_plots = [region for region, region_dir in region_dirs.items() if plot_status(region_dir) == "pending"]
+        plot_render_errors = _plot_render_errors(region_dirs, render_failures)
+        for region in regions:
+            slug = slugify_region(region)
+            status = "skipped" if region in reusable else "failed" if region in failures else "completed"
+            error = failures.get(region, "")
+            outcomes.append(RegionOutcome(region, slug, status, error))
+            review_rows.append(
+                _review_row(region=region, status=status, source_sha256=source_hash, error=error, region_dir=run_dir / "regions" / slug, input_rows=int(input_counts.get(region, 0)))
+            )
         summary = _summarise(expected_regions=regions, outcomes=outcomes, run_dir=run_dir)
         summary["total_input_rows"] = total_input_rows
-        validation = validate_batch(run_dir=run_dir, expected_regions=regions, source_sha256=source_hash, parameters=parameters) if summary["failed_region_count"] == 0 else {
+        validation = validate_batch(run_dir=run_dir, expected_regions=regions, source_sha256=source_hash, parameters=parameters, budgets=budgets) if summary["failed_region_count"] == 0 else {
             "checks": [],
             "passed": False,
             "fully_covered_appellations_by_region": {},
             "near_total_area_reductions_by_region": {},
             "skipped_due_to_region_failures": True,
         }
+        passed = bool(summary["passed"] and validation["passed"])
+        obsolete_root = run_dir / OBSOLETE_REGION_DIRECTORY
         run_payload = {
             "batch_run_id": run_id,
             "stage1_run_id": stage1_run_id,
             "stage1_source_path": str(source_path),
             "stage1_source_sha256": source_hash,
-            "canonical_parameter_set": parameters.canonical,
+            "canonical_parameter_set": parameters.canonical and budget is None,
             "effective_parameters": parameters.as_dict(),
+            "simplification_budget": budget.as_dict() if budget is not None else None,
+            "plots": plots,
+            "pending_plot_regions": pending_plots,
+            "plot_render_errors": plot_render_errors,
+            "reused_from_earlier_stage1_source": dict(sorted(adopted.items())),
+            "stage1_appellation_changes": None if changes is None else {
+                "previous_stage1_run_id": changes["previous_run_id"],
+                "affected_regions": changes.get("affected_regions", []),
+                "regenerated_with_unchanged_rows": affected_but_unchanged,
+            },
+            "obsolete_regions_set_aside": [] if passed or not obsolete_root.is_dir() else sorted(path.name for path in obsolete_root.iterdir()),
             "expected_region_inventory": regions,
             "package_version": __version__,
             "git_state": git_state(project_root),
@@ -601,9 +852,11 @@ def run_batch(
             "started_at_utc": started_at,
             "completed_at_utc": utc_now(),
             "command": shlex.join(command or sys.argv),
-            "passed": bool(summary["passed"] and validation["passed"]),
+            "passed": passed,
         }
         _write_batch_reports(run_dir=run_dir, run_payload=run_payload, summary=summary, validation=validation, review_rows=review_rows)
+        if passed and obsolete_root.is_dir():
+            shutil.rmtree(obsolete_root)
         if overwrite and temp_root is not None and run_payload["passed"]:
             final_dir = (output_root or project_root / "tmp" / "wine" / "simplification").resolve() / run_id
             _install_run_directory(run_dir, final_dir, overwrite=True)
@@ -31,6 +31,7 @@ from .serialization import (
     SerializationCleanupError,
     cleanup_final_geometries,
 )
+from .shards import STAGE1_LAYER, RegionalSource, load_regional_source
 from .transform import SimplificationParameters, select_region, simplify_region, slugify_region
 
 
@@ -115,20 +116,28 @@ def run_diagnostics(
     region: str | None = None,
     parameters: SimplificationParameters | None = None,
     progress: Callable[[str], None] | None = None,
+    regional_source: RegionalSource | None = None,
+    source_sha256: str | None = None,
 ) -> DiagnosticResult:
     parameters = parameters or SimplificationParameters()
     progress = progress or (lambda message: None)
     started_at = utc_now()
     project_root = find_project_root()
     source_path = resolve_stage1_input(input_path, project_root=project_root)
-    source = gpd.read_file(source_path, layer="aocs_france")
-    available = discover_regions(source)
-    if region is not None:
-        if region not in available:
-            raise ValueError(f"Unknown region {region!r}; available regions: {', '.join(available)}")
+    if regional_source is not None:
+        if region is None:
+            raise ValueError("A regional source requires an explicit region.")
+        source = load_regional_source(regional_source, region)
         regions = [region]
     else:
-        regions = available
+        source = gpd.read_file(source_path, layer=STAGE1_LAYER)
+        available = discover_regions(source)
+        if region is not None:
+            if region not in available:
+                raise ValueError(f"Unknown region {region!r}; available regions: {', '.join(available)}")
+            regions = [region]
+        else:
+            regions = available
 
     raw_run_id = diagnostic_run_id or f"{utc_now().replace(':', '').replace('+00:00', 'Z')}_{uuid.uuid4().hex[:8]}"
     run_id = slugify_region(raw_run_id)
@@ -207,7 +216,7 @@ def run_diagnostics(
     payload = {
         "diagnostic_run_id": run_id,
         "stage1_source_path": str(source_path),
-        "stage1_source_sha256": sha256_file(source_path),
+        "stage1_source_sha256": source_sha256 or sha256_file(source_path),
         "parameters": parameters.as_dict(),
         "started_at_utc": started_at,
         "completed_at_utc": utc_now(),
@@ -2,7 +2,8 @@
 
 from __future__ import annotations
 
-from collections.abc import Callable
+from collections.abc import Callable, Sequence
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
 from datetime import datetime, timezone
 import json
@@ -28,7 +29,6 @@ from .transform import (
     SimplificationParameters,
     classify_residual_overlap,
     metrics_for_frame,
-    select_region,
     simplify_region,
     slugify_region,
 )
@@ -41,6 +41,15 @@ from .serialization import (
     SERIALIZATION_CLEANUP_RELATIVE_TOLERANCE,
     cleanup_final_geometries,
 )
+from .adaptive import SimplificationBudget, simplify_region_within_budget
+from .shards import RegionalSource, load_regional_source
+from .stage_cache import read_frame, region_source_key, write_frame
+
+
+PLOT_MODES = ("inline", "deferred", "off")
+PLOT_ARTIFACTS = ("preview.png", "comparison.png", "overlap_comparison.png")
+PLOT_INPUT_DIRECTORY = "plot_inputs"
+PLOT_INPUT_STAGES = ("raw", "simplified", "partitioned", "removed_overlap")
 
 
 @dataclass(frozen=True)
@@ -55,6 +64,7 @@ class SimplificationRunResult:
     comparison_path: Path
     overlap_comparison_path: Path
     rows: int
+    plot_status: str = "rendered"
 
 
 def utc_now() -> str:
@@ -141,15 +151,45 @@ def _assert_child_path(path: Path, root: Path, *, label: str) -> Path:
     return resolved_path
 
 
+def recorded_plot_mode(run_dir: Path) -> str:
+    """The ``plots`` mode in ``params.json``; runs from before the option rendered inline."""
+
+    try:
+        mode = json.loads((run_dir / "params.json").read_text(encoding="utf-8")).get("plots", "inline")
+    except (OSError, ValueError, AttributeError):
+        return "inline"
+    return mode if mode in PLOT_MODES else "inline"
+
+
+def plot_status(run_dir: Path) -> str:
+    """``rendered``, ``pending`` (deferred plots not yet rendered), or ``off``."""
+
+    mode = recorded_plot_mode(run_dir)
+    if mode == "off":
+        return "off"
+    if mode == "deferred" and not all((run_dir / name).is_file() for name in PLOT_ARTIFACTS):
+        return "pending"
+    return "rendered"
+
+
+def _plot_input_paths(run_dir: Path) -> list[Path]:
+    return [run_dir / PLOT_INPUT_DIRECTORY / f"{stage}.npz" for stage in PLOT_INPUT_STAGES]
+
+
 def _expected_artifacts(run_dir: Path) -> list[Path]:
-    return [
+    """Files a complete regional run holds; pending deferred plots are represented by their inputs."""
+
+    artifacts = [
         run_dir / "candidate.geojson",
         run_dir / "metrics.json",
         run_dir / "params.json",
-        run_dir / "preview.png",
-        run_dir / "comparison.png",
-        run_dir / "overlap_comparison.png",
     ]
+    status = plot_status(run_dir)
+    if status == "rendered":
+        artifacts.extend(run_dir / name for name in PLOT_ARTIFACTS)
+    elif status == "pending":
+        artifacts.extend(_plot_input_paths(run_dir))
+    return artifacts
 
 
 def _candidate_geometry_diagnostics(frame: gpd.GeoDataFrame) -> list[dict[str, object]]:
@@ -324,6 +364,74 @@ def write_plots(
     plt.close(figure)
 
 
+def render_deferred_plots(run_dir: Path) -> None:
+    """Render the plots of a regional run written with ``plots="deferred"``.
+
+    Plots are drawn from the stored stage frames and the written candidate,
+    each PNG is installed by rename, and the plot inputs are removed once all
+    three exist. A run whose plots are already rendered is left unchanged.
+    """
+
+    if plot_status(run_dir) != "pending":
+        return
+    params = json.loads((run_dir / "params.json").read_text(encoding="utf-8"))
+    frames = {stage: read_frame(path) for stage, path in zip(PLOT_INPUT_STAGES, _plot_input_paths(run_dir))}
+    staged = {name: run_dir / f".{name}.tmp-{uuid.uuid4().hex}.png" for name in PLOT_ARTIFACTS}
+    try:
+        write_plots(
+            region=str(params["region"]),
+            run_id=str(params["run_id"]),
+            raw=frames["raw"],
+            simplified=frames["simplified"],
+            partitioned=frames["partitioned"],
+            removed_overlap=frames["removed_overlap"],
+            final=gpd.read_file(run_dir / "candidate.geojson", engine="pyogrio"),
+            preview_path=staged["preview.png"],
+            comparison_path=staged["comparison.png"],
+            overlap_comparison_path=staged["overlap_comparison.png"],
+        )
+        for name, path in staged.items():
+            path.replace(run_dir / name)
+    finally:
+        for path in staged.values():
+            path.unlink(missing_ok=True)
+    shutil.rmtree(run_dir / PLOT_INPUT_DIRECTORY)
+
+
+def render_pending_plots(
+    run_dirs: Sequence[Path],
+    *,
+    jobs: int = 1,
+    progress: Callable[[str], None] | None = None,
+) -> dict[Path, str]:
+    """Render every pending deferred plot set and return ``{run_dir: error}`` for failures."""
+
+    progress = progress or (lambda message: None)
+    pending = [run_dir for run_dir in run_dirs if plot_status(run_dir) == "pending"]
+    failures: dict[Path, str] = {}
+    if not pending:
+        return failures
+    jobs = min(max(jobs, 1), len(pending))
+    progress(f"rendering deferred plots for {len(pending)} regions with {jobs} worker processes")
+    if jobs == 1:
+        for run_dir in pending:
+            try:
+                render_deferred_plots(run_dir)
+            except Exception as error:
+                failures[run_dir] = str(error)
+                progress(f"failed plots for {run_dir.name}: {error}")
+        return failures
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        futures = {run_dir: executor.submit(render_deferred_plots, run_dir) for run_dir in pending}
+        for run_dir, future in futures.items():
+            try:
+                future.result()
+            except Exception as error:
+                failures[run_dir] = str(error)
+                progress(f"failed plots for {run_dir.name}: {error}")
+    return failures
+
+
 def run_single_region(
     *,
     region: str,
@@ -335,7 +443,25 @@ def run_single_region(
     keep_failed_temp: bool = False,
     progress: Callable[[str], None] | None = None,
     command: list[str] | None = None,
+    regional_source: RegionalSource | None = None,
+    source_sha256: str | None = None,
+    region_fingerprint: str | None = None,
+    budget: SimplificationBudget | None = None,
+    plots: str = "inline",
 ) -> SimplificationRunResult:
+    """Simplify one region and install its artifact set.
+
+    ``params.json`` records ``region_fingerprint``, the content hash of the
+    regional Stage 1 rows (computed from them when not given), so a batch
+    resumed against a new Stage 1 source can keep unchanged regions.
+
+    ``plots="deferred"`` stores the stage frames the plots need under
+    ``plot_inputs/`` instead of rendering them; ``render_deferred_plots``
+    draws them later. ``plots="off"`` writes no plots at all.
+    """
+
+    if plots not in PLOT_MODES:
+        raise ValueError(f"Unknown plot mode: {plots!r}.")
     progress = progress or (lambda message: None)
     parameters = parameters or SimplificationParameters()
     project_root = find_project_root()
@@ -360,11 +486,21 @@ def run_single_region(
     temp_dir.mkdir(parents=True, exist_ok=False)
 
     try:
-        progress(f"reading Stage 1 input: {source_path}")
-        source = gpd.read_file(source_path, layer="aocs_france")
-        selected = select_region(source, region)
+        if regional_source is None:
+            progress(f"reading Stage 1 input: {source_path}")
+            selected = load_regional_source(source_path, region)
+        else:
+            selected = load_regional_source(regional_source, region)
         progress(f"selected {len(selected)} Stage 1 rows for {region}")
-        stages = simplify_region(selected, parameters=parameters)
+        region_fingerprint = region_fingerprint or region_source_key(selected)
+        adaptive = None
+        if budget is None:
+            stages = simplify_region(selected, parameters=parameters)
+        else:
+            progress(f"searching simplify_m within budget: {budget.as_dict()}")
+            stages, adaptive = simplify_region_within_budget(selected, budget=budget, parameters=parameters)
+            progress(f"chose simplify_m {adaptive.chosen_simplify_m:g} after {len(adaptive.probes)} probes")
+        parameters = stages.parameters
         if stages.partition_report and stages.partition_report.fully_covered_app_names:
             progress("fully covered appellations: " + ", ".join(stages.partition_report.fully_covered_app_names))
 
@@ -386,19 +522,24 @@ def run_single_region(
             raise ValueError(f"Candidate CRS changed after write: {reloaded.crs}")
         _validate_candidate_round_trip(reloaded, context="Candidate GeoJSON")
 
-        progress("writing visual inspection outputs")
-        write_plots(
-            region=region,
-            run_id=run_id,
-            raw=stages.raw,
-            simplified=stages.simplified,
-            partitioned=stages.partitioned,
-            removed_overlap=stages.removed_overlap,
-            final=serialization_candidate,
-            preview_path=preview_path,
-            comparison_path=comparison_path,
-            overlap_comparison_path=overlap_comparison_path,
-        )
+        if plots == "inline":
+            progress("writing visual inspection outputs")
+            write_plots(
+                region=region,
+                run_id=run_id,
+                raw=stages.raw,
+                simplified=stages.simplified,
+                partitioned=stages.partitioned,
+                removed_overlap=stages.removed_overlap,
+                final=serialization_candidate,
+                preview_path=preview_path,
+                comparison_path=comparison_path,
+                overlap_comparison_path=overlap_comparison_path,
+            )
+        elif plots == "deferred":
+            progress("storing plot inputs for deferred rendering")
+            for stage, path in zip(PLOT_INPUT_STAGES, _plot_input_paths(temp_dir)):
+                write_frame(path, getattr(stages, stage))
 
         partition = stages.partition_report.as_dict() if stages.partition_report else None
         final_metrics = metrics_for_frame(serialization_candidate)
@@ -492,12 +633,15 @@ def run_single_region(
             "run_id": run_id,
             "stage1_run_id": stage1_run_id,
             "stage1_source_path": str(source_path),
-            "stage1_source_sha256": sha256_file(source_path),
+            "stage1_source_sha256": source_sha256 or sha256_file(source_path),
+            "stage1_region_fingerprint": region_fingerprint,
             "output_crs": OUTPUT_CRS,
             "package_version": __version__,
             "git_state": git_state(project_root),
             "generated_at_utc": utc_now(),
             "effective_parameters": parameters.as_dict(),
+            "adaptive_simplification": adaptive.as_dict() if adaptive else None,
+            "plots": plots,
             "command": shlex.join(command or sys.argv),
         }
         _write_json(metrics_path, metrics)
@@ -531,4 +675,5 @@ def run_single_region(
         comparison_path=comparison_path,
         overlap_comparison_path=overlap_comparison_path,
         rows=len(reloaded),
+        plot_status=plot_status(run_dir),
     )
@@ -5,6 +5,8 @@ from __future__ import annotations
 from typing import Any
 
 import geopandas as gpd
+import numpy as np
+import shapely
 from shapely.geometry import MultiPolygon
 from shapely.ops import unary_union
 from shapely.validation import explain_validity
@@ -14,7 +16,7 @@ try:
 except ImportError:  # pragma: no cover
     from shapely.validation import make_valid
 
-from .transform import OUTPUT_COLUMNS, OUTPUT_CRS, WORKING_CRS
+from .transform import MULTIPOLYGON_TYPE_ID, OUTPUT_COLUMNS, OUTPUT_CRS, POLYGON_TYPE_ID, WORKING_CRS
 
 
 SERIALIZATION_CLEANUP_ABSOLUTE_TOLERANCE_M2 = 1.0
@@ -23,6 +25,7 @@ POST_REPROJECTION_NEGLIGIBLE_ABSOLUTE_M2 = 10.0
 POST_REPROJECTION_NEGLIGIBLE_RELATIVE = 1e-8
 POST_REPROJECTION_ABSOLUTE_TOLERANCE_M2 = 100.0
 POST_REPROJECTION_RELATIVE_TOLERANCE = 1e-6
+VALID_GEOMETRY_REASON = "Valid Geometry"
 
 
 class SerializationCleanupError(ValueError):
@@ -99,14 +102,20 @@ def _cleanup_diagnostic(
     absolute_tolerance_m2: float,
     relative_tolerance: float,
     whole_appellation_empty: bool,
+    validity_reason: str | None = None,
+    original_component_count: int | None = None,
 ) -> dict[str, Any]:
+    if validity_reason is None:
+        validity_reason = "Null geometry" if original_geometry is None else explain_validity(original_geometry)
+    if original_component_count is None:
+        original_component_count = _polygon_component_count(original_geometry)
     return {
         "region": region,
         "app": app,
         "original_geometry_type": None if original_geometry is None else original_geometry.geom_type,
         "repaired_geometry_type": None if repaired_geometry is None else repaired_geometry.geom_type,
-        "validity_reason": "Null geometry" if original_geometry is None else explain_validity(original_geometry),
-        "original_polygon_component_count": _polygon_component_count(original_geometry),
+        "validity_reason": validity_reason,
+        "original_polygon_component_count": original_component_count,
         "retained_component_count": retained_count,
         "rejected_component_count": rejected_count,
         "rejected_area_m2": rejected_area,
@@ -129,28 +138,48 @@ def _geometry_area_m2(geometry) -> float:
     )
 
 
-def repair_post_reprojection_geometry(
-    geometry,
+def _clean_polygonal(geometries: np.ndarray) -> np.ndarray:
+    """Mask of valid, non-empty Polygon/MultiPolygon values whose parts all have area."""
+
+    parts, owners = shapely.get_parts(geometries, return_index=True)
+    degenerate = np.bincount(owners[shapely.area(parts) <= 0], minlength=len(geometries))
+    return (
+        np.isin(shapely.get_type_id(geometries), (POLYGON_TYPE_ID, MULTIPOLYGON_TYPE_ID))
+        & ~shapely.is_empty(geometries)
+        & shapely.is_valid(geometries)
+        & (degenerate == 0)
+    )
+
+
+def _part_unions(geometries: np.ndarray) -> np.ndarray:
+    """``unary_union`` of each geometry's parts, evaluated for all rows at once."""
+
+    parts, owners = shapely.get_parts(geometries, return_index=True)
+    counts = np.bincount(owners, minlength=len(geometries))
+    table = np.full((len(geometries), max(int(counts.max(initial=0)), 1)), None, dtype=object)
+    table[owners, np.arange(len(parts)) - np.repeat(np.cumsum(counts) - counts, counts)] = parts
+    return shapely.union_all(table, axis=1)
+
+
+def _post_reprojection_diagnostic(
     *,
     region: str,
     app: str,
-    source_area_m2: float,
-    absolute_tolerance_m2: float = POST_REPROJECTION_ABSOLUTE_TOLERANCE_M2,
-    relative_tolerance: float = POST_REPROJECTION_RELATIVE_TOLERANCE,
-) -> tuple[Any, dict[str, Any]]:
-    """Repair topology exposed by EPSG:4326 reprojection within strict tolerances."""
-    geometry_type_before = None if geometry is None else geometry.geom_type
-    validity_reason_before = "Null geometry" if geometry is None else explain_validity(geometry)
-    component_count_before = _polygon_component_count(geometry)
-    area_before = 0.0 if geometry is None or geometry.is_empty else _geometry_area_m2(geometry)
-    diagnostic = {
+    geometry_type: str | None,
+    validity_reason: str,
+    component_count: int,
+    area_before: float,
+    absolute_tolerance_m2: float,
+    relative_tolerance: float,
+) -> dict[str, Any]:
+    return {
         "region": region,
         "app": app,
-        "post_reprojection_validity_reason_before_repair": validity_reason_before,
-        "post_reprojection_geometry_type_before_repair": geometry_type_before,
-        "post_reprojection_geometry_type_after_repair": geometry_type_before,
-        "post_reprojection_component_count_before_repair": component_count_before,
-        "post_reprojection_component_count_after_repair": component_count_before,
+        "post_reprojection_validity_reason_before_repair": validity_reason,
+        "post_reprojection_geometry_type_before_repair": geometry_type,
+        "post_reprojection_geometry_type_after_repair": geometry_type,
+        "post_reprojection_component_count_before_repair": component_count,
+        "post_reprojection_component_count_after_repair": component_count,
         "post_reprojection_area_before_m2": area_before,
         "post_reprojection_area_after_m2": area_before,
         "post_reprojection_absolute_area_change_m2": 0.0,
@@ -162,6 +191,32 @@ def repair_post_reprojection_geometry(
         "post_reprojection_cleanup_action": "post_reprojection_unchanged",
         "post_reprojection_review_classification": "none",
     }
+
+
+def repair_post_reprojection_geometry(
+    geometry,
+    *,
+    region: str,
+    app: str,
+    source_area_m2: float,
+    absolute_tolerance_m2: float = POST_REPROJECTION_ABSOLUTE_TOLERANCE_M2,
+    relative_tolerance: float = POST_REPROJECTION_RELATIVE_TOLERANCE,
+) -> tuple[Any, dict[str, Any]]:
+    """Repair topology exposed by EPSG:4326 reprojection within strict tolerances."""
+    geometry_type_before = None if geometry is None else geometry.geom_type
+    validity_reason_before = "Null geometry" if geometry is None else explain_validity(geometry)
+    component_count_before = _polygon_component_count(geometry)
+    area_before = 0.0 if geometry is None or geometry.is_empty else _geometry_area_m2(geometry)
+    diagnostic = _post_reprojection_diagnostic(
+        region=region,
+        app=app,
+        geometry_type=geometry_type_before,
+        validity_reason=validity_reason_before,
+        component_count=component_count_before,
+        area_before=area_before,
+        absolute_tolerance_m2=absolute_tolerance_m2,
+        relative_tolerance=relative_tolerance,
+    )
     if geometry is None or geometry.is_empty:
         diagnostic["post_reprojection_review_classification"] = "fatal"
         raise SerializationCleanupError("Post-reprojection geometry is empty", diagnostic)
@@ -227,6 +282,113 @@ def repair_post_reprojection_geometry(
     return final_geometry, diagnostic
 
 
+def _cleanup_geometry(
+    geometry,
+    *,
+    region: str,
+    app: str,
+    source_area: float,
+    absolute_tolerance_m2: float,
+    relative_tolerance: float,
+) -> tuple[Any, dict[str, Any]]:
+    if geometry is None or geometry.is_empty:
+        diagnostic = _cleanup_diagnostic(
+            region=region,
+            app=app,
+            original_geometry=geometry,
+            repaired_geometry=geometry,
+            source_area=source_area,
+            retained_count=0,
+            rejected_count=0,
+            rejected_area=0.0,
+            absolute_tolerance_m2=absolute_tolerance_m2,
+            relative_tolerance=relative_tolerance,
+            whole_appellation_empty=True,
+        )
+        raise SerializationCleanupError("Serialization cleanup input is empty", diagnostic)
+
+    original_type = geometry.geom_type
+    original_reason = explain_validity(geometry)
+    try:
+        repaired = make_valid(geometry)
+    except Exception as error:
+        diagnostic = _cleanup_diagnostic(
+            region=region,
+            app=app,
+            original_geometry=geometry,
+            repaired_geometry=None,
+            source_area=source_area,
+            retained_count=0,
+            rejected_count=0,
+            rejected_area=0.0,
+            absolute_tolerance_m2=absolute_tolerance_m2,
+            relative_tolerance=relative_tolerance,
+            whole_appellation_empty=False,
+        )
+        raise SerializationCleanupError("Serialization geometry repair failed", diagnostic) from error
+    polygons, rejected = _polygon_components(repaired)
+    rejected_area = sum(max(float(component.area), 0.0) for component in rejected if not component.is_empty)
+    retained_area = sum(float(component.area) for component in polygons)
+    removed_area = (
+        max(rejected_area, max(float(geometry.area) - retained_area, 0.0))
+        if rejected
+        else 0.0
+    )
+    removed_fraction = removed_area / source_area if source_area > 0 else float("inf")
+    diagnostic = _cleanup_diagnostic(
+        region=region,
+        app=app,
+        original_geometry=geometry,
+        repaired_geometry=repaired,
+        source_area=source_area,
+        retained_count=len(polygons),
+        rejected_count=len(rejected),
+        rejected_area=removed_area,
+        absolute_tolerance_m2=absolute_tolerance_m2,
+        relative_tolerance=relative_tolerance,
+        whole_appellation_empty=not polygons,
+    )
+
+    if not polygons:
+        raise SerializationCleanupError("Serialization cleanup removed the whole appellation", diagnostic)
+    if rejected and (
+        removed_area > absolute_tolerance_m2
+        or removed_fraction > relative_tolerance
+    ):
+        raise SerializationCleanupError("Serialization cleanup exceeds removal tolerances", diagnostic)
+
+    try:
+        final_geometry = _polygonal_union(polygons)
+    except Exception as error:
+        raise SerializationCleanupError("Serialization cleanup polygon union failed", diagnostic) from error
+    if final_geometry.is_empty:
+        diagnostic["whole_appellation_empty"] = True
+        diagnostic["retained_component_count"] = 0
+        raise SerializationCleanupError("Serialization cleanup produced an empty appellation", diagnostic)
+    if not final_geometry.is_valid:
+        diagnostic["repaired_geometry_type"] = final_geometry.geom_type
+        diagnostic["validity_reason"] = explain_validity(final_geometry)
+        raise SerializationCleanupError("Serialization cleanup remains invalid", diagnostic)
+
+    removed_count = len(rejected)
+    if removed_count:
+        action = "removed_negligible_invalid_or_degenerate_components"
+    elif not geometry.is_valid or not geometry.equals(final_geometry):
+        action = "repaired_without_component_removal"
+    else:
+        action = "unchanged"
+    return final_geometry, {
+        **diagnostic,
+        "original_geometry_type": original_type,
+        "final_geometry_type": final_geometry.geom_type,
+        "removed_component_count": removed_count,
+        "removed_area_m2": removed_area,
+        "removed_area_fraction_of_source": removed_fraction,
+        "validity_reason": original_reason,
+        "cleanup_action": action,
+    }
+
+
 def cleanup_final_geometries(
     frame: gpd.GeoDataFrame,
     *,
@@ -239,129 +401,104 @@ def cleanup_final_geometries(
     1 square metre and its fraction of the preserved source area is at most
     1e-9. These deliberately strict defaults target serialization debris, not
     meaningful geometry.
+
+    Rows that are already valid, non-empty polygons are checked and unioned
+    in bulk; only the remainder take the per-geometry repair path. Both paths
+    produce the same geometry and diagnostics.
     """
     if frame.crs is None:
         raise ValueError("Final serialization cleanup requires a defined CRS.")
     working = frame.to_crs(WORKING_CRS).copy()
+    geometries = working.geometry.to_numpy()
+    regions = [str(value) for value in working["region"]] if "region" in working.columns else [""] * len(working)
+    apps = [str(value) for value in working["app"]] if "app" in working.columns else [""] * len(working)
+    source_areas = [float(value) for value in working["source_area_m2"]]
+
+    unions = np.full(len(geometries), None, dtype=object)
+    fast = _clean_polygonal(geometries)
+    unions[fast] = shapely.make_valid(_part_unions(geometries[fast]))
+    fast &= _clean_polygonal(unions)
+    unchanged = np.zeros(len(geometries), dtype=bool)
+    unchanged[fast] = shapely.equals(geometries[fast], unions[fast])
+    component_counts = shapely.get_num_geometries(geometries).tolist()
+
     cleaned_geometries = []
     diagnostics = []
-
-    for _, row in working.iterrows():
-        geometry = row.geometry
-        region = str(row.get("region", ""))
-        app = str(row.get("app", ""))
-        source_area = float(row["source_area_m2"])
-        if geometry is None or geometry.is_empty:
-            diagnostic = _cleanup_diagnostic(
-                region=region,
-                app=app,
-                original_geometry=geometry,
-                repaired_geometry=geometry,
-                source_area=source_area,
-                retained_count=0,
-                rejected_count=0,
-                rejected_area=0.0,
-                absolute_tolerance_m2=absolute_tolerance_m2,
-                relative_tolerance=relative_tolerance,
-                whole_appellation_empty=True,
-            )
-            raise SerializationCleanupError("Serialization cleanup input is empty", diagnostic)
-
-        original_type = geometry.geom_type
-        original_reason = explain_validity(geometry)
-        try:
-            repaired = make_valid(geometry)
-        except Exception as error:
-            diagnostic = _cleanup_diagnostic(
-                region=region,
-                app=app,
-                original_geometry=geometry,
-                repaired_geometry=None,
-                source_area=source_area,
-                retained_count=0,
-                rejected_count=0,
-                rejected_area=0.0,
+    for position, geometry in enumerate(geometries):
+        if not fast[position]:
+            final_geometry, diagnostic = _cleanup_geometry(
+                geometry,
+                region=regions[position],
+                app=apps[position],
+                source_area=source_areas[position],
                 absolute_tolerance_m2=absolute_tolerance_m2,
                 relative_tolerance=relative_tolerance,
-                whole_appellation_empty=False,
             )
-            raise SerializationCleanupError("Serialization geometry repair failed", diagnostic) from error
-        polygons, rejected = _polygon_components(repaired)
-        rejected_area = sum(max(float(component.area), 0.0) for component in rejected if not component.is_empty)
-        retained_area = sum(float(component.area) for component in polygons)
-        removed_area = (
-            max(rejected_area, max(float(geometry.area) - retained_area, 0.0))
-            if rejected
-            else 0.0
-        )
-        removed_fraction = removed_area / source_area if source_area > 0 else float("inf")
+            diagnostics.append(diagnostic)
+            cleaned_geometries.append(final_geometry)
+            continue
+        final_geometry = unions[position]
+        source_area = source_areas[position]
         diagnostic = _cleanup_diagnostic(
-            region=region,
-            app=app,
+            region=regions[position],
+            app=apps[position],
             original_geometry=geometry,
-            repaired_geometry=repaired,
+            repaired_geometry=geometry,
             source_area=source_area,
-            retained_count=len(polygons),
-            rejected_count=len(rejected),
-            rejected_area=removed_area,
+            retained_count=component_counts[position],
+            rejected_count=0,
+            rejected_area=0.0,
             absolute_tolerance_m2=absolute_tolerance_m2,
             relative_tolerance=relative_tolerance,
-            whole_appellation_empty=not polygons,
+            whole_appellation_empty=False,
+            validity_reason=VALID_GEOMETRY_REASON,
+            original_component_count=component_counts[position],
         )
-
-        if not polygons:
-            raise SerializationCleanupError("Serialization cleanup removed the whole appellation", diagnostic)
-        if rejected and (
-            removed_area > absolute_tolerance_m2
-            or removed_fraction > relative_tolerance
-        ):
-            raise SerializationCleanupError("Serialization cleanup exceeds removal tolerances", diagnostic)
-
-        try:
-            final_geometry = _polygonal_union(polygons)
-        except Exception as error:
-            raise SerializationCleanupError("Serialization cleanup polygon union failed", diagnostic) from error
-        if final_geometry.is_empty:
-            diagnostic["whole_appellation_empty"] = True
-            diagnostic["retained_component_count"] = 0
-            raise SerializationCleanupError("Serialization cleanup produced an empty appellation", diagnostic)
-        if not final_geometry.is_valid:
-            diagnostic["repaired_geometry_type"] = final_geometry.geom_type
-            diagnostic["validity_reason"] = explain_validity(final_geometry)
-            raise SerializationCleanupError("Serialization cleanup remains invalid", diagnostic)
-
-        removed_count = len(rejected)
-        if removed_count:
-            action = "removed_negligible_invalid_or_degenerate_components"
-        elif not geometry.is_valid or not geometry.equals(final_geometry):
-            action = "repaired_without_component_removal"
-        else:
-            action = "unchanged"
         diagnostics.append(
             {
                 **diagnostic,
-                "original_geometry_type": original_type,
                 "final_geometry_type": final_geometry.geom_type,
-                "removed_component_count": removed_count,
-                "removed_area_m2": removed_area,
-                "removed_area_fraction_of_source": removed_fraction,
-                "validity_reason": original_reason,
-                "cleanup_action": action,
+                "removed_component_count": 0,
+                "removed_area_m2": 0.0,
+                "removed_area_fraction_of_source": 0.0 / source_area if source_area > 0 else float("inf"),
+                "cleanup_action": "unchanged" if unchanged[position] else "repaired_without_component_removal",
             }
         )
         cleaned_geometries.append(final_geometry)
 
     working.geometry = cleaned_geometries
     cleaned = working.to_crs(OUTPUT_CRS)[OUTPUT_COLUMNS]
+    projected = cleaned.geometry.to_numpy()
+    post_fast = _clean_polygonal(projected)
+    areas_before = np.zeros(len(projected))
+    if post_fast.any():
+        areas_before[post_fast] = (
+            gpd.GeoSeries(_part_unions(projected[post_fast]), crs=OUTPUT_CRS).to_crs(WORKING_CRS).area.to_numpy()
+        )
+    post_component_counts = shapely.get_num_geometries(projected).tolist()
     post_reprojection_geometries = []
-    for position, (_, row) in enumerate(cleaned.iterrows()):
-        geometry = row.geometry
+    for position, geometry in enumerate(projected):
+        if post_fast[position]:
+            diagnostics[position].update(
+                _post_reprojection_diagnostic(
+                    region=regions[position],
+                    app=apps[position],
+                    geometry_type=geometry.geom_type,
+                    validity_reason=VALID_GEOMETRY_REASON,
+                    component_count=post_component_counts[position],
+                    area_before=float(areas_before[position]),
+                    absolute_tolerance_m2=POST_REPROJECTION_ABSOLUTE_TOLERANCE_M2,
+                    relative_tolerance=POST_REPROJECTION_RELATIVE_TOLERANCE,
+                )
+            )
+            post_reprojection_geometries.append(geometry)
+            continue
         try:
             final_geometry, post_diagnostic = repair_post_reprojection_geometry(
                 geometry,
-                region=str(row.get("region", "")),
-                app=str(row.get("app", "")),
-                source_area_m2=float(row["source_area_m2"]),
+                region=regions[position],
+                app=apps[position],
+                source_area_m2=source_areas[position],
             )
         except SerializationCleanupError as error:
             error.diagnostic.update(
@@ -375,12 +512,12 @@ def cleanup_final_geometries(
         diagnostics[position].update(post_diagnostic)
         post_reprojection_geometries.append(final_geometry)
     cleaned.geometry = post_reprojection_geometries
-    for position, (_, row) in enumerate(cleaned.iterrows()):
-        if row.geometry is not None and not row.geometry.is_empty and row.geometry.is_valid:
-            continue
+    final_geometries = cleaned.geometry.to_numpy()
+    for position in np.flatnonzero(~(shapely.is_valid(final_geometries) & ~shapely.is_empty(final_geometries))).tolist():
+        geometry = final_geometries[position]
         diagnostic = dict(diagnostics[position])
         diagnostic["post_reprojection_validity_reason_before_repair"] = (
-            "Null geometry" if row.geometry is None else explain_validity(row.geometry)
+            "Null geometry" if geometry is None else explain_validity(geometry)
         )
         raise SerializationCleanupError(
             "Post-reprojection validation failed after topology repair",
@@ -0,0 +1,133 @@
+"""Read-once regional shards of the Stage 1 AOC source."""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from dataclasses import dataclass
+import json
+from pathlib import Path
+import shutil
+import uuid
+
+import geopandas as gpd
+import shapely
+
+from ..provenance import sha256_file
+from .stage_cache import region_source_key
+from .transform import STAGE1_COLUMNS, select_region, slugify_region, validate_stage1_schema
+
+
+STAGE1_LAYER = "aocs_france"
+SHARD_FORMAT_VERSION = 3
+SHARD_MANIFEST = "manifest.json"
+
+RegionalSource = gpd.GeoDataFrame | Path
+
+
+@dataclass(frozen=True)
+class Stage1Shards:
+    source_path: Path
+    source_sha256: str
+    shard_dir: Path
+    regions: list[str]
+    input_counts: dict[str, int]
+    coordinate_counts: dict[str, int]
+    region_fingerprints: dict[str, str]
+    total_input_rows: int
+    paths: dict[str, Path]
+
+
+def load_regional_source(source: RegionalSource, region: str) -> gpd.GeoDataFrame:
+    """Return the Stage 1 rows for ``region`` from a frame or a shard/source path."""
+
+    frame = gpd.read_file(source, layer=STAGE1_LAYER) if isinstance(source, Path) else source
+    return select_region(frame, region)
+
+
+def _read_manifest(shard_dir: Path, source_sha256: str) -> dict[str, object] | None:
+    try:
+        manifest = json.loads((shard_dir / SHARD_MANIFEST).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if manifest.get("format_version") != SHARD_FORMAT_VERSION or manifest.get("source_sha256") != source_sha256:
+        return None
+    if not all((shard_dir / str(item["file"])).is_file() for item in manifest.get("regions") or []):
+        return None
+    return manifest
+
+
+def _write_shards(source_path: Path, source_sha256: str, temp_dir: Path) -> None:
+    source = gpd.read_file(source_path, layer=STAGE1_LAYER)
+    validate_stage1_schema(source)
+    labels = source["region"].astype(str)
+    regions = []
+    for region in sorted({str(value).strip() for value in source["region"].dropna() if str(value).strip()}):
+        file_name = f"{slugify_region(region)}.gpkg"
+        selected = source.loc[labels == region, STAGE1_COLUMNS]
+        selected.to_file(temp_dir / file_name, layer=STAGE1_LAYER, driver="GPKG", engine="pyogrio", index=False)
+        regions.append({
+            "region": region,
+            "file": file_name,
+            "rows": len(selected),
+            "coordinates": int(shapely.get_num_coordinates(selected.geometry.to_numpy()).sum()),
+            "fingerprint": region_source_key(selected),
+        })
+    manifest = {
+        "format_version": SHARD_FORMAT_VERSION,
+        "source_path": str(source_path),
+        "source_sha256": source_sha256,
+        "total_input_rows": len(source),
+        "regions": regions,
+    }
+    (temp_dir / SHARD_MANIFEST).write_text(json.dumps(manifest, indent=2, sort_keys=True, ensure_ascii=False) + "\n", encoding="utf-8")
+
+
+def shard_stage1_source(
+    source_path: Path,
+    *,
+    shard_root: Path,
+    progress: Callable[[str], None] | None = None,
+) -> Stage1Shards:
+    """Hash and read ``source_path`` once, writing one GeoPackage per region.
+
+    Shards live in ``shard_root/<source sha256>/`` and are reused while the
+    source hash is unchanged, so a repeat run only hashes the source. The
+    manifest records a content fingerprint of each region's rows, which stays
+    equal across sources when that region's Stage 1 rows are unchanged. The
+    directory is installed atomically after its manifest is written; it is
+    disposable and never consulted for a different source hash.
+    """
+
+    progress = progress or (lambda message: None)
+    source_sha256 = sha256_file(source_path)
+    shard_dir = shard_root.resolve() / source_sha256
+    manifest = _read_manifest(shard_dir, source_sha256)
+    if manifest is None:
+        progress(f"sharding Stage 1 input by region: {source_path}")
+        temp_dir = shard_dir.with_name(f".{source_sha256}.tmp-{uuid.uuid4().hex}")
+        temp_dir.mkdir(parents=True, exist_ok=False)
+        try:
+            _write_shards(source_path, source_sha256, temp_dir)
+            if shard_dir.exists():
+                shutil.rmtree(shard_dir)
+            temp_dir.replace(shard_dir)
+        finally:
+            if temp_dir.exists():
+                shutil.rmtree(temp_dir)
+        manifest = _read_manifest(shard_dir, source_sha256)
+        if manifest is None:
+            raise ValueError(f"Stage 1 shard manifest is incomplete: {shard_dir}")
+    else:
+        progress(f"reusing Stage 1 regional shards: {shard_dir}")
+    items = list(manifest["regions"])
+    return Stage1Shards(
+        source_path=source_path,
+        source_sha256=source_sha256,
+        shard_dir=shard_dir,
+        regions=[str(item["region"]) for item in items],
+        input_counts={str(item["region"]): int(item["rows"]) for item in items},
+        coordinate_counts={str(item["region"]): int(item["coordinates"]) for item in items},
+        region_fingerprints={str(item["region"]): str(item["fingerprint"]) for item in items},
+        total_input_rows=int(manifest["total_input_rows"]),
+        paths={str(item["region"]): shard_dir / str(item["file"]) for item in items},
+    )
@@ -0,0 +1,192 @@
+"""Content-addressed cache of intermediate Stage 2 simplification stages.
+
+Repair, dissolve, and morphological closing do not depend on the
+simplification tolerance, and repair and dissolve do not depend on any
+parameter at all. ``StageCache`` keys each stage by a hash of the regional
+input plus only the parameters upstream of that stage, so a parameter sweep
+repeats just the stages whose inputs changed. Entries are exact: geometry is
+stored as WKB and attributes as JSON, so a cached stage is byte-identical to a
+recomputed one. Keys also carry the pipeline, shapely, and GEOS versions,
+because repair and simplification output can change between GEOS releases.
+The on-disk root is disposable and always safe to delete.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+import hashlib
+import json
+import os
+from pathlib import Path
+import tempfile
+import zipfile
+
+import geopandas as gpd
+import numpy as np
+import pandas as pd
+from pyproj import CRS
+import shapely
+
+from .. import __version__
+
+
+STAGE_CACHE_FORMAT_VERSION = 2
+CACHED_STAGES = ("repaired", "dissolved", "closed", "simplified")
+
+
+def region_source_key(frame: gpd.GeoDataFrame) -> str:
+    """SHA-256 of a regional input's attributes, CRS, and geometry, in row order."""
+
+    digest = hashlib.sha256()
+    attributes = frame.drop(columns=frame.geometry.name).astype(object)
+    digest.update(
+        json.dumps(
+            {
+                "columns": attributes.columns.tolist(),
+                "crs": frame.crs.to_wkt() if frame.crs is not None else None,
+                "values": attributes.where(attributes.notna(), None).to_numpy().tolist(),
+            },
+            ensure_ascii=False,
+            sort_keys=True,
+        ).encode("utf-8")
+    )
+    for value in shapely.to_wkb(frame.geometry.to_numpy()).tolist():
+        digest.update(len(value or b"").to_bytes(8, "little"))
+        digest.update(value or b"")
+    return digest.hexdigest()
+
+
+def stage_key(stage: str, source_key: str, **parameters: float) -> str:
+    if stage not in CACHED_STAGES:
+        raise ValueError(f"Unknown cached stage: {stage!r}.")
+    payload = {
+        "format_version": STAGE_CACHE_FORMAT_VERSION,
+        "stage": stage,
+        "source": source_key,
+        "parameters": {name: float(value) for name, value in parameters.items()},
+        "pipeline_version": __version__,
+        "shapely_version": shapely.__version__,
+        "geos_version": ".".join(str(part) for part in shapely.geos_version),
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+class StageCache:
+    """In-memory stage frames, optionally persisted under ``root``.
+
+    Frames are copied on the way in and out so callers may modify what they
+    receive. ``root=None`` keeps the cache in memory for the current process.
+    """
+
+    def __init__(self, root: Path | None = None) -> None:
+        self.root = root
+        self._frames: dict[str, gpd.GeoDataFrame] = {}
+        self.hits: dict[str, int] = {stage: 0 for stage in CACHED_STAGES}
+        self.misses: dict[str, int] = {stage: 0 for stage in CACHED_STAGES}
+
+    def fetch(
+        self,
+        stage: str,
+        source_key: str,
+        build: Callable[[], gpd.GeoDataFrame],
+        **parameters: float,
+    ) -> gpd.GeoDataFrame:
+        key = stage_key(stage, source_key, **parameters)
+        frame = self._frames.get(key)
+        if frame is None and self.root is not None:
+            frame = self._read(key)
+        if frame is not None:
+            self.hits[stage] += 1
+            self._frames[key] = frame
+            return frame.copy()
+        self.misses[stage] += 1
+        frame = build()
+        self._frames[key] = frame.copy()
+        if self.root is not None:
+            self._write(key, frame)
+        return frame
+
+    def _entry(self, key: str) -> Path:
+        return self.root / f"{key}.npz"
+
+    def _read(self, key: str) -> gpd.GeoDataFrame | None:
+        entry = self._entry(key)
+        if not entry.is_file():
+            return None
+        try:
+            return read_frame(entry)
+        except (OSError, ValueError, KeyError, zipfile.BadZipFile):
+            entry.unlink(missing_ok=True)
+            return None
+
+    def _write(self, key: str, frame: gpd.GeoDataFrame) -> None:
+        write_frame(self._entry(key), frame)
+
+
+def _restored_crs(wkt: str | None) -> CRS | str | None:
+    """The stored WKT, or its authority code when that code gives the same WKT.
+
+    Keeping ``EPSG:2154`` as the code leaves ``str(frame.crs)`` exactly as in a
+    recomputed frame, while a CRS without an exact code keeps its full WKT.
+    """
+
+    if wkt is None:
+        return None
+    crs = CRS.from_wkt(wkt)
+    authority = crs.to_authority(min_confidence=100)
+    if authority is not None and CRS.from_user_input(":".join(authority)).to_wkt() == wkt:
+        return ":".join(authority)
+    return crs
+
+
+def read_frame(path: Path) -> gpd.GeoDataFrame:
+    """Read a frame written by ``write_frame``."""
+
+    with np.load(path, allow_pickle=False) as archive:
+        metadata = json.loads(str(archive["metadata"]))
+        data = archive["wkb"].tobytes()
+        offsets = archive["offsets"].tolist()
+    geometry = shapely.from_wkb([data[start:stop] or None for start, stop in zip(offsets[:-1], offsets[1:])])
+    index = pd.RangeIndex(len(geometry)) if metadata["index"] is None else pd.Index(metadata["index"])
+    columns = {
+        column: pd.Series(metadata["values"][column], index=index, dtype=object).astype(dtype)
+        for column, dtype in metadata["columns"].items()
+    }
+    name = metadata["geometry_column"]
+    crs = _restored_crs(metadata["crs"])
+    columns[name] = gpd.GeoSeries(geometry, index=index, crs=crs)
+    return gpd.GeoDataFrame(pd.DataFrame(columns, index=index)[metadata["order"]], geometry=name, crs=crs)
+
+
+def write_frame(path: Path, frame: gpd.GeoDataFrame) -> None:
+    """Write ``frame`` atomically as WKB geometry and JSON attributes in one ``.npz`` file."""
+
+    attributes = pd.DataFrame(frame.drop(columns=frame.geometry.name))
+    metadata = {
+        "geometry_column": frame.geometry.name,
+        "order": frame.columns.tolist(),
+        "crs": frame.crs.to_wkt() if frame.crs is not None else None,
+        "index": None if frame.index.equals(pd.RangeIndex(len(frame))) else frame.index.tolist(),
+        "columns": {column: str(dtype) for column, dtype in attributes.dtypes.items()},
+        "values": {
+            column: attributes[column].astype(object).where(attributes[column].notna(), None).tolist()
+            for column in attributes.columns
+        },
+    }
+    encoded = [value or b"" for value in shapely.to_wkb(frame.geometry.to_numpy()).tolist()]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(value) for value in encoded], out=offsets[1:])
+    path.parent.mkdir(parents=True, exist_ok=True)
+    descriptor, temporary = tempfile.mkstemp(prefix=f".{path.stem}-", suffix=".npz", dir=path.parent)
+    try:
+        with os.fdopen(descriptor, "wb") as handle:
+            np.savez(
+                handle,
+                metadata=np.array(json.dumps(metadata, ensure_ascii=False)),
+                wkb=np.frombuffer(b"".join(encoded), dtype=np.uint8),
+                offsets=offsets,
+            )
+        os.replace(temporary, path)
+    except BaseException:
+        Path(temporary).unlink(missing_ok=True)
+        raise
@@ -0,0 +1,214 @@
+"""Stage 2 parameter sweeps that reuse cached upstream stages."""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Sequence
+import csv
+from dataclasses import dataclass
+import itertools
+import json
+from pathlib import Path
+from time import perf_counter
+import uuid
+
+import geopandas as gpd
+
+from ..provenance import sha256_file
+from .batch import discover_regions
+from .runner import find_project_root, resolve_stage1_input, utc_now
+from .shards import STAGE1_LAYER
+from .stage_cache import CACHED_STAGES, StageCache
+from .transform import (
+    SimplificationParameters,
+    classify_residual_overlap,
+    metrics_for_frame,
+    select_region,
+    simplify_region,
+    slugify_region,
+)
+
+
+SWEEP_COLUMNS = [
+    "region",
+    "buffer_m",
+    "simplify_m",
+    "overlap_strategy",
+    "canonical_parameter_set",
+    "status",
+    "feature_count",
+    "coordinate_count",
+    "coordinate_reduction_percent",
+    "polygon_part_count",
+    "approx_geojson_size_mb",
+    "overlap_before_partition_m2",
+    "overlap_after_partition_m2",
+    "residual_overlap_classification",
+    "fully_covered_app_count",
+    "elapsed_seconds",
+    "error",
+]
+
+
+@dataclass(frozen=True)
+class SweepResult:
+    run_id: str
+    run_dir: Path
+    json_path: Path
+    csv_path: Path
+    rows: list[dict[str, object]]
+    cache_hits: dict[str, int]
+
+    @property
+    def failed_count(self) -> int:
+        return sum(row["status"] == "failed" for row in self.rows)
+
+
+def parameter_grid(
+    buffers: Sequence[float],
+    simplifies: Sequence[float],
+    overlap_strategies: Sequence[str],
+) -> list[SimplificationParameters]:
+    """Every parameter combination, ordered so shared stage prefixes run back to back."""
+
+    return [
+        SimplificationParameters(buffer_m=float(buffer_m), simplify_m=float(simplify_m), overlap_strategy=strategy)
+        for buffer_m, simplify_m, strategy in itertools.product(
+            sorted(set(buffers)), sorted(set(simplifies)), sorted(set(overlap_strategies))
+        )
+    ]
+
+
+def _sweep_row(region: str, parameters: SimplificationParameters) -> dict[str, object]:
+    return {
+        "region": region,
+        "buffer_m": parameters.buffer_m,
+        "simplify_m": parameters.simplify_m,
+        "overlap_strategy": parameters.overlap_strategy,
+        "canonical_parameter_set": parameters.canonical,
+        "status": "passed",
+        "feature_count": 0,
+        "coordinate_count": 0,
+        "coordinate_reduction_percent": 0.0,
+        "polygon_part_count": 0,
+        "approx_geojson_size_mb": 0.0,
+        "overlap_before_partition_m2": 0.0,
+        "overlap_after_partition_m2": 0.0,
+        "residual_overlap_classification": "",
+        "fully_covered_app_count": 0,
+        "elapsed_seconds": 0.0,
+        "error": "",
+    }
+
+
+def run_sweep(
+    *,
+    input_path: Path | None = None,
+    sweep_run_id: str | None = None,
+    output_root: Path | None = None,
+    regions: Sequence[str] | None = None,
+    buffers: Sequence[float] = (500.0,),
+    simplifies: Sequence[float] = (150.0,),
+    overlap_strategies: Sequence[str] = ("smallest-wins",),
+    stage_cache_root: Path | None = None,
+    progress: Callable[[str], None] | None = None,
+) -> SweepResult:
+    """Simplify each region once per parameter set and tabulate the results.
+
+    Parameter sets for a region share one ``StageCache``, so repair and
+    dissolve run once per region, closing once per buffer, and simplification
+    once per buffer and tolerance. ``stage_cache_root`` also persists stages
+    across sweeps. No regional artifacts are written.
+    """
+
+    grid = parameter_grid(buffers, simplifies, overlap_strategies)
+    if not grid:
+        raise ValueError("A sweep needs at least one buffer, simplification, and overlap strategy value.")
+    progress = progress or (lambda message: None)
+    started_at = utc_now()
+    project_root = find_project_root()
+    source_path = resolve_stage1_input(input_path, project_root=project_root)
+    source = gpd.read_file(source_path, layer=STAGE1_LAYER)
+    available = discover_regions(source)
+    unknown = sorted(set(regions or []) - set(available))
+    if unknown:
+        raise ValueError(f"Unknown region {unknown[0]!r}; available regions: {', '.join(available)}")
+    selected_regions = sorted(set(regions)) if regions else available
+
+    raw_run_id = sweep_run_id or f"{utc_now().replace(':', '').replace('+00:00', 'Z')}_{uuid.uuid4().hex[:8]}"
+    run_id = slugify_region(raw_run_id)
+    if not run_id:
+        raise ValueError("Sweep run ID must contain at least one ASCII letter or number.")
+    root = (output_root or project_root / "tmp" / "wine" / "simplification" / "sweeps").resolve()
+    run_dir = (root / run_id).resolve()
+    if root != run_dir and root not in run_dir.parents:
+        raise ValueError(f"Sweep run directory resolved outside output root: {run_dir}")
+    run_dir.mkdir(parents=True, exist_ok=False)
+
+    rows = []
+    cache_hits = {stage: 0 for stage in CACHED_STAGES}
+    for region in selected_regions:
+        stage_cache = StageCache(stage_cache_root)
+        selected = select_region(source, region)
+        for parameters in grid:
+            started = perf_counter()
+            row = _sweep_row(region, parameters)
+            progress(
+                f"sweeping {region}: buffer {parameters.buffer_m:g} m, simplify {parameters.simplify_m:g} m, "
+                f"{parameters.overlap_strategy}"
+            )
+            try:
+                stages = simplify_region(selected, parameters=parameters, stage_cache=stage_cache)
+                raw_coordinates = metrics_for_frame(stages.raw)["coordinate_count"]
+                final_metrics = metrics_for_frame(stages.final)
+                row.update({
+                    key: final_metrics[key]
+                    for key in ("feature_count", "coordinate_count", "polygon_part_count", "approx_geojson_size_mb")
+                })
+                row["coordinate_reduction_percent"] = (
+                    round(100.0 * (1 - final_metrics["coordinate_count"] / raw_coordinates), 6) if raw_coordinates else 0.0
+                )
+                row["overlap_before_partition_m2"] = stages.overlap_before.overlap_area_m2
+                row["overlap_after_partition_m2"] = stages.overlap_after.overlap_area_m2
+                row["residual_overlap_classification"] = classify_residual_overlap(
+                    stages.overlap_after,
+                    numerical_tolerance_m2=stages.overlap_tolerance_m2,
+                ).classification
+                row["fully_covered_app_count"] = (
+                    len(stages.partition_report.fully_covered_app_names) if stages.partition_report else 0
+                )
+            except Exception as error:
+                row["status"] = "failed"
+                row["error"] = str(error)
+            row["elapsed_seconds"] = round(perf_counter() - started, 6)
+            rows.append(row)
+        for stage, hits in stage_cache.hits.items():
+            cache_hits[stage] += hits
+
+    payload = {
+        "sweep_run_id": run_id,
+        "stage1_source_path": str(source_path),
+        "stage1_source_sha256": sha256_file(source_path),
+        "parameter_sets": [parameters.as_dict() for parameters in grid],
+        "stage_cache_root": str(stage_cache_root) if stage_cache_root is not None else None,
+        "stage_cache_hits": cache_hits,
+        "started_at_utc": started_at,
+        "completed_at_utc": utc_now(),
+        "region_inventory": selected_regions,
+        "failed_count": sum(row["status"] == "failed" for row in rows),
+        "rows": rows,
+    }
+    json_path = run_dir / "sweep.json"
+    csv_path = run_dir / "sweep.csv"
+    json_path.write_text(json.dumps(payload, indent=2, ensure_ascii=False, sort_keys=True) + "\n", encoding="utf-8")
+    with csv_path.open("w", newline="", encoding="utf-8") as handle:
+        writer = csv.DictWriter(handle, fieldnames=SWEEP_COLUMNS)
+        writer.writeheader()
+        writer.writerows(rows)
+    return SweepResult(
+        run_id=run_id,
+        run_dir=run_dir,
+        json_path=json_path,
+        csv_path=csv_path,
+        rows=rows,
+        cache_hits=cache_hits,
+    )
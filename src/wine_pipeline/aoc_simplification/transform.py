@@ -2,15 +2,24 @@
 
 from __future__ import annotations
 
+from collections import OrderedDict
+from collections.abc import Callable
+import hashlib
+import json
 import unicodedata
 from dataclasses import dataclass
 from math import isfinite
 from typing import Any
 
 import geopandas as gpd
+import numpy as np
+import pandas as pd
+import shapely
 from shapely.geometry import MultiPolygon
 from shapely.ops import unary_union
 
+from .stage_cache import StageCache, region_source_key
+
 try:
     from shapely import make_valid
 except ImportError:  # pragma: no cover
@@ -37,12 +46,19 @@ CANONICAL_RUN_ID = "close500_simplify150"
 CANONICAL_BUFFER_M = 500.0
 CANONICAL_SIMPLIFY_M = 150.0
 CANONICAL_OVERLAP_STRATEGY = "smallest-wins"
+OVERLAP_STRATEGIES = ("none", "smallest-wins", "coverage")
+COVERAGE_STRATEGY_AVAILABLE = hasattr(shapely, "coverage_simplify")
 OVERLAP_ABSOLUTE_TOLERANCE_M2 = 1e-6
 OVERLAP_RELATIVE_TOLERANCE = 1e-9
 RESIDUAL_OVERLAP_NEGLIGIBLE_ABSOLUTE_M2 = 100.0
 RESIDUAL_OVERLAP_NEGLIGIBLE_RELATIVE = 1e-7
 RESIDUAL_OVERLAP_FATAL_ABSOLUTE_M2 = 1000.0
 RESIDUAL_OVERLAP_FATAL_RELATIVE = 1e-5
+OVERLAP_METRICS_CACHE_SIZE = 32
+POLYGON_TYPE_ID = 3
+MULTIPOLYGON_TYPE_ID = 6
+GEOJSON_BYTES_PER_COORDINATE = 40.0
+GEOJSON_SIZE_CALIBRATION_SAMPLE = 2048
 
 
 @dataclass(frozen=True)
@@ -51,6 +67,13 @@ class SimplificationParameters:
     simplify_m: float = CANONICAL_SIMPLIFY_M
     overlap_strategy: str = CANONICAL_OVERLAP_STRATEGY
 
+    def __post_init__(self) -> None:
+        if self.overlap_strategy == "coverage" and not COVERAGE_STRATEGY_AVAILABLE:
+            raise ValueError(
+                "The coverage overlap strategy requires shapely>=2.1 built with GEOS>=3.12 "
+                f"for shapely.coverage_simplify; found shapely {shapely.__version__} with GEOS {shapely.geos_version_string}."
+            )
+
     @property
     def canonical(self) -> bool:
         return (
@@ -78,7 +101,8 @@ class SimplificationParameters:
                 "overlap_strategy": (
                     "smallest-wins gives smaller processed appellations priority over "
                     "larger overlapping appellations and can reduce or fully cover "
-                    "broader appellations."
+                    "broader appellations; coverage applies the same priority before "
+                    "simplifying shared edges once."
                 ),
             },
         }
@@ -212,6 +236,9 @@ class RegionStages:
     parameters: SimplificationParameters
 
 
+_OVERLAP_METRICS_CACHE: OrderedDict[str, OverlapMetrics] = OrderedDict()
+
+
 def slugify_region(value: object) -> str:
     normalized = unicodedata.normalize("NFKD", str(value).strip())
     ascii_value = normalized.encode("ascii", "ignore").decode("ascii")
@@ -344,13 +371,81 @@ def dissolve_by_identity(gdf: gpd.GeoDataFrame) -> gpd.GeoDataFrame:
     return dissolved[OUTPUT_COLUMNS]
 
 
+def geometry_fingerprint(geometries: np.ndarray) -> str:
+    """Order-independent SHA-256 of the WKB of ``geometries``."""
+
+    digest = hashlib.sha256()
+    for encoded in sorted(hashlib.sha256(value).digest() for value in shapely.to_wkb(geometries)):
+        digest.update(encoded)
+    return digest.hexdigest()
+
+
+def _overlap_clusters(edges: list[tuple[int, int]]) -> list[tuple[list[int], list[tuple[int, int]], bool]]:
+    """Connected components of an overlap graph as (members, edges, has_triangle)."""
+
+    neighbours: dict[int, set[int]] = {}
+    for left, right in edges:
+        neighbours.setdefault(left, set()).add(right)
+        neighbours.setdefault(right, set()).add(left)
+    clusters = []
+    seen: set[int] = set()
+    for start in sorted(neighbours):
+        if start in seen:
+            continue
+        members, stack = [], [start]
+        seen.add(start)
+        while stack:
+            node = stack.pop()
+            members.append(node)
+            for other in neighbours[node] - seen:
+                seen.add(other)
+                stack.append(other)
+        member_set = set(members)
+        cluster_edges = [(left, right) for left, right in edges if left in member_set]
+        has_triangle = any(neighbours[left] & neighbours[right] for left, right in cluster_edges)
+        clusters.append((sorted(members), cluster_edges, has_triangle))
+    return clusters
+
+
 def calculate_overlap_metrics(gdf: gpd.GeoDataFrame) -> OverlapMetrics:
+    """Summed, union, and overlap area of ``gdf``, memoized by geometry fingerprint.
+
+    Geometries whose interiors intersect are grouped with an STRtree. A group
+    in which no three geometries pairwise overlap cannot cover any area three
+    times, so its overlap is the exact sum of its pairwise intersections; any
+    other group falls back to the area of its union.
+    """
+
     if gdf.crs is None or gdf.crs.to_epsg() != 2154:
         raise ValueError(f"Overlap metrics require {WORKING_CRS} geometry.")
-    geometries = [geometry for geometry in gdf.geometry if geometry is not None and not geometry.is_empty]
-    summed_area = float(sum(geometry.area for geometry in geometries))
-    union_area = float(unary_union(geometries).area) if geometries else 0.0
-    return OverlapMetrics(summed_area, union_area, max(0.0, summed_area - union_area))
+    geometries = np.array(
+        [geometry for geometry in gdf.geometry if geometry is not None and not geometry.is_empty],
+        dtype=object,
+    )
+    fingerprint = geometry_fingerprint(geometries)
+    cached = _OVERLAP_METRICS_CACHE.get(fingerprint)
+    if cached is not None:
+        _OVERLAP_METRICS_CACHE.move_to_end(fingerprint)
+        return cached
+
+    summed_area = float(sum(shapely.area(geometries).tolist()))
+    left, right = shapely.STRtree(geometries).query(geometries, predicate="intersects")
+    left, right = left[left < right], right[left < right]
+    interiors = shapely.relate_pattern(geometries[left], geometries[right], "T********")
+    overlap_area = 0.0
+    for members, edges, has_triangle in _overlap_clusters(list(zip(left[interiors].tolist(), right[interiors].tolist()))):
+        if has_triangle:
+            cluster = geometries[members]
+            overlap_area += float(sum(shapely.area(cluster).tolist())) - float(unary_union(cluster).area)
+        else:
+            pairs = np.array(edges)
+            overlap_area += float(sum(shapely.area(shapely.intersection(geometries[pairs[:, 0]], geometries[pairs[:, 1]])).tolist()))
+    overlap_area = max(0.0, overlap_area)
+    metrics = OverlapMetrics(summed_area, summed_area - overlap_area, overlap_area)
+    _OVERLAP_METRICS_CACHE[fingerprint] = metrics
+    if len(_OVERLAP_METRICS_CACHE) > OVERLAP_METRICS_CACHE_SIZE:
+        _OVERLAP_METRICS_CACHE.popitem(last=False)
+    return metrics
 
 
 def overlap_tolerance_m2(union_area_m2: float) -> float:
@@ -431,31 +526,36 @@ def _validate_partition_input(gdf: gpd.GeoDataFrame) -> str:
     return unique_regions[0]
 
 
-def partition_appellations_smallest_first(
-    gdf: gpd.GeoDataFrame,
-    *,
-    tolerance_m2: float | None = None,
-) -> tuple[gpd.GeoDataFrame, PartitionReport]:
-    region = _validate_partition_input(gdf)
+def _priority_frame(gdf: gpd.GeoDataFrame) -> gpd.GeoDataFrame:
     working = gdf[OUTPUT_COLUMNS].copy().reset_index(drop=True)
     working["_source_order"] = range(len(working))
     working["_priority_area_m2"] = working.geometry.area.astype(float)
     working["_app_sort"] = working["app"].astype(str)
-    working = working.sort_values(["_priority_area_m2", "_app_sort", "_source_order"], kind="mergesort")
+    return working.sort_values(["_priority_area_m2", "_app_sort", "_source_order"], kind="mergesort")
 
-    overlap_before = calculate_overlap_metrics(working)
+
+def _partition_tolerance_m2(overlap_before: OverlapMetrics, tolerance_m2: float | None) -> float:
     tolerance_m2 = overlap_tolerance_m2(overlap_before.union_area_m2) if tolerance_m2 is None else tolerance_m2
     if not isfinite(tolerance_m2) or tolerance_m2 < 0:
         raise ValueError("Overlap tolerance must be a finite non-negative value.")
+    return tolerance_m2
+
+
+def _accept_partition(
+    working: gpd.GeoDataFrame,
+    accepted_geometries: list[Any],
+    *,
+    region: str,
+    strategy: str,
+    overlap_before: OverlapMetrics,
+    tolerance_m2: float,
+) -> tuple[gpd.GeoDataFrame, PartitionReport]:
+    """Build the partitioned frame and report from per-appellation results in priority order."""
 
     accepted_rows: list[dict[str, Any]] = []
     diagnostics: list[PartitionAppDiagnostic] = []
-    claimed_geometry = None
-    for priority_rank, (_, row) in enumerate(working.iterrows(), start=1):
-        original_geometry = row.geometry
+    for priority_rank, ((_, row), accepted_geometry) in enumerate(zip(working.iterrows(), accepted_geometries), start=1):
         original_area = float(row["_priority_area_m2"])
-        candidate_geometry = original_geometry if claimed_geometry is None else original_geometry.difference(claimed_geometry)
-        accepted_geometry = repair_geometry(candidate_geometry)
         final_area = 0.0 if accepted_geometry is None else float(accepted_geometry.area)
         removed_area = max(0.0, original_area - final_area)
         removed_percent = 0.0 if original_area == 0 else removed_area / original_area * 100
@@ -477,9 +577,8 @@ def partition_appellations_smallest_first(
         )
         if not became_empty:
             accepted_rows.append({column: row[column] for column in OUTPUT_COLUMNS if column != "geometry"} | {"geometry": accepted_geometry})
-        claimed_geometry = original_geometry if claimed_geometry is None else unary_union([claimed_geometry, original_geometry])
 
-    partitioned = gpd.GeoDataFrame(accepted_rows, columns=OUTPUT_COLUMNS, geometry="geometry", crs=gdf.crs)
+    partitioned = gpd.GeoDataFrame(accepted_rows, columns=OUTPUT_COLUMNS, geometry="geometry", crs=working.crs)
     partitioned = partitioned.sort_values(OUTPUT_IDENTITY_COLUMNS, kind="mergesort").reset_index(drop=True)
     overlap_after = calculate_overlap_metrics(partitioned)
     overlap_classification = classify_residual_overlap(overlap_after, numerical_tolerance_m2=tolerance_m2)
@@ -497,7 +596,7 @@ def partition_appellations_smallest_first(
         if not item.became_empty and item.removed_overlap_area_m2 > tolerance_m2
     )
     report = PartitionReport(
-        strategy="smallest-wins",
+        strategy=strategy,
         source_app_count=len(working),
         retained_app_count=len(partitioned),
         partially_reduced_app_count=len(partially_reduced),
@@ -515,57 +614,162 @@ def partition_appellations_smallest_first(
     return partitioned, report
 
 
+def partition_appellations_smallest_first(
+    gdf: gpd.GeoDataFrame,
+    *,
+    tolerance_m2: float | None = None,
+) -> tuple[gpd.GeoDataFrame, PartitionReport]:
+    region = _validate_partition_input(gdf)
+    working = _priority_frame(gdf)
+    overlap_before = calculate_overlap_metrics(working)
+    tolerance_m2 = _partition_tolerance_m2(overlap_before, tolerance_m2)
+
+    accepted_geometries = []
+    originals = working.geometry.to_numpy()
+    tree = shapely.STRtree(originals)
+    for position, original_geometry in enumerate(originals):
+        claimants = tree.query(original_geometry, predicate="intersects")
+        claimants = np.sort(claimants[claimants < position])
+        candidate_geometry = (
+            original_geometry
+            if not len(claimants)
+            else original_geometry.difference(unary_union(originals[claimants]))
+        )
+        accepted_geometries.append(repair_geometry(candidate_geometry))
+    return _accept_partition(
+        working,
+        accepted_geometries,
+        region=region,
+        strategy="smallest-wins",
+        overlap_before=overlap_before,
+        tolerance_m2=tolerance_m2,
+    )
+
+
+def partition_appellations_coverage(
+    gdf: gpd.GeoDataFrame,
+    *,
+    tolerance_m2: float | None = None,
+) -> tuple[gpd.GeoDataFrame, PartitionReport]:
+    """Partition with smallest-wins priority into an exactly edge-matched coverage.
+
+    Every appellation boundary is noded once and polygonized into faces; each
+    face goes to the highest-priority appellation containing it, and each
+    appellation is the coverage union of its faces. Neighbours therefore share
+    identical vertices along common edges, which ``shapely.coverage_simplify``
+    needs to simplify each shared edge once.
+    """
+
+    region = _validate_partition_input(gdf)
+    working = _priority_frame(gdf)
+    overlap_before = calculate_overlap_metrics(working)
+    tolerance_m2 = _partition_tolerance_m2(overlap_before, tolerance_m2)
+
+    originals = working.geometry.to_numpy()
+    linework = shapely.get_parts(shapely.union_all(shapely.boundary(originals)))
+    faces = shapely.get_parts(shapely.polygonize(linework))
+    face_index, owner_index = shapely.STRtree(originals).query(shapely.point_on_surface(faces), predicate="within")
+    owners = np.full(len(faces), len(originals))
+    np.minimum.at(owners, face_index, owner_index)
+    order = np.argsort(owners, kind="stable")
+    bounds = np.searchsorted(owners[order], np.arange(len(originals) + 1))
+    accepted_geometries = [
+        repair_geometry(shapely.coverage_union_all(faces[order[start:stop]])) if stop > start else None
+        for start, stop in zip(bounds[:-1], bounds[1:])
+    ]
+    return _accept_partition(
+        working,
+        accepted_geometries,
+        region=region,
+        strategy="coverage",
+        overlap_before=overlap_before,
+        tolerance_m2=tolerance_m2,
+    )
+
+
 def removed_overlap_frame(original: gpd.GeoDataFrame, partitioned: gpd.GeoDataFrame) -> gpd.GeoDataFrame:
-    retained_by_key = {
-        tuple(str(row[column]) for column in OUTPUT_IDENTITY_COLUMNS): row.geometry
-        for _, row in partitioned.iterrows()
-    }
-    rows: list[dict[str, Any]] = []
-    for _, row in original.iterrows():
-        key = tuple(str(row[column]) for column in OUTPUT_IDENTITY_COLUMNS)
-        retained = retained_by_key.get(key)
-        removed = row.geometry if retained is None else row.geometry.difference(retained)
-        removed = repair_geometry(removed)
-        if removed is None:
-            continue
-        rows.append({column: row[column] for column in OUTPUT_COLUMNS if column != "geometry"} | {"geometry": removed})
+    keys = [f"_key_{column}" for column in OUTPUT_IDENTITY_COLUMNS]
+    retained = pd.DataFrame(
+        {key: partitioned[column].astype(str).to_numpy() for key, column in zip(keys, OUTPUT_IDENTITY_COLUMNS)}
+        | {"_retained": partitioned.geometry.to_numpy()}
+    ).drop_duplicates(keys, keep="last")
+    aligned = pd.DataFrame(
+        {key: original[column].astype(str).to_numpy() for key, column in zip(keys, OUTPUT_IDENTITY_COLUMNS)}
+    ).merge(retained, on=keys, how="left", sort=False)
+    geometries = original.geometry.to_numpy()
+    retained_geometries = aligned["_retained"].to_numpy()
+    has_retained = pd.notna(retained_geometries)
+    removed = geometries.copy()
+    removed[has_retained] = shapely.difference(geometries[has_retained], retained_geometries[has_retained].astype(object))
+    clean = shapely.is_valid(removed) & np.isin(shapely.get_type_id(removed), (POLYGON_TYPE_ID, MULTIPOLYGON_TYPE_ID)) & ~shapely.is_empty(removed)
+    removed = [geometry if is_clean else repair_geometry(geometry) for geometry, is_clean in zip(removed, clean)]
+    rows = original[[column for column in OUTPUT_COLUMNS if column != "geometry"]].copy()
+    rows["geometry"] = removed
+    rows = rows.loc[rows["geometry"].notna()]
     return gpd.GeoDataFrame(rows, columns=OUTPUT_COLUMNS, geometry="geometry", crs=original.crs).reset_index(drop=True)
 
 
-def count_coordinates(geom) -> int:
-    if geom is None or geom.is_empty:
-        return 0
-    if geom.geom_type == "Point":
-        return 1
-    if geom.geom_type == "MultiPoint":
-        return sum(count_coordinates(part) for part in geom.geoms)
-    if geom.geom_type in {"LineString", "LinearRing"}:
-        return len(geom.coords)
-    if geom.geom_type == "MultiLineString":
-        return sum(count_coordinates(part) for part in geom.geoms)
-    if geom.geom_type == "Polygon":
-        exterior = len(geom.exterior.coords) if geom.exterior else 0
-        interiors = sum(len(ring.coords) for ring in geom.interiors)
-        return exterior + interiors
-    if geom.geom_type in {"MultiPolygon", "GeometryCollection"}:
-        return sum(count_coordinates(part) for part in geom.geoms)
-    return 0
+def polygon_part_count(geometries) -> int:
+    parts = np.asarray(geometries, dtype=object)
+    while True:
+        nested = shapely.get_type_id(parts) >= 4
+        if not nested.any():
+            break
+        parts = np.concatenate([parts[~nested], shapely.get_parts(parts[nested])])
+    return int(((shapely.get_type_id(parts) == POLYGON_TYPE_ID) & ~shapely.is_empty(parts)).sum())
 
 
-def count_polygon_parts(geom) -> int:
-    if geom is None or geom.is_empty:
-        return 0
-    if geom.geom_type == "Polygon":
-        return 1
-    if geom.geom_type in {"MultiPolygon", "GeometryCollection"}:
-        return sum(count_polygon_parts(part) for part in geom.geoms)
-    return 0
+def _geojson_bytes_per_coordinate(geometries: gpd.GeoSeries, *, sample_size: int) -> float:
+    """Mean serialized width of one EPSG:4326 position, including its separator."""
+
+    coordinates = shapely.get_coordinates(geometries.to_numpy())
+    if sample_size <= 0 or not len(coordinates):
+        return GEOJSON_BYTES_PER_COORDINATE
+    step = max(len(coordinates) // sample_size, 1)
+    sample = gpd.GeoSeries(shapely.points(coordinates[::step][:sample_size]), crs=geometries.crs)
+    projected = shapely.get_coordinates(sample.to_crs(OUTPUT_CRS).to_numpy()).tolist()
+    return sum(len(json.dumps(position)) for position in projected) / len(projected) + len(", ")
 
 
-def approximate_geojson_size_mb(gdf: gpd.GeoDataFrame) -> float:
+def approximate_geojson_size_mb(
+    gdf: gpd.GeoDataFrame,
+    *,
+    calibration_sample_size: int = GEOJSON_SIZE_CALIBRATION_SAMPLE,
+) -> float:
+    """Estimate the size of ``reproject_for_output(gdf).to_json()`` without building it.
+
+    Properties and the feature skeleton are measured exactly. Coordinate text
+    is the coordinate count times the serialized width of one position, which
+    is measured on a strided sample of reprojected coordinates, or taken from
+    ``GEOJSON_BYTES_PER_COORDINATE`` when ``calibration_sample_size`` is 0.
+    """
+
     if gdf.empty:
         return 0.0
-    return len(reproject_for_output(gdf).to_json().encode("utf-8")) / (1024 * 1024)
+    if gdf.crs is None:
+        raise ValueError("Processed geometry has no CRS.")
+    geometries = gdf.geometry.to_numpy()
+    present = ~shapely.is_missing(geometries)
+    properties = gdf.drop(columns=gdf.geometry.name).astype(object)
+    properties = properties.where(properties.notna(), None)
+    property_bytes = sum(len(json.dumps(record)) for record in properties.to_dict("records"))
+
+    geometry_types = gdf.geometry.geom_type[present].tolist()
+    parts, part_index = shapely.get_parts(geometries[present], return_index=True)
+    multipart = shapely.get_type_id(geometries[present]) == MULTIPOLYGON_TYPE_ID
+    skeleton = (
+        len('{"type": "FeatureCollection", "features": []}')
+        + len(", ") * (len(gdf) - 1)
+        + sum(len(f'{{"id": "{label}", "type": "Feature", "properties": , "geometry": }}') for label in gdf.index)
+        + len("null") * int((~present).sum())
+        + sum(len(f'{{"type": "{geometry_type}", "coordinates": }}') for geometry_type in geometry_types)
+        + len("[]") * int((shapely.get_num_interior_rings(parts) + 1).sum())
+        + len("[]") * int(np.bincount(part_index, minlength=len(multipart))[multipart].sum())
+    )
+    coordinate_bytes = int(shapely.get_num_coordinates(geometries).sum()) * _geojson_bytes_per_coordinate(
+        gdf.geometry, sample_size=calibration_sample_size
+    )
+    return (skeleton + property_bytes + coordinate_bytes) / (1024 * 1024)
 
 
 def metrics_for_frame(gdf: gpd.GeoDataFrame | None) -> dict[str, Any]:
@@ -580,66 +784,117 @@ def metrics_for_frame(gdf: gpd.GeoDataFrame | None) -> dict[str, Any]:
             "approx_geojson_size_mb": 0.0,
             "area_m2_epsg_2154": 0.0,
         }
-    metric = project_for_operations(gdf)
-    geometries = gdf.geometry.dropna()
+    geometries = gdf.geometry.to_numpy()
+    present = geometries[~shapely.is_missing(geometries)]
     return {
         "feature_count": int(len(gdf)),
         "app_count": int(gdf["app"].nunique()) if "app" in gdf.columns else 0,
-        "coordinate_count": int(geometries.apply(count_coordinates).sum()),
-        "polygon_part_count": int(geometries.apply(count_polygon_parts).sum()),
-        "invalid_geometry_count": int((~geometries.is_valid).sum()),
-        "empty_geometry_count": int(geometries.is_empty.sum() + gdf.geometry.isna().sum()),
+        "coordinate_count": int(shapely.get_num_coordinates(present).sum()),
+        "polygon_part_count": polygon_part_count(present),
+        "invalid_geometry_count": int((~shapely.is_valid(present)).sum()),
+        "empty_geometry_count": int(shapely.is_empty(present).sum() + (len(geometries) - len(present))),
         "approx_geojson_size_mb": round(approximate_geojson_size_mb(gdf), 6),
-        "area_m2_epsg_2154": float(metric.geometry.area.sum()),
+        "area_m2_epsg_2154": float(project_for_operations(gdf).geometry.area.sum()),
     }
 
 
+def _closed_frame(dissolved: gpd.GeoDataFrame, buffer_m: float) -> gpd.GeoDataFrame:
+    closed = dissolved.copy()
+    if buffer_m > 0:
+        closed.geometry = closed.geometry.buffer(buffer_m).buffer(-buffer_m)
+        closed = repair_frame(closed, fail_on_loss=False, context="morphological closing")
+    return closed
+
+
+def _simplified_frame(closed: gpd.GeoDataFrame, simplify_m: float) -> gpd.GeoDataFrame:
+    simplified = closed.copy()
+    if simplify_m > 0:
+        simplified.geometry = simplified.geometry.simplify(simplify_m, preserve_topology=True)
+    return repair_frame(simplified, fail_on_loss=False, context="simplification")[OUTPUT_COLUMNS]
+
+
+def _coverage_simplified_frame(coverage: gpd.GeoDataFrame, simplify_m: float) -> gpd.GeoDataFrame:
+    simplified = coverage.copy()
+    if simplify_m > 0:
+        simplified.geometry = shapely.coverage_simplify(simplified.geometry.to_numpy(), simplify_m)
+    return repair_frame(simplified, fail_on_loss=False, context="coverage simplification")[OUTPUT_COLUMNS]
+
+
 def simplify_region(
     stage1_region: gpd.GeoDataFrame,
     *,
     parameters: SimplificationParameters | None = None,
+    stage_cache: StageCache | None = None,
 ) -> RegionStages:
+    """Run every simplification stage for one region.
+
+    With ``stage_cache``, the repaired, dissolved, closed, and simplified
+    stages are reused whenever the regional input and the parameters upstream
+    of that stage match an earlier run.
+
+    The ``coverage`` strategy partitions the closed stage first and then
+    simplifies the resulting coverage with ``shapely.coverage_simplify``, so
+    ``simplified`` and ``partitioned`` are the same edge-matched frame and no
+    partition runs after simplification. Its stages after closing are not
+    cached.
+    """
+
     parameters = parameters or SimplificationParameters()
     if parameters.buffer_m < 0 or parameters.simplify_m < 0:
         raise ValueError("Buffer and simplification distances must be non-negative.")
-    if parameters.overlap_strategy not in {"none", "smallest-wins"}:
+    if parameters.overlap_strategy not in OVERLAP_STRATEGIES:
         raise ValueError(f"Unknown overlap strategy: {parameters.overlap_strategy!r}.")
     if stage1_region.empty:
         raise ValueError("Selected region contains no source rows.")
 
     validate_stage1_schema(stage1_region)
     raw = stage1_region[OUTPUT_IDENTITY_COLUMNS + ["geometry"]].copy().reset_index(drop=True)
-    repaired = repair_frame(project_for_operations(raw), fail_on_loss=True, context="source")
+    source_key = region_source_key(raw) if stage_cache is not None else None
+
+    def stage(name: str, build: Callable[[], gpd.GeoDataFrame], **upstream: float) -> gpd.GeoDataFrame:
+        if stage_cache is None:
+            return build()
+        return stage_cache.fetch(name, source_key, build, **upstream)
+
+    repaired = stage("repaired", lambda: repair_frame(project_for_operations(raw), fail_on_loss=True, context="source"))
     if repaired.empty:
         raise ValueError("No polygon geometry remained before dissolve.")
 
-    dissolved = dissolve_by_identity(repaired)
-    closed = dissolved.copy()
-    if parameters.buffer_m > 0:
-        closed.geometry = closed.geometry.buffer(parameters.buffer_m).buffer(-parameters.buffer_m)
-        closed = repair_frame(closed, fail_on_loss=False, context="morphological closing")
+    dissolved = stage("dissolved", lambda: dissolve_by_identity(repaired))
+    closed = stage("closed", lambda: _closed_frame(dissolved, parameters.buffer_m), buffer_m=parameters.buffer_m)
     if closed.empty:
         raise ValueError("No polygon geometry remained after morphological closing.")
 
-    simplified = closed.copy()
-    if parameters.simplify_m > 0:
-        simplified.geometry = simplified.geometry.simplify(parameters.simplify_m, preserve_topology=True)
-    simplified = repair_frame(simplified, fail_on_loss=False, context="simplification")[OUTPUT_COLUMNS]
-    if simplified.empty:
-        raise ValueError("No polygon geometry remained after simplification.")
-
-    overlap_before = calculate_overlap_metrics(simplified)
-    tolerance_m2 = overlap_tolerance_m2(overlap_before.union_area_m2)
-    if parameters.overlap_strategy == "smallest-wins":
-        partitioned, partition_report = partition_appellations_smallest_first(simplified, tolerance_m2=tolerance_m2)
-    else:
+    if parameters.overlap_strategy == "coverage":
+        overlap_before = calculate_overlap_metrics(closed)
+        tolerance_m2 = overlap_tolerance_m2(overlap_before.union_area_m2)
+        coverage, partition_report = partition_appellations_coverage(closed, tolerance_m2=tolerance_m2)
+        simplified = _coverage_simplified_frame(coverage, parameters.simplify_m)
         partitioned = simplified.copy()
-        partition_report = None
-    removed_overlap = removed_overlap_frame(simplified, partitioned)
+        removed_overlap = removed_overlap_frame(closed, coverage)
+        candidates = closed
+    else:
+        simplified = stage(
+            "simplified",
+            lambda: _simplified_frame(closed, parameters.simplify_m),
+            buffer_m=parameters.buffer_m,
+            simplify_m=parameters.simplify_m,
+        )
+        if simplified.empty:
+            raise ValueError("No polygon geometry remained after simplification.")
+        overlap_before = calculate_overlap_metrics(simplified)
+        tolerance_m2 = overlap_tolerance_m2(overlap_before.union_area_m2)
+        if parameters.overlap_strategy == "smallest-wins":
+            partitioned, partition_report = partition_appellations_smallest_first(simplified, tolerance_m2=tolerance_m2)
+        else:
+            partitioned = simplified.copy()
+            partition_report = None
+        removed_overlap = removed_overlap_frame(simplified, partitioned)
+        candidates = simplified
     overlap_after = calculate_overlap_metrics(partitioned)
 
     final_working = repair_frame(partitioned, fail_on_loss=False, context="final candidate")[OUTPUT_COLUMNS]
-    missing_apps = set(_app_names(simplified)) - set(_app_names(final_working))
+    missing_apps = set(_app_names(candidates)) - set(_app_names(final_working))
     reported_empty = set(partition_report.fully_covered_app_names) if partition_report else set()
     if missing_apps != reported_empty:
         raise ValueError(
@@ -655,7 +910,7 @@ def simplify_region(
     validate_source_area(final_working, context="Final candidate")
     final_overlap = calculate_overlap_metrics(final_working)
     final_overlap_classification = classify_residual_overlap(final_overlap, numerical_tolerance_m2=tolerance_m2)
-    if parameters.overlap_strategy == "smallest-wins" and final_overlap_classification.fatal:
+    if parameters.overlap_strategy != "none" and final_overlap_classification.fatal:
         raise ValueError(
             "Final candidate residual overlap is fatal: "
             f"{final_overlap.overlap_area_m2:.12g} m2, "
@@ -16,13 +16,29 @@ from . import __version__
 from .aoc_enrichment.extract import download_uc_davis_regions
 from .aoc_enrichment.mappings import FALLBACK_REGIONS_BY_DT, REGION_OVERRIDE_METADATA, REGION_OVERRIDES_BY_ID, WINE_REGION_COLORS
 from .aoc_enrichment.transform import write_enriched_candidate
-from .aoc_package.extract import extract_inao_source, source_urls
-from .aoc_package.transform import write_packaged_candidate
+from .aoc_package.fingerprint import (
+    appellation_fingerprints,
+    compare_fingerprint_indexes,
+    fingerprint_index,
+    fingerprint_path,
+    latest_fingerprint_index,
+)
+from .aoc_package.extract import INAO_EXTRACT_MODES, extract_inao_source, source_urls
+from .aoc_package.transform import read_wine_parcels, write_packaged_candidate
 from .aoc_simplification.assembly import assemble_candidate, resolve_simplification_run_id
-from .aoc_simplification.batch import run_batch
+from .aoc_simplification.adaptive import DEFAULT_MAX_SIMPLIFY_M, SimplificationBudget
+from .aoc_simplification.batch import refresh_plot_manifest, run_batch
 from .aoc_simplification.diagnostics import run_diagnostics
-from .aoc_simplification.runner import find_project_root, resolve_stage1_input, run_single_region
-from .aoc_simplification.transform import CANONICAL_RUN_ID, SimplificationParameters
+from .aoc_simplification.runner import (
+    PLOT_MODES,
+    find_project_root,
+    plot_status,
+    render_pending_plots,
+    resolve_stage1_input,
+    run_single_region,
+)
+from .aoc_simplification.sweep import run_sweep
+from .aoc_simplification.transform import CANONICAL_RUN_ID, OVERLAP_STRATEGIES, SimplificationParameters, slugify_region
 from .config import DURABLE_REPORT_ROOT, OUTPUT_LAYER, RUN_ROOT
 from .provenance import ReportCollector, sha256_file, source_date_from_headers, utc_now, write_json
 from .product import publish_product, resolve_candidate_id
@@ -57,7 +73,13 @@ def build(
     run_root: Path = RUN_ROOT,
     report_root: Path = DURABLE_REPORT_ROOT,
     progress: Callable[[str], None] | None = None,
+    jobs: int = 1,
+    inao_extract: str = "sidecars",
 ) -> WineBuildResult:
+    if jobs < 1:
+        raise ValueError("--jobs must be at least 1.")
+    if inao_extract not in INAO_EXTRACT_MODES:
+        raise ValueError(f"--inao-extract must be one of {INAO_EXTRACT_MODES}.")
     run_id = _run_id()
     run_dir = run_root / run_id
     candidates_dir = run_dir / "candidates"
@@ -68,25 +90,39 @@ def build(
         progress(f"creating run directory: {run_dir}")
         run_dir.mkdir(parents=True, exist_ok=False)
         progress("downloading INAO AOC parcel archive")
-        inao_download, shapefile = extract_inao_source(run_dir)
-        progress(f"INAO archive downloaded and extracted: {shapefile.shapefile_path}")
+        inao_download, shapefile = extract_inao_source(run_dir, mode=inao_extract)
+        progress(f"INAO archive downloaded; shapefile dataset: {shapefile.dataset_path}")
         progress("downloading UC Davis regional GeoJSON")
         uc_davis_source = download_uc_davis_regions(run_dir)
         progress(f"UC Davis regions downloaded: {uc_davis_source.path}")
 
-        progress("reading INAO shapefile")
-        raw_aoc = gpd.read_file(shapefile.shapefile_path)
+        progress("reading INAO shapefile wine parcels")
+        raw_aoc, source_attributes, source_read = read_wine_parcels(shapefile.dataset_path)
+        progress(f"read {source_read['read_rows']} of {source_read['source_rows']} INAO parcels")
         packaged_path = candidates_dir / "aoc_packaged.gpkg"
         progress("building packaged AOC GeoPackage")
-        packaged, package_checks, package_metadata = write_packaged_candidate(raw_aoc, packaged_path, progress=progress)
+        packaged, package_checks, package_metadata = write_packaged_candidate(
+            raw_aoc,
+            packaged_path,
+            source_attributes=source_attributes,
+            progress=progress,
+            jobs=jobs,
+        )
+        package_metadata["source_read"] = source_read
         report.extend_checks(package_checks)
         progress(f"packaged candidate written: {packaged_path} ({len(packaged)} rows)")
 
         progress("reading UC Davis regional polygons")
         region_data = gpd.read_file(uc_davis_source.path)
         enriched_path = candidates_dir / "aoc_regions.gpkg"
-        progress("building regional enrichment candidate; spatial overlay may take a while")
-        enriched, enrichment_checks, enrichment_metadata = write_enriched_candidate(packaged, region_data, enriched_path, progress=progress)
+        progress("building regional enrichment candidate")
+        enriched, enrichment_checks, enrichment_metadata = write_enriched_candidate(
+            packaged,
+            region_data,
+            enriched_path,
+            progress=progress,
+            jobs=jobs,
+        )
         report.extend_checks(enrichment_checks)
         progress(f"enriched candidate written: {enriched_path} ({len(enriched)} rows)")
 
@@ -116,9 +152,10 @@ def build(
                 "uc_davis_regions": uc_davis_source.to_json(),
             },
             "uc_davis_commit_sha": uc_davis_source.resolved_commit_sha,
+            "inao_extract_mode": inao_extract,
             "extracted_shapefile": shapefile.to_json(),
             "source_row_counts": {
-                "inao_parcels": len(raw_aoc),
+                "inao_parcels": source_read["source_rows"],
                 "uc_davis_regions": len(region_data),
             },
             "source_schemas": {
@@ -167,6 +204,20 @@ def build(
                 "aoc_regions": bool(enriched.geometry.is_valid.all()),
             },
         }
+        progress("fingerprinting appellation parcels")
+        fingerprints = fingerprint_index(
+            appellation_fingerprints(raw_aoc),
+            enriched,
+            run_id=run_id,
+            source_sha256=inao_download.sha256,
+        )
+        changes = compare_fingerprint_indexes(latest_fingerprint_index(report_root, exclude_run_id=run_id), fingerprints)
+        report.provenance["appellation_changes"] = changes
+        progress(
+            f"{len(changes['added'])} added, {len(changes['removed'])} removed, {len(changes['changed'])} changed, "
+            f"and {len(changes['reassigned'])} reassigned appellations since {changes['previous_run_id'] or 'no previous build'}; "
+            f"affected regions: {', '.join(changes['affected_regions']) or 'none'}"
+        )
         source_date = source_date_from_headers(inao_download.headers, inao_download.retrieval_time_utc)
         progress("writing durable provenance and validation reports")
         durable_paths = report.write_durable_reports(
@@ -174,12 +225,15 @@ def build(
             hash_prefix=inao_download.sha256[:12],
             report_root=report_root,
         )
+        durable_paths["fingerprints"] = fingerprint_path(durable_paths["provenance"])
+        write_json(durable_paths["fingerprints"], fingerprints)
         run_payload = {
             "run_id": run_id,
             "status": "success",
             "run_dir": str(run_dir),
             "candidates": {name: str(path) for name, path in output_paths.items()},
             "durable_reports": {name: str(path) for name, path in durable_paths.items()},
+            "appellation_changes": changes,
             "checks": len(report.checks),
         }
         write_json(run_dir / "run-report.json", run_payload)
@@ -208,12 +262,33 @@ def build(
         raise
 
 
+def _add_budget_arguments(parser: argparse.ArgumentParser, *, scope: bool) -> None:
+    parser.add_argument("--max-coordinates", type=int, help="choose the smallest simplification tolerance whose final candidate has at most this many coordinates")
+    parser.add_argument("--max-geojson-mb", type=float, help="choose the smallest simplification tolerance whose final candidate is at most this many estimated GeoJSON megabytes")
+    parser.add_argument("--max-simplify", type=float, default=DEFAULT_MAX_SIMPLIFY_M, help="largest tolerance in metres the budget search may choose")
+    if scope:
+        parser.add_argument("--budget-scope", choices=("region", "total"), default="region", help="apply the budget to each region, or split it across regions by Stage 1 coordinate count")
+
+
+def _budget(args: argparse.Namespace) -> SimplificationBudget | None:
+    if args.max_coordinates is None and args.max_geojson_mb is None:
+        return None
+    return SimplificationBudget(
+        max_coordinates=args.max_coordinates,
+        max_geojson_mb=args.max_geojson_mb,
+        scope=getattr(args, "budget_scope", "region"),
+        max_simplify_m=float(args.max_simplify),
+    )
+
+
 def _parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(prog="python -m wine_pipeline")
     subparsers = parser.add_subparsers(dest="command", required=True)
     build_parser = subparsers.add_parser("build", help="build the AOC package and regional candidate GeoPackages")
     build_parser.add_argument("--run-root", type=Path, default=RUN_ROOT)
     build_parser.add_argument("--report-root", type=Path, default=DURABLE_REPORT_ROOT)
+    build_parser.add_argument("--jobs", type=int, default=1, help="worker processes for parcel packaging chunks and AOC-region intersection areas")
+    build_parser.add_argument("--inao-extract", choices=INAO_EXTRACT_MODES, default="sidecars", help="extract every archive member, only the shapefile sidecars, or read the shapefile inside a ZIP via /vsizip/")
     build_parser.add_argument("--quiet", action="store_true", help="suppress stage progress messages")
     simplify_parser = subparsers.add_parser("simplify-region", help="run Stage 2 simplification for one exact region")
     simplify_parser.add_argument("--region", required=True, help="exact region display name to simplify")
@@ -222,7 +297,9 @@ def _parser() -> argparse.ArgumentParser:
     simplify_parser.add_argument("--output-root", type=Path, help="default: tmp/wine/simplification")
     simplify_parser.add_argument("--buffer", type=float, default=500.0, help="morphological closing distance in metres")
     simplify_parser.add_argument("--simplify", type=float, default=150.0, help="topology-preserving simplification tolerance in metres")
-    simplify_parser.add_argument("--overlap-strategy", choices=("none", "smallest-wins"), default="smallest-wins")
+    simplify_parser.add_argument("--overlap-strategy", choices=OVERLAP_STRATEGIES, default="smallest-wins")
+    _add_budget_arguments(simplify_parser, scope=False)
+    simplify_parser.add_argument("--plots", choices=PLOT_MODES, default="inline", help="render plots now, store their inputs for render-plots, or skip them")
     simplify_parser.add_argument("--overwrite", action="store_true", help="replace an existing regional run directory")
     simplify_parser.add_argument("--keep-failed-temp", action="store_true", help="retain the temporary regional run directory when processing fails")
     simplify_parser.add_argument("--quiet", action="store_true", help="suppress stage progress messages")
@@ -232,11 +309,20 @@ def _parser() -> argparse.ArgumentParser:
     batch_parser.add_argument("--output-root", type=Path, help="default: tmp/wine/simplification")
     batch_parser.add_argument("--buffer", type=float, default=500.0, help="morphological closing distance in metres")
     batch_parser.add_argument("--simplify", type=float, default=150.0, help="topology-preserving simplification tolerance in metres")
-    batch_parser.add_argument("--overlap-strategy", choices=("none", "smallest-wins"), default="smallest-wins")
+    batch_parser.add_argument("--overlap-strategy", choices=OVERLAP_STRATEGIES, default="smallest-wins")
+    _add_budget_arguments(batch_parser, scope=True)
+    batch_parser.add_argument("--plots", choices=PLOT_MODES, default="inline", help="render plots per region, after all regions with --jobs workers, or not at all")
     mode = batch_parser.add_mutually_exclusive_group()
     mode.add_argument("--resume", action="store_true", help="reuse complete matching regional artifacts and rebuild stale regions")
     mode.add_argument("--overwrite", action="store_true", help="replace the complete batch run transactionally")
+    batch_parser.add_argument("--jobs", type=int, default=1, help="number of regions to simplify in parallel worker processes")
     batch_parser.add_argument("--quiet", action="store_true", help="suppress stage progress messages")
+    render_parser = subparsers.add_parser("render-plots", help="render pending deferred plots of a Stage 2 simplification run")
+    render_parser.add_argument("--run-id", default=CANONICAL_RUN_ID, help="simplification run id")
+    render_parser.add_argument("--output-root", type=Path, help="default: tmp/wine/simplification")
+    render_parser.add_argument("--region", action="append", help="exact region to render; repeatable; defaults to every region with pending plots")
+    render_parser.add_argument("--jobs", type=int, default=1, help="number of regions to render in parallel worker processes")
+    render_parser.add_argument("--quiet", action="store_true", help="suppress rendering progress messages")
     diagnostic_parser = subparsers.add_parser(
         "diagnose-simplification",
         help="run transform and serialization diagnostics without regional artifacts",
@@ -247,8 +333,19 @@ def _parser() -> argparse.ArgumentParser:
     diagnostic_parser.add_argument("--region", help="optional exact region; defaults to every discovered region")
     diagnostic_parser.add_argument("--buffer", type=float, default=500.0, help="morphological closing distance in metres")
     diagnostic_parser.add_argument("--simplify", type=float, default=150.0, help="topology-preserving simplification tolerance in metres")
-    diagnostic_parser.add_argument("--overlap-strategy", choices=("none", "smallest-wins"), default="smallest-wins")
+    diagnostic_parser.add_argument("--overlap-strategy", choices=OVERLAP_STRATEGIES, default="smallest-wins")
     diagnostic_parser.add_argument("--quiet", action="store_true", help="suppress region progress messages")
+    sweep_parser = subparsers.add_parser("sweep", help="compare Stage 2 simplification parameter sets per region without regional artifacts")
+    sweep_parser.add_argument("--input", type=Path, help="Stage 1 aoc_regions.gpkg; defaults to the sole available Stage 1 candidate")
+    sweep_parser.add_argument("--sweep-run-id", help="sweep report directory name")
+    sweep_parser.add_argument("--output-root", type=Path, help="default: tmp/wine/simplification/sweeps")
+    sweep_parser.add_argument("--region", action="append", help="exact region to sweep; repeatable; defaults to every discovered region")
+    sweep_parser.add_argument("--buffer", type=float, nargs="+", default=[500.0], help="morphological closing distances in metres")
+    sweep_parser.add_argument("--simplify", type=float, nargs="+", default=[150.0], help="topology-preserving simplification tolerances in metres")
+    sweep_parser.add_argument("--overlap-strategy", choices=OVERLAP_STRATEGIES, nargs="+", default=["smallest-wins"])
+    sweep_parser.add_argument("--stage-cache-root", type=Path, help="default: tmp/wine/simplification/stage_cache")
+    sweep_parser.add_argument("--no-stage-cache", action="store_true", help="reuse stages only within this sweep, without reading or writing the on-disk cache")
+    sweep_parser.add_argument("--quiet", action="store_true", help="suppress parameter set progress messages")
     assemble_parser = subparsers.add_parser("assemble-candidate", help="assemble a validated Stage 2 simplification batch into a durable wine candidate")
     assemble_parser.add_argument("--simplification-run-id", help="simplification batch run id; defaults to the sole validated batch")
     assemble_parser.add_argument("--simplification-root", type=Path, help="default: tmp/wine/simplification")
@@ -272,7 +369,13 @@ def main(argv: list[str] | None = None) -> int:
     args = _parser().parse_args(argv)
     try:
         if args.command == "build":
-            result = build(run_root=args.run_root, report_root=args.report_root, progress=_console_progress(not args.quiet))
+            result = build(
+                run_root=args.run_root,
+                report_root=args.report_root,
+                progress=_console_progress(not args.quiet),
+                jobs=args.jobs,
+                inao_extract=args.inao_extract,
+            )
             print(f"Built wine AOC candidates for run {result.run_id}")
             print(f"  run dir: {result.run_dir}")
             print(f"  packaged candidate: {result.packaged_candidate}")
@@ -300,15 +403,20 @@ def main(argv: list[str] | None = None) -> int:
                 keep_failed_temp=args.keep_failed_temp,
                 progress=_console_progress(not args.quiet),
                 command=["wine_pipeline", *sys.argv[1:]],
+                budget=_budget(args),
+                plots=args.plots,
             )
             print(f"Built wine simplification candidate for {result.region}")
             print(f"  run dir: {result.run_dir}")
             print(f"  candidate: {result.candidate_path}")
             print(f"  metrics: {result.metrics_path}")
             print(f"  params: {result.params_path}")
-            print(f"  preview: {result.preview_path}")
-            print(f"  comparison: {result.comparison_path}")
-            print(f"  overlap comparison: {result.overlap_comparison_path}")
+            if result.plot_status == "rendered":
+                print(f"  preview: {result.preview_path}")
+                print(f"  comparison: {result.comparison_path}")
+                print(f"  overlap comparison: {result.overlap_comparison_path}")
+            else:
+                print(f"  plots: {result.plot_status}")
             print(f"  rows: {result.rows}")
             return 0
         if args.command == "simplify":
@@ -329,6 +437,9 @@ def main(argv: list[str] | None = None) -> int:
                 overwrite=args.overwrite,
                 progress=_console_progress(not args.quiet),
                 command=["wine_pipeline", *sys.argv[1:]],
+                jobs=args.jobs,
+                budget=_budget(args),
+                plots=args.plots,
             )
             print(f"Built wine simplification batch {result.run_id}")
             print(f"  run dir: {result.run_dir}")
@@ -337,6 +448,26 @@ def main(argv: list[str] | None = None) -> int:
             print(f"  failed regions: {len(result.failed_regions)}")
             print(f"  validation passed: {result.passed}")
             return 0 if result.passed else 2
+        if args.command == "render-plots":
+            if args.jobs < 1:
+                raise ValueError("--jobs must be at least 1.")
+            output_root = args.output_root or find_project_root() / "tmp" / "wine" / "simplification"
+            region_root = output_root / slugify_region(args.run_id) / "regions"
+            if not region_root.is_dir():
+                raise FileNotFoundError(f"Simplification run has no regional outputs: {region_root}")
+            if args.region:
+                region_dirs = [region_root / slugify_region(region) for region in args.region]
+                missing = [path.name for path in region_dirs if not path.is_dir()]
+                if missing:
+                    raise FileNotFoundError("No regional output for: " + ", ".join(missing))
+            else:
+                region_dirs = sorted(path for path in region_root.iterdir() if path.is_dir() and not path.name.startswith("."))
+            pending = [path for path in region_dirs if plot_status(path) == "pending"]
+            failures = render_pending_plots(pending, jobs=args.jobs, progress=_console_progress(not args.quiet))
+            refresh_plot_manifest(region_root.parent, failures)
+            print(f"Rendered deferred plots for {len(pending) - len(failures)} regions")
+            print(f"  failed regions: {len(failures)}")
+            return 0 if not failures else 2
         if args.command == "diagnose-simplification":
             input_path = resolve_stage1_input(args.input, project_root=find_project_root())
             if args.input is None:
@@ -361,6 +492,32 @@ def main(argv: list[str] | None = None) -> int:
             print(f"  passed regions: {len(result.passed_regions)}")
             print(f"  failed regions: {len(result.failed_regions)}")
             return 0 if result.passed else 2
+        if args.command == "sweep":
+            project_root = find_project_root()
+            input_path = resolve_stage1_input(args.input, project_root=project_root)
+            if args.input is None:
+                print(f"Resolved sole Stage 1 wine candidate:\n{input_path}")
+            stage_cache_root = None
+            if not args.no_stage_cache:
+                stage_cache_root = args.stage_cache_root or project_root / "tmp" / "wine" / "simplification" / "stage_cache"
+            result = run_sweep(
+                input_path=input_path,
+                sweep_run_id=args.sweep_run_id,
+                output_root=args.output_root,
+                regions=args.region,
+                buffers=args.buffer,
+                simplifies=args.simplify,
+                overlap_strategies=args.overlap_strategy,
+                stage_cache_root=stage_cache_root,
+                progress=_console_progress(not args.quiet),
+            )
+            print(f"Completed wine simplification sweep {result.run_id}")
+            print(f"  run dir: {result.run_dir}")
+            print(f"  JSON report: {result.json_path}")
+            print(f"  CSV report: {result.csv_path}")
+            print(f"  parameter sets evaluated: {len(result.rows)}")
+            print(f"  failed parameter sets: {result.failed_count}")
+            return 0 if not result.failed_count else 2
         if args.command == "assemble-candidate":
             simplification_run_id = resolve_simplification_run_id(
                 args.simplification_run_id,
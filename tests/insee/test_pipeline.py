@@ -6,6 +6,7 @@ from pathlib import Path
 import shutil
 import tempfile
 import unittest
+from unittest import mock
 import zipfile
 
 import geopandas as gpd
@@ -15,6 +16,7 @@ from shapely.geometry import Polygon
 from insee_pipeline.pipeline import build
 from insee_pipeline.product import PRODUCT_COLUMNS, build_product
 from insee_pipeline.transform import (
+    load_department_geometry,
     load_filosofi,
     load_population,
     load_unemployment,
@@ -174,6 +176,24 @@ class InseePipelineTests(unittest.TestCase):
             with self.assertRaisesRegex(InseeValidationError, "Population components"):
                 load_population(path, year=2023, department_codes={"01"})
 
+    def test_department_areas_are_cached_by_geometry_hash(self) -> None:
+        with tempfile.TemporaryDirectory() as temp:
+            root = Path(temp)
+            geometry = root / "departments.geojson"
+            fixture_geometry(geometry, metropolitan_codes())
+            cache_root = root / "geometry_cache"
+
+            uncached = load_department_geometry(geometry, year=2023)
+            load_department_geometry(geometry, year=2023, cache_root=cache_root)
+            with mock.patch("insee_pipeline.transform.gpd.read_file", side_effect=AssertionError("re-read")):
+                cached = load_department_geometry(geometry, year=2023, cache_root=cache_root)
+            pd.testing.assert_frame_equal(cached.frame, uncached.frame)
+
+            fixture_geometry(geometry, metropolitan_codes()[:95])
+            with self.assertRaisesRegex(InseeValidationError, "96 unique"):
+                load_department_geometry(geometry, year=2023, cache_root=cache_root)
+            self.assertEqual(len(list(cache_root.glob("insee-department-areas-*.json"))), 1)
+
     def test_complete_build_from_local_cache(self) -> None:
         with tempfile.TemporaryDirectory() as tmp:
             root = Path(tmp)
@@ -6,11 +6,22 @@ import unittest
 
 import pandas as pd
 
+from data_pipeline.changes.matching import (
+    MatchKeyCache,
+    distance_km,
+    distance_km_many,
+    distance_km_matrix,
+    duplicate_conflict_count,
+    fuzzy_candidates,
+    prepare_matching_frame,
+    unique_matches,
+)
 from data_pipeline.changes.pipeline import (
     ChangesValidationError,
     run_changes,
     validate_changes,
 )
+from tests.support import REPOSITORY_ROOT
 
 
 def restaurant(
@@ -72,6 +83,88 @@ class ChangesTests(unittest.TestCase):
         self.assertGreaterEqual(result.validation.fuzzy_candidates, 1)
         self.assertIn("match_candidate", set(result.changes["record_type"]))
 
+    def test_exact_keys_match_uniquely_and_count_duplicate_conflicts(self) -> None:
+        previous = pd.DataFrame({
+            "normalized_name": ["b", "a", "dup", "dup", "", "c"],
+            "postal_code": ["75001", "75001", "75002", "75002", "75003", None],
+        }, index=[10, 11, 12, 13, 14, 15])
+        current = pd.DataFrame({
+            "normalized_name": ["dup", "a", "b", "", "c"],
+            "postal_code": ["75002", "75001", "75001", "75003", "75004"],
+        }, index=[20, 21, 22, 23, 24])
+        columns = ("normalized_name", "postal_code")
+        keys = MatchKeyCache(previous, current)
+        previous_available, current_available = set(previous.index), set(current.index)
+
+        self.assertEqual(
+            unique_matches(previous, current, previous_available, current_available, columns, keys=keys),
+            [(11, 21), (10, 22)],
+        )
+        self.assertEqual(
+            unique_matches(previous, current, previous_available - {11}, current_available, columns),
+            [(10, 22)],
+        )
+        self.assertEqual(
+            duplicate_conflict_count(previous, current, previous_available, current_available, columns, keys=keys),
+            3,
+        )
+        self.assertEqual(
+            duplicate_conflict_count(previous, current, previous_available - {13}, current_available, columns),
+            0,
+        )
+        stale = MatchKeyCache(previous.copy(), current)
+        for match in (unique_matches, duplicate_conflict_count):
+            with self.subTest(match=match.__name__), self.assertRaisesRegex(ValueError, "different previous/current"):
+                match(previous, current, previous_available, current_available, columns, keys=stale)
+
+    def test_distance_kernels_agree_with_row_distance(self) -> None:
+        latitudes = [48.8566, 45.7640, 43.7102, 48.8566]
+        longitudes = [2.3522, 4.8357, 7.2620, 2.3522]
+        distances = distance_km_many(latitudes[:-1], longitudes[:-1], latitudes[1:], longitudes[1:])
+        self.assertAlmostEqual(distances[0], 391.5, delta=0.5)
+        self.assertEqual(
+            distances[0],
+            distance_km(
+                pd.Series({"latitude": latitudes[0], "longitude": longitudes[0]}),
+                pd.Series({"latitude": latitudes[1], "longitude": longitudes[1]}),
+            ),
+        )
+        matrix = distance_km_matrix(latitudes, longitudes, latitudes, longitudes, chunk_rows=3)
+        self.assertEqual(matrix.shape, (4, 4))
+        self.assertEqual(matrix[0, 3], 0.0)
+        self.assertTrue((matrix == matrix.T).all())
+        self.assertTrue((matrix[[0, 1, 2], [1, 2, 3]] == distances).all())
+
+    def test_fuzzy_candidates_are_blocked_by_postal_address_and_radius(self) -> None:
+        def row(name: str, address: str, location: str, latitude: float, longitude: float) -> dict[str, object]:
+            return {
+                "name": name, "address": address, "location": location,
+                "latitude": latitude, "longitude": longitude,
+            }
+
+        previous = prepare_matching_frame(pd.DataFrame([
+            row("Chez Marcel", "9 rue Loin", "Lyon, 69001", 45.76, 4.83),
+            row("Chez Marcel", "1 quai Ouest", "Nice, 06000", 43.70, 7.26),
+            row("Chez Marcel", "3 rue Proche", "Paris, 75002", 48.8701, 2.3401),
+            row("Chez Marcel", "4 rue Lointaine", "Paris, 75016", 48.90, 2.20),
+            row("Bistro Ami", "5 rue Proche", "Paris, 75003", 48.8702, 2.3402),
+        ]))
+        current = prepare_matching_frame(pd.DataFrame([
+            row("Chez Marcel Paris", "1 quai Ouest", "Lyon, 69001", 48.87, 2.34),
+        ]))
+
+        candidates = fuzzy_candidates(
+            previous, current, set(previous.index), set(current.index)
+        )
+
+        # Row 3 is 11 km away with no shared key and row 4 is nearby but
+        # dissimilar; equal name scores are then ranked nearest first.
+        self.assertEqual([candidate.previous_index for candidate in candidates], [2, 0, 1])
+        self.assertTrue(all(candidate.current_index == 0 for candidate in candidates))
+        self.assertIn("same_postal=True", candidates[1].evidence)
+        self.assertIn("same_address=True", candidates[2].evidence)
+        self.assertEqual(fuzzy_candidates(previous, current, {3, 4}, {0}), ())
+
     def test_absent_green_star_field_is_unknown_not_zero(self) -> None:
         previous = pd.DataFrame([restaurant("Same", 1, url="https://guide.test/a")])
         current = pd.DataFrame([restaurant(
@@ -105,6 +198,9 @@ class ChangesTests(unittest.TestCase):
                         row_counts,
                     )
                     before = {name: path.read_bytes() for name, path in first.paths.items()}
+                    # Published reports were produced by the original row-by-row classifier.
+                    published = REPOSITORY_ROOT / "data" / "reports" / "france" / first.paths["csv"].name
+                    self.assertEqual(before["csv"], published.read_bytes())
                     with self.assertRaises(FileExistsError):
                         run_changes(
                             previous_year=years[0], current_year=years[1], output_root=output
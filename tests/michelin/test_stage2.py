@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import ast
 import hashlib
 import json
 from pathlib import Path
@@ -8,14 +9,23 @@ import unittest
 from unittest.mock import patch
 
 import geopandas as gpd
+from geopandas.testing import assert_geodataframe_equal, assert_geoseries_equal
 import pandas as pd
 from shapely.geometry import box
 
+from data_pipeline.geometry_cache import load_prepared_geometry
+from data_pipeline.stage2.aggregation import (
+    decode_locations,
+    decode_polyline,
+    encode_polyline,
+    star_category_counts,
+)
 from data_pipeline.stage2.pipeline import (
     Stage2PublicationError,
     aggregate_departments,
     aggregate_regions,
     enrich_restaurants,
+    load_department_geometry,
     load_insee_product,
     resolve_insee_product,
     run_stage2,
@@ -181,6 +191,15 @@ class Stage2UnitTests(unittest.TestCase):
         self.assertEqual(enriched.loc[0, "address"], "1 rueA")
         self.assertNotIn("country", enriched.columns)
 
+    def test_object_columns_without_text_pass_through_unchanged(self) -> None:
+        for greenstar in ([False, True, False], [0, 1, 0], list(pd.to_datetime(["2026-01-01"] * 3)), [True, 1.5, None]):
+            with self.subTest(greenstar=greenstar):
+                partition = france_partition()
+                partition["greenstar"] = pd.Series(greenstar, dtype=object)
+                enriched = enrich_restaurants(partition, department_reference(), year=2026)
+                self.assertEqual(enriched["greenstar"].tolist(), partition["greenstar"].tolist())
+                self.assertEqual(enriched.loc[0, "address"], "1 rueA")
+
     def test_department_counts_coordinates_and_geometry(self) -> None:
         enriched = enrich_restaurants(france_partition(), department_reference(), year=2026)
         product = aggregate_departments(
@@ -223,12 +242,94 @@ class Stage2UnitTests(unittest.TestCase):
         )
         self.assertIn("41.92", corsica["locations"])
 
+    def test_star_category_counts_match_per_column_groupby(self) -> None:
+        restaurants = pd.DataFrame({
+            "region": ["Corse", "Bretagne", "Corse", "Bretagne", "Corse", "Alsace"],
+            "stars": [0.25, 3.0, 1.0, 1.0, 2.0, 0.5],
+            "greenstar": [1, 0, 1, 1, 0, 0],
+        })
+        counts = star_category_counts(restaurants, "region", year=2026).set_index("region")
+
+        expected = restaurants.assign(**{
+            column: restaurants["stars"].eq(value).astype(int)
+            for value, column in ((0.25, "selected"), (0.5, "bib_gourmand"), (1.0, "1_star"),
+                                  (2.0, "2_star"), (3.0, "3_star"))
+        }, green_stars=restaurants["greenstar"].eq(1).astype(int))
+        expected = expected.groupby("region", sort=True)[
+            ["selected", "bib_gourmand", "1_star", "2_star", "3_star", "green_stars"]
+        ].sum()
+        pd.testing.assert_frame_equal(counts[expected.columns], expected)
+        self.assertEqual(counts["total_stars"].tolist(), [0, 4, 3])
+        self.assertEqual(counts["starred_restaurants"].tolist(), [0, 2, 2])
+
+        historical = star_category_counts(restaurants, ["region"], year=2024)
+        self.assertEqual(
+            historical.columns.tolist(),
+            ["region", "bib_gourmand", "1_star", "2_star", "3_star", "total_stars", "starred_restaurants"],
+        )
+        self.assertEqual(historical["bib_gourmand"].tolist(), [1, 0, 0])
+
+    def test_star_category_counts_drop_rows_with_a_null_key_part_like_groupby(self) -> None:
+        restaurants = pd.DataFrame({
+            "region": ["x", "y", None, "x", "y"],
+            "code": ["1", None, "2", "1", "2"],
+            "stars": [1.0, 2.0, 3.0, 0.5, 1.0],
+            "greenstar": [1, 1, 1, 0, 0],
+        })
+        counts = star_category_counts(restaurants, ["region", "code"], year=2026)
+
+        expected = restaurants.groupby(["region", "code"], sort=True).size()
+        self.assertEqual(list(zip(counts["region"], counts["code"])), expected.index.tolist())
+        self.assertEqual(counts["1_star"].tolist(), [1, 1])
+        self.assertEqual(counts["bib_gourmand"].tolist(), [1, 0])
+        self.assertEqual(counts["green_stars"].tolist(), [1, 0])
+        self.assertEqual(counts["total_stars"].tolist(), [1, 1])
+
+    def test_polyline_locations_decode_to_the_historical_payload(self) -> None:
+        enriched = enrich_restaurants(france_partition(), department_reference(), year=2026)
+        arguments = (enriched, insee_product_statistics(), department_geometry())
+        historical = aggregate_departments(*arguments, year=2026)
+        encoded = aggregate_departments(*arguments, year=2026, locations_encoding="polyline")
+
+        for text, payload in zip(historical["locations"], encoded["locations"]):
+            self.assertEqual(decode_locations(payload), ast.literal_eval(text))
+        self.assertEqual(
+            decode_polyline(encode_polyline([-21.3419781, 48.8566], [55.4778513, -0.0000001])),
+            [(-21.3419781, 55.4778513), (48.8566, -0.0000001)],
+        )
+
     def test_ambiguous_address_fails(self) -> None:
         partition = france_partition()
         partition.loc[0, "address"] = "Paris, France"
         with self.assertRaisesRegex(Stage2ValidationError, "exactly one postal code"):
             enrich_restaurants(partition, department_reference(), year=2026)
 
+    def test_all_malformed_addresses_are_reported_together(self) -> None:
+        partition = france_partition()
+        partition.loc[0, "address"] = "Paris, France"
+        partition.loc[2, "address"] = "1 rue C, Bastia, 20200, Corse"
+        with self.assertRaisesRegex(Stage2ValidationError, "2 restaurant addresses are malformed") as raised:
+            enrich_restaurants(partition, department_reference(), year=2026)
+        self.assertIn("exactly one postal code: 'Paris, France'", str(raised.exception))
+        self.assertIn("Ambiguous restaurant address: '1 rue C, Bastia, 20200, Corse'", str(raised.exception))
+
+    def test_lacave_override_is_applied_by_year_name_and_address(self) -> None:
+        partition = france_partition()
+        partition.loc[0, ["name", "address"]] = ["Château de la Treyne", "Lacave, 46200, France"]
+        reference = pd.concat(
+            [department_reference(), pd.DataFrame(
+                [("46", "Lot", "Cahors", "Occitanie")],
+                columns=["department_num", "department", "capital", "region"],
+            )],
+            ignore_index=True,
+        )
+        enriched = enrich_restaurants(partition, reference, year=2025)
+        self.assertEqual(enriched.loc[0, "address"], "Lacave, 46200")
+        self.assertEqual(enriched.loc[0, "location"], "Lacave, 46200")
+        self.assertEqual(enriched.loc[0, "department_num"], "46")
+        with self.assertRaisesRegex(Stage2ValidationError, "cannot be split"):
+            enrich_restaurants(partition, reference, year=2026)
+
     def test_unmatched_department_fails(self) -> None:
         partition = france_partition()
         partition.loc[0, "address"] = "1 rue A, Paris, 99000, France"
@@ -244,6 +345,50 @@ class Stage2UnitTests(unittest.TestCase):
                 geometry,
             )
 
+    def test_reference_validation_still_checks_department_geometry(self) -> None:
+        with self.assertRaisesRegex(Stage2ValidationError, "EPSG:4326"):
+            validate_reference_data(
+                department_reference(),
+                insee_product_statistics(),
+                department_geometry().to_crs("EPSG:2154"),
+            )
+        with patch("data_pipeline.stage2.validation.validate_department_geometry") as recheck:
+            validate_reference_data(
+                department_reference(),
+                insee_product_statistics(),
+                department_geometry(),
+                geometry_validated=True,
+            )
+        recheck.assert_not_called()
+
+    def test_prepared_geometry_cache_is_keyed_by_source_hash(self) -> None:
+        with tempfile.TemporaryDirectory() as temporary:
+            root = Path(temporary)
+            source = root / "departments.geojson"
+            department_geometry().to_file(source, driver="GeoJSON")
+            cache_root = root / "cache"
+
+            uncached = load_department_geometry(source)
+            first = load_department_geometry(source, cache_root=cache_root)
+            with patch("data_pipeline.geometry_cache.gpd.read_file", side_effect=AssertionError("re-read")):
+                cached = load_department_geometry(source, cache_root=cache_root)
+            for prepared in (first, cached):
+                assert_geodataframe_equal(prepared.frame, uncached.frame)
+                assert_geoseries_equal(prepared.projected, uncached.projected)
+                self.assertEqual(prepared.area_sq_km.tolist(), uncached.area_sq_km.tolist())
+            self.assertEqual(str(cached.frame["code"].dtype), "string")
+
+            department_geometry().iloc[:2].to_file(source, driver="GeoJSON")
+            self.assertEqual(len(load_department_geometry(source, cache_root=cache_root).frame), 2)
+            self.assertEqual(len(list(cache_root.glob("stage2-departments-*.npz"))), 2)
+
+            def reject(_geometry: gpd.GeoDataFrame) -> gpd.GeoDataFrame:
+                raise Stage2ValidationError("rejected")
+
+            with self.assertRaisesRegex(Stage2ValidationError, "rejected"):
+                load_prepared_geometry(source, kind="rejected", prepare=reject, cache_root=cache_root)
+            self.assertEqual(list(cache_root.glob("rejected-*")), [])
+
     def test_insee_product_latest_year_discovery(self) -> None:
         with tempfile.TemporaryDirectory() as temporary:
             root = Path(temporary)
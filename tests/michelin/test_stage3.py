@@ -5,11 +5,16 @@ import tempfile
 import unittest
 from unittest.mock import patch
 
+import geopandas as gpd
 import pandas as pd
+from shapely.geometry import box
 
+from data_pipeline.stage2.validation import Stage2ValidationError
 from data_pipeline.stage3.acquisition import ParisReferenceError, normalize_paris_table
 from data_pipeline.stage3.pipeline import (
     Stage3PublicationError,
+    assign_restaurants,
+    build_arrondissement_index,
     load_paris_reference,
     run_stage3,
     validate_stage3,
@@ -35,7 +40,42 @@ def expected_arrondissement_columns() -> list[str]:
     ]
 
 
+def coastal_geometry() -> gpd.GeoDataFrame:
+    return gpd.GeoDataFrame(
+        {
+            "code": ["29001", "29002", "56001"],
+            "nom": ["Brest", "Quimper", "Lorient"],
+            "geometry": [box(-4.6, 48.0, -4.3, 48.3), box(-4.3, 47.8, -4.0, 48.0), box(-3.6, 47.6, -3.3, 47.9)],
+        },
+        crs="EPSG:4326",
+    )
+
+
+def coastal_restaurants(*points: tuple[str, str, float, float]) -> pd.DataFrame:
+    return pd.DataFrame(points, columns=["name", "department_num", "longitude", "latitude"])
+
+
 class Stage3Tests(unittest.TestCase):
+    def test_assignment_uses_within_then_bounded_same_department_fallback(self) -> None:
+        geometry = coastal_geometry()
+        restaurants = coastal_restaurants(
+            ("Inland", "29", -4.45, 48.15),
+            ("Offshore Lorient", "56", -3.5, 47.598),
+            ("Offshore Quimper", "29", -4.1, 47.797),
+        )
+        assigned, fallbacks = assign_restaurants(
+            restaurants, geometry, index=build_arrondissement_index(geometry)
+        )
+        self.assertEqual(assigned["arrondissement"].tolist(), ["Brest", "Lorient", "Quimper"])
+        self.assertEqual(fallbacks, ("Offshore Lorient", "Offshore Quimper"))
+
+        with self.assertRaisesRegex(Stage2ValidationError, "Spatially unmatched.*Far offshore"):
+            assign_restaurants(coastal_restaurants(("Far offshore", "29", -4.1, 47.7)), geometry)
+        with self.assertRaisesRegex(Stage2ValidationError, "Spatially unmatched.*Wrong department"):
+            assign_restaurants(coastal_restaurants(("Wrong department", "56", -4.1, 47.797)), geometry)
+        with self.assertRaisesRegex(Stage2ValidationError, "Ambiguous coastal.*Between"):
+            assign_restaurants(coastal_restaurants(("Between", "29", -4.302, 47.998)), geometry)
+
     def test_paris_table_is_identified_and_normalized_by_columns(self) -> None:
         table = pd.DataFrame({
             "Arrondissement (R for Right Bank, L for Left Bank)": [
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from io import BytesIO
+import json
 from pathlib import Path
 import tempfile
 import unittest
@@ -10,11 +11,25 @@ from unittest import mock
 import geopandas as gpd
 import pandas as pd
 import requests
+import shapely
 from shapely.geometry import Polygon
 
+from wine_pipeline.aoc_enrichment.overlap import MAJORITY_OVERLAP_COLUMNS, majority_overlap
 from wine_pipeline.aoc_enrichment.transform import enrich_aoc_regions, write_enriched_candidate
-from wine_pipeline.aoc_package.extract import extract_archive_safely, locate_shapefile, stream_download
-from wine_pipeline.aoc_package.transform import package_aoc_geometries, write_packaged_candidate
+from wine_pipeline.aoc_package.extract import (
+    extract_archive_members,
+    extract_archive_safely,
+    locate_archived_shapefile,
+    locate_shapefile,
+    stream_download,
+)
+from wine_pipeline.aoc_package.fingerprint import (
+    appellation_fingerprints,
+    compare_fingerprint_indexes,
+    fingerprint_index,
+    latest_fingerprint_index,
+)
+from wine_pipeline.aoc_package.transform import package_aoc_geometries, read_wine_parcels, write_packaged_candidate
 from wine_pipeline.aoc_package.validate import validate_packaged_artifact
 from wine_pipeline.provenance import sha256_file
 from wine_pipeline.validation import WinePipelineError, validate_and_repair_geometry
@@ -131,6 +146,36 @@ class WinePipelineTests(unittest.TestCase):
             with self.assertRaisesRegex(WinePipelineError, "escape"):
                 extract_archive_safely(bad, root / "bad-out")
 
+    def test_sidecar_extraction_hashes_while_writing_and_archive_reads_in_place(self) -> None:
+        raw = aoc_frame([one_aoc("1"), {**one_aoc("2", x0=20), "categorie": "Bovin"}])
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            raw.to_file(root / "dataset.shp")
+            members = {f"inao/{path.name}": path.read_bytes() for path in sorted(root.glob("dataset.*"))}
+            self.assertIn("inao/dataset.cpg", members)
+            archive = root / "inao.zip"
+            archive.write_bytes(zip_bytes({**members, "inao/notice.pdf": b"pdf", "inao/dataset.shp.xml": b"<xml/>"}))
+
+            hashes = extract_archive_members(archive, root / "out", sidecars_only=True)
+            self.assertEqual(
+                sorted(path.name for path in hashes),
+                sorted(name.split("/")[1] for name in members),
+            )
+            self.assertEqual(hashes, {path: sha256_file(path) for path in hashes})
+            with mock.patch("wine_pipeline.aoc_package.extract.sha256_file") as rehash:
+                extracted = locate_shapefile(root / "out", member_hashes=hashes)
+            rehash.assert_not_called()
+            self.assertEqual(len(extract_archive_safely(archive, root / "all")), len(members) + 2)
+
+            archived = locate_archived_shapefile(archive)
+            self.assertEqual(archived.members, extracted.members)
+            self.assertTrue(archived.dataset_path.startswith("/vsizip/"))
+            self.assertEqual(archived.to_json()["dataset_path"], archived.dataset_path)
+            from_archive, _, source_read = read_wine_parcels(archived.dataset_path)
+            from_disk, _, _ = read_wine_parcels(extracted.shapefile_path)
+            self.assertEqual(source_read["source_rows"], 2)
+            pd.testing.assert_frame_equal(from_archive, from_disk)
+
     def test_shapefile_member_and_ambiguity_validation(self) -> None:
         with tempfile.TemporaryDirectory() as tmp:
             root = Path(tmp)
@@ -206,6 +251,83 @@ class WinePipelineTests(unittest.TestCase):
             {"Bovin", "Tubercule", "Vinaigre", None},
         )
 
+    def test_aoc_packaging_chunks_whole_groups_and_matches_across_jobs(self) -> None:
+        rows = []
+        for group in range(9):
+            for parcel in range(group % 3 + 1):
+                rows.append(
+                    {
+                        **one_aoc(str(9 - group), x0=group * 100 + parcel * 10, app=f"AOC {group % 4}"),
+                        "categorie": "Vin mousseux" if parcel else "Vin tranquille",
+                    }
+                )
+        raw = aoc_frame(rows[::-1])
+
+        sequential, sequential_checks, sequential_metadata = package_aoc_geometries(raw)
+        parallel, parallel_checks, parallel_metadata = package_aoc_geometries(raw, jobs=2)
+
+        self.assertEqual(sequential_metadata["transformation_parameters"]["geometry_processing_chunks"], 1)
+        self.assertEqual(parallel_metadata["transformation_parameters"]["geometry_processing_chunks"], 8)
+        self.assertEqual(len(sequential), 9)
+        self.assertEqual(sequential["id_app"].tolist(), [str(value) for value in range(1, 10)])
+        pd.testing.assert_frame_equal(
+            sequential.drop(columns="geometry"),
+            parallel.drop(columns="geometry"),
+        )
+        self.assertTrue(shapely.equals(sequential.geometry.to_numpy(), parallel.geometry.to_numpy()).all())
+        self.assertEqual(
+            [(check.name, check.passed, check.observed) for check in sequential_checks],
+            [(check.name, check.passed, check.observed) for check in parallel_checks],
+        )
+        three_parcels = sequential.set_index("id_app").loc["7"]
+        self.assertEqual(three_parcels["categorie"], "Vin mousseux")
+        self.assertAlmostEqual(three_parcels.geometry.area, 300.0)
+
+    def test_filtered_shapefile_read_matches_in_memory_wine_filter(self) -> None:
+        raw = aoc_frame(
+            [
+                one_aoc("1", app="Wine AOC"),
+                {**one_aoc("456", x0=20, app="Taureau de Camargue"), "categorie": "Bovin"},
+                {**one_aoc("1", x0=10, app="Wine AOC"), "categorie": " vin mousseux"},
+                {**one_aoc("999", x0=60, app="Vinaigre Test"), "categorie": "Vinaigre"},
+                {**one_aoc("2", x0=80, app="L'Apostrophe"), "categorie": "Vin d'appellation"},
+                {**one_aoc("1000", x0=100, app="Missing Category"), "categorie": None},
+            ]
+        ).assign(extra="unused")
+        with tempfile.TemporaryDirectory() as temp_dir:
+            shapefile_path = Path(temp_dir) / "aoc.shp"
+            raw.to_file(shapefile_path)
+
+            parcels, attributes, source_read = read_wine_parcels(shapefile_path)
+            packaged, checks, metadata = package_aoc_geometries(parcels, source_attributes=attributes)
+            reference, _, reference_metadata = package_aoc_geometries(gpd.read_file(shapefile_path))
+
+            self.assertEqual(parcels.index.tolist(), [0, 2, 4])
+            self.assertEqual(parcels.columns.tolist(), ["app", "id_app", "dt", "categorie", "geometry"])
+            self.assertEqual(len(attributes), 6)
+            self.assertEqual((source_read["source_rows"], source_read["read_rows"]), (6, 3))
+            self.assertIn("'Vin d''appellation'", source_read["where"])
+            self.assertNotIn("Vinaigre", source_read["where"])
+            matches = next(check for check in checks if check.name == "aoc_package_filtered_read_matches_in_memory_filter")
+            self.assertTrue(matches.passed)
+            pd.testing.assert_frame_equal(packaged, reference)
+            category_filter = metadata["transformation_parameters"]["wine_category_filter"]
+            reference_filter = reference_metadata["transformation_parameters"]["wine_category_filter"]
+            self.assertTrue(category_filter["applied_at_read"])
+            self.assertNotIn("source_profile", metadata)
+            self.assertEqual(metadata["source_attribute_profile"]["rows"], 6)
+            self.assertEqual(metadata["filtered_source_profile"]["rows"], 3)
+            check_names = {check.name for check in checks}
+            self.assertIn("aoc_source_read_geometry_non_null", check_names)
+            self.assertNotIn("aoc_source_geometry_non_null", check_names)
+            not_empty = next(check for check in checks if check.name == "aoc_source_not_empty")
+            self.assertEqual(not_empty.observed, 6)
+            self.assertEqual(category_filter["excluded_rows"], 3)
+            self.assertEqual(category_filter["excluded_records"], reference_filter["excluded_records"])
+
+            with self.assertRaisesRegex(WinePipelineError, "does not match the in-memory"):
+                package_aoc_geometries(parcels.iloc[:2], source_attributes=attributes)
+
     def test_aoc_packaging_fails_when_source_has_no_wine_categories(self) -> None:
         non_wine = aoc_frame(
             [
@@ -217,6 +339,37 @@ class WinePipelineTests(unittest.TestCase):
         with self.assertRaisesRegex(WinePipelineError, "no wine categories remain"):
             package_aoc_geometries(non_wine)
 
+    def test_appellation_fingerprints_report_changed_appellations_and_regions(self) -> None:
+        parcels = aoc_frame([one_aoc("1"), one_aoc("1", x0=20), one_aoc("2", x0=40, app="AOC Two"), one_aoc("3", x0=60, app="AOC Three")])
+        enriched = pd.DataFrame({"id_app": ["1", "2", "3"], "region": ["Loire", "Loire", "Bourgogne"]})
+        before = fingerprint_index(appellation_fingerprints(parcels), enriched, run_id="20260101T000000Z_a", source_sha256="a")
+
+        rotated = parcels.copy()
+        rotated.loc[0, "geometry"] = Polygon([(10, 10), (0, 10), (0, 0), (10, 0)])
+        rotated.loc[1, "app"] = " AOC One "
+        self.assertEqual(appellation_fingerprints(rotated), appellation_fingerprints(parcels))
+
+        edited = parcels.copy()
+        edited.loc[2, "geometry"] = Polygon([(40, 0), (55, 0), (55, 10), (40, 10)])
+        edited = pd.concat([edited.iloc[:3], aoc_frame([one_aoc("4", x0=80, app="AOC Four")])], ignore_index=True)
+        moved = pd.DataFrame({"id_app": ["1", "2", "4"], "region": ["Sud-Ouest", "Loire", "Alsace"]})
+        after = fingerprint_index(appellation_fingerprints(edited), moved, run_id="20260201T000000Z_b", source_sha256="b")
+        changes = compare_fingerprint_indexes(before, after)
+
+        self.assertEqual((changes["added"], changes["removed"], changes["changed"], changes["reassigned"]), (["4"], ["3"], ["2"], ["1"]))
+        self.assertEqual(changes["unchanged_count"], 0)
+        self.assertEqual(changes["affected_regions"], ["Alsace", "Bourgogne", "Loire", "Sud-Ouest"])
+        self.assertEqual(compare_fingerprint_indexes(after, after)["affected_regions"], [])
+        self.assertEqual(compare_fingerprint_indexes(None, after)["added"], ["1", "2", "4"])
+
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            for index in (before, after):
+                (root / f"wine_pipeline_{index['inao_archive_sha256']}.fingerprints.json").write_text(json.dumps(index), encoding="utf-8")
+            (root / "broken.fingerprints.json").write_text("{", encoding="utf-8")
+            self.assertEqual(latest_fingerprint_index(root, exclude_run_id="current")["run_id"], after["run_id"])
+            self.assertEqual(latest_fingerprint_index(root, exclude_run_id=after["run_id"])["run_id"], before["run_id"])
+
     def test_packaged_artifact_validation_rejects_non_wine_category(self) -> None:
         corrupted = aoc_frame(
             [{**one_aoc("456", app="Taureau de Camargue"), "categorie": "Bovin"}]
@@ -282,6 +435,48 @@ class WinePipelineTests(unittest.TestCase):
         with self.assertRaisesRegex(WinePipelineError, "missing colours"):
             enrich_aoc_regions(aocs.iloc[:1].copy(), regions, overrides_by_id={}, fallbacks_by_dt={}, colors={})
 
+    def test_majority_overlap_matches_overlay_and_skips_contained_intersections(self) -> None:
+        aocs = aoc_frame(
+            [
+                one_aoc("inside", x0=1),
+                one_aoc("inside_east", x0=30),
+                one_aoc("straddle", x0=47),
+                one_aoc("tie", x0=15),
+                one_aoc("touch", x0=60),
+                one_aoc("outside", x0=90),
+            ]
+        )
+        aocs["aoc_key"] = aocs["id_app"].astype("string")
+        aocs["aoc_area"] = aocs.geometry.area
+        regions = region_frame(
+            [
+                ("West", Polygon([(0, -5), (20, -5), (20, 15), (0, 15)])),
+                ("East", Polygon([(20, -5), (50, -5), (50, 15), (20, 15)])),
+                ("Edge", Polygon([(50, -5), (60, -5), (60, 15), (50, 15)])),
+            ]
+        )
+        regions["region"] = regions["region"].astype("string")
+        reference = gpd.overlay(aocs, regions, how="intersection", keep_geom_type=False)
+        reference["overlap_area"] = reference.geometry.area
+        reference["overlap_ratio"] = reference["overlap_area"] / reference["aoc_area"]
+        reference = (
+            reference[reference["overlap_area"] > 0]
+            .sort_values(["aoc_key", "overlap_area", "region"], ascending=[True, False, True], kind="stable")
+            .drop_duplicates(subset="aoc_key")
+            [MAJORITY_OVERLAP_COLUMNS]
+            .reset_index(drop=True)
+        )
+
+        with mock.patch("wine_pipeline.aoc_enrichment.overlap.shapely.intersection", wraps=shapely.intersection) as intersection:
+            sequential = majority_overlap(aocs, regions)
+        self.assertEqual(len(intersection.call_args.args[0]), 5)
+        pd.testing.assert_frame_equal(sequential, reference)
+        self.assertEqual(sequential.set_index("aoc_key").loc["tie", "region"], "East")
+        self.assertEqual(sequential.set_index("aoc_key").loc["straddle", "region"], "Edge")
+        self.assertAlmostEqual(sequential.set_index("aoc_key").loc["straddle", "overlap_ratio"], 0.7)
+        self.assertEqual(sequential["aoc_key"].tolist(), ["inside", "inside_east", "straddle", "tie"])
+        pd.testing.assert_frame_equal(majority_overlap(aocs, regions, jobs=2), sequential)
+
     def test_enriched_schema_round_trip_and_deterministic_ordering(self) -> None:
         with tempfile.TemporaryDirectory() as tmp:
             aocs = aoc_frame([one_aoc("2", x0=20, app="Loire Two"), one_aoc("1", app="Alsace grand cru First ou Alias")])
@@ -7,8 +7,13 @@ import unittest
 from unittest import mock
 
 import geopandas as gpd
+import numpy as np
+import pandas as pd
+import shapely
 from shapely.geometry import GeometryCollection, LineString, MultiPolygon, Polygon
+from shapely.ops import unary_union
 
+from wine_pipeline.aoc_simplification.adaptive import SimplificationBudget, simplify_region_within_budget
 from wine_pipeline.aoc_simplification.runner import _validate_candidate_round_trip, run_single_region
 from wine_pipeline.aoc_simplification.serialization import (
     POST_REPROJECTION_ABSOLUTE_TOLERANCE_M2,
@@ -21,16 +26,24 @@ from wine_pipeline.aoc_simplification.serialization import (
     cleanup_final_geometries,
     repair_post_reprojection_geometry,
 )
+from wine_pipeline.aoc_simplification.stage_cache import StageCache
 from wine_pipeline.aoc_simplification.transform import (
     CANONICAL_BUFFER_M,
     CANONICAL_OVERLAP_STRATEGY,
     CANONICAL_RUN_ID,
     CANONICAL_SIMPLIFY_M,
+    COVERAGE_STRATEGY_AVAILABLE,
     OUTPUT_COLUMNS,
     OverlapMetrics,
     SimplificationParameters,
+    approximate_geojson_size_mb,
+    calculate_overlap_metrics,
     classify_residual_overlap,
+    metrics_for_frame,
     overlap_tolerance_m2,
+    partition_appellations_smallest_first,
+    polygon_part_count,
+    reproject_for_output,
     select_region,
     simplify_region,
     validate_stage1_schema,
@@ -191,6 +204,36 @@ class WineSimplificationTests(unittest.TestCase):
         round_tripped = cleaned.to_crs("EPSG:2154").geometry.iloc[0]
         self.assertAlmostEqual(round_tripped.area, geometry.area, places=4)
 
+    def test_serialization_cleanup_bulk_path_matches_per_geometry_diagnostics(self) -> None:
+        geometries = [
+            square(700000, 6600000, 1000),
+            MultiPolygon([square(703000, 6600000, 500), square(702000, 6600000, 500)]),
+            Polygon([(705000, 6600000), (706000, 6601000), (706000, 6600000), (705000, 6601000)]),
+            GeometryCollection([square(708000, 6600000, 1000), LineString([(709500, 6600000), (709500, 6600000)])]),
+        ]
+        frame = pd.concat(
+            [self.serialization_frame(geometry).assign(app=f"Cleanup {index}") for index, geometry in enumerate(geometries)],
+            ignore_index=True,
+        )
+        cleaned, diagnostics = cleanup_final_geometries(frame)
+        with mock.patch(
+            "wine_pipeline.aoc_simplification.serialization._clean_polygonal",
+            side_effect=lambda values: np.zeros(len(values), dtype=bool),
+        ):
+            expected_cleaned, expected_diagnostics = cleanup_final_geometries(frame)
+
+        self.assertEqual(diagnostics, expected_diagnostics)
+        self.assertEqual([geometry.wkb for geometry in cleaned.geometry], [geometry.wkb for geometry in expected_cleaned.geometry])
+        self.assertEqual(
+            [diagnostic["cleanup_action"] for diagnostic in diagnostics],
+            [
+                "unchanged",
+                "unchanged",
+                "repaired_without_component_removal",
+                "removed_negligible_invalid_or_degenerate_components",
+            ],
+        )
+
     def test_serialization_cleanup_survives_geojson_round_trip(self) -> None:
         geometry = GeometryCollection([
             square(700000, 6600000, 1000),
@@ -543,6 +586,27 @@ class WineSimplificationTests(unittest.TestCase):
         self.assertTrue(patched.called)
         self.assertTrue(any(call.kwargs.get("preserve_topology") is True for call in patched.mock_calls))
 
+    def test_budget_search_chooses_smallest_tolerance_within_coordinate_limit(self) -> None:
+        angles = np.linspace(0, 2 * np.pi, 240, endpoint=False)
+        radii = 3000 * (1 + 0.04 * np.sin(angles * 37) + 0.02 * np.sin(angles * 91))
+        wavy = Polygon(np.column_stack((700000 + radii * np.cos(angles), 6600000 + radii * np.sin(angles))))
+        stage1 = stage1_rows([stage1_feature(id_app="1", app="Wavy", categorie="AOP", geometry=wavy)])
+        budget = SimplificationBudget(max_coordinates=60, max_simplify_m=500.0, resolution_m=5.0)
+        cache = StageCache()
+
+        stages, adaptive = simplify_region_within_budget(stage1, budget=budget, stage_cache=cache)
+
+        probes = {probe["simplify_m"]: probe for probe in adaptive.probes}
+        self.assertEqual(stages.parameters, SimplificationParameters(simplify_m=adaptive.chosen_simplify_m))
+        self.assertLessEqual(adaptive.coordinate_count, 60)
+        self.assertTrue(probes[adaptive.chosen_simplify_m]["within_budget"])
+        self.assertFalse(probes[adaptive.chosen_simplify_m - 5.0]["within_budget"])
+        self.assertEqual(cache.misses["closed"], 1)
+        self.assertEqual(cache.misses["simplified"], len(adaptive.probes))
+        self.assertEqual(adaptive.as_dict()["budget"]["max_coordinates"], 60)
+        with self.assertRaisesRegex(ValueError, "cannot be met at simplify_m 500"):
+            simplify_region_within_budget(stage1, budget=SimplificationBudget(max_coordinates=4, max_simplify_m=500.0), stage_cache=cache)
+
     def test_smallest_wins_overlap_and_fully_covered_reporting(self) -> None:
         result = simplify_region(fixture_stage1())
         self.assertIsNotNone(result.partition_report)
@@ -563,6 +627,125 @@ class WineSimplificationTests(unittest.TestCase):
         self.assertEqual(covered.partition_report.fully_covered_app_names, ["Beta"])
         self.assertEqual(covered.partition_report.fully_covered_app_count, 1)
 
+    def test_smallest_wins_differences_only_against_intersecting_smaller_apps(self) -> None:
+        geometries = {
+            "Cru": square(700400, 6600400, 200),
+            "Village": square(700200, 6600200, 800),
+            "Regional": square(700000, 6600000, 3000),
+            "Elsewhere": square(720000, 6600000, 4000),
+        }
+        frame = gpd.GeoDataFrame(
+            [
+                {"region": "Fixture", "app": app, "display_name": app, "colour": "#123456", "categorie": "AOP", "source_area_m2": geometry.area, "geometry": geometry}
+                for app, geometry in geometries.items()
+            ],
+            columns=OUTPUT_COLUMNS,
+            geometry="geometry",
+            crs="EPSG:2154",
+        )
+        partitioned, report = partition_appellations_smallest_first(frame)
+        retained = dict(zip(partitioned["app"], partitioned.geometry))
+        self.assertTrue(retained["Cru"].equals(geometries["Cru"]))
+        self.assertTrue(retained["Village"].equals(geometries["Village"].difference(geometries["Cru"])))
+        self.assertTrue(retained["Regional"].equals(geometries["Regional"].difference(geometries["Village"])))
+        self.assertTrue(retained["Elsewhere"].equals(geometries["Elsewhere"]))
+        self.assertEqual([item.app for item in report.per_app], ["Cru", "Village", "Regional", "Elsewhere"])
+        self.assertEqual(report.partially_reduced_app_names, ["Regional", "Village"])
+        self.assertEqual(report.overlap_area_after_m2, 0.0)
+
+    def test_coverage_strategy_is_refused_up_front_without_coverage_simplify(self) -> None:
+        with mock.patch("wine_pipeline.aoc_simplification.transform.COVERAGE_STRATEGY_AVAILABLE", False):
+            with self.assertRaisesRegex(ValueError, "requires shapely>=2.1"):
+                SimplificationParameters(overlap_strategy="coverage")
+            self.assertEqual(SimplificationParameters().overlap_strategy, CANONICAL_OVERLAP_STRATEGY)
+
+    @unittest.skipUnless(COVERAGE_STRATEGY_AVAILABLE, "coverage strategy requires shapely>=2.1")
+    def test_coverage_strategy_partitions_before_simplifying_shared_edges(self) -> None:
+        angles = np.linspace(0, 2 * np.pi, 180, endpoint=False)
+
+        def wavy(x: float, y: float, radius: float, phase: float) -> Polygon:
+            radii = radius * (1 + 0.05 * np.sin(angles * 23 + phase))
+            return Polygon(np.column_stack((x + radii * np.cos(angles), y + radii * np.sin(angles))))
+
+        stage1 = stage1_rows(
+            [
+                stage1_feature(id_app="1", app="Regional", geometry=wavy(700000, 6600000, 6000, 0.0)),
+                stage1_feature(id_app="2", app="Village", geometry=wavy(704000, 6600000, 3000, 1.0)),
+                stage1_feature(id_app="3", app="Cru", geometry=wavy(705500, 6601000, 900, 2.0)),
+                stage1_feature(id_app="4", app="Twin", geometry=wavy(705500, 6601000, 900, 2.0)),
+            ]
+        )
+        expected = partition_appellations_smallest_first(simplify_region(stage1, parameters=SimplificationParameters(simplify_m=0.0)).closed)[1]
+
+        with mock.patch(
+            "wine_pipeline.aoc_simplification.transform.partition_appellations_smallest_first"
+        ) as independent:
+            result = simplify_region(stage1, parameters=SimplificationParameters(overlap_strategy="coverage"))
+        independent.assert_not_called()
+
+        report = result.partition_report
+        assert report is not None
+        self.assertEqual(report.strategy, "coverage")
+        self.assertEqual(report.fully_covered_app_names, expected.fully_covered_app_names)
+        self.assertEqual(report.partially_reduced_app_names, expected.partially_reduced_app_names)
+        for coverage_app, independent_app in zip(report.per_app, expected.per_app):
+            self.assertEqual(coverage_app.app, independent_app.app)
+            self.assertAlmostEqual(coverage_app.final_area_m2, independent_app.final_area_m2, delta=1e-3)
+        self.assertTrue(shapely.coverage_is_valid(result.partitioned.geometry.to_numpy()))
+        self.assertTrue(result.simplified.geometry.geom_equals_exact(result.partitioned.geometry, 0).all())
+        self.assertEqual(result.overlap_after.overlap_area_m2, 0.0)
+        self.assertLess(
+            shapely.get_num_coordinates(result.partitioned.geometry.to_numpy()).sum(),
+            shapely.get_num_coordinates(result.closed.geometry.to_numpy()).sum(),
+        )
+        removed = dict(zip(result.removed_overlap["app"], result.removed_overlap.geometry.area))
+        self.assertLess(removed.get("Cru", 0.0), report.overlap_tolerance_m2)
+        self.assertEqual(report.fully_covered_app_names, ["Twin"])
+        self.assertAlmostEqual(removed["Twin"], expected.per_app[1].original_area_m2, delta=1e-3)
+
+    def test_overlap_metrics_use_pairwise_intersections_and_memoize(self) -> None:
+        pairwise = gpd.GeoDataFrame(
+            geometry=[square(0, 0, 100), square(50, 0, 100), square(300, 0, 100), square(400, 0, 100)],
+            crs="EPSG:2154",
+        )
+        nested = gpd.GeoDataFrame(
+            geometry=[square(0, 0, 100), square(10, 10, 50), square(20, 20, 10)],
+            crs="EPSG:2154",
+        )
+        with mock.patch("wine_pipeline.aoc_simplification.transform.unary_union", wraps=unary_union) as union:
+            pairwise_metrics = calculate_overlap_metrics(pairwise)
+            union.assert_not_called()
+            nested_metrics = calculate_overlap_metrics(nested)
+            union.assert_called_once()
+            self.assertIs(calculate_overlap_metrics(nested.iloc[::-1]), nested_metrics)
+            union.assert_called_once()
+        self.assertEqual(pairwise_metrics, OverlapMetrics(40_000.0, 35_000.0, 5_000.0))
+        self.assertEqual(nested_metrics, OverlapMetrics(12_600.0, 10_000.0, 2_600.0))
+
+    def test_frame_metrics_count_vectorized_and_estimate_geojson_size(self) -> None:
+        holed = square(703000, 6600000, 1000).difference(square(703200, 6600200, 100))
+        frame = gpd.GeoDataFrame(
+            {
+                "app": ["Côte", "Cru", None],
+                "source_area_m2": [1.5, 2.0, float("nan")],
+            },
+            geometry=[
+                MultiPolygon([square(700000, 6600000, 1000), holed]),
+                square(706000, 6600000, 500),
+                None,
+            ],
+            crs="EPSG:2154",
+        )
+        metrics = metrics_for_frame(frame)
+        exact_mb = len(reproject_for_output(frame).to_json().encode("utf-8")) / (1024 * 1024)
+
+        self.assertEqual(metrics["coordinate_count"], 20)
+        self.assertEqual(metrics["polygon_part_count"], 3)
+        self.assertEqual(metrics["empty_geometry_count"], 1)
+        self.assertEqual(polygon_part_count([GeometryCollection([frame.geometry.iloc[0], LineString([(0, 0), (1, 1)])])]), 2)
+        self.assertAlmostEqual(approximate_geojson_size_mb(frame), exact_mb, delta=exact_mb * 0.01)
+        self.assertAlmostEqual(approximate_geojson_size_mb(frame, calibration_sample_size=0), exact_mb, delta=exact_mb * 0.05)
+
     def test_residual_overlap_inside_numerical_tolerance_is_none(self) -> None:
         metrics = OverlapMetrics(
             summed_app_area_m2=1_000_000.0,
@@ -8,10 +8,15 @@ import unittest
 from unittest import mock
 
 import geopandas as gpd
+import numpy as np
 from shapely.geometry import Polygon
 
+from wine_pipeline.aoc_simplification.adaptive import SimplificationBudget
 from wine_pipeline.aoc_simplification.batch import discover_regions, run_batch
 from wine_pipeline.aoc_simplification.runner import run_single_region as real_run_single_region
+from wine_pipeline.aoc_simplification.shards import shard_stage1_source
+from wine_pipeline.pipeline import main as pipeline_main
+from wine_pipeline.provenance import sha256_file
 from wine_pipeline.aoc_simplification.transform import OUTPUT_COLUMNS
 
 
@@ -126,6 +131,146 @@ class WineSimplificationBatchTests(unittest.TestCase):
             self.assertFalse(result.passed)
             self.assertEqual(len(result.failed_regions), 3)
 
+    def test_parallel_jobs_write_the_same_reports_as_sequential_run(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            input_path = write_fixture(root / "stage1" / "aoc_regions.gpkg")
+            with mock.patch("wine_pipeline.aoc_simplification.runner.write_plots", side_effect=fake_write_plots):
+                sequential = run_batch(input_path=input_path, run_id="sequential", output_root=root / "out")
+                parallel = run_batch(input_path=input_path, run_id="parallel", output_root=root / "out", jobs=2)
+            self.assertTrue(parallel.passed)
+            self.assertEqual(parallel.completed_regions, ["Alpha", "Beta", "Gamma"])
+            self.assertEqual(read_json(parallel.run_dir / "batch_summary.json"), read_json(sequential.run_dir / "batch_summary.json"))
+            self.assertEqual(read_json(parallel.run_dir / "validation.json"), read_json(sequential.run_dir / "validation.json"))
+            self.assertEqual(review_rows(parallel.run_dir / "region_review.csv"), review_rows(sequential.run_dir / "region_review.csv"))
+
+    def test_total_budget_is_split_by_source_coordinates_and_recorded_per_region(self) -> None:
+        angles = np.linspace(0, 2 * np.pi, 240, endpoint=False)
+        radii = 2000 * (1 + 0.04 * np.sin(angles * 37))
+        rows = []
+        for index, region in enumerate(("Alpha", "Beta", "Beta"), start=1):
+            row = feature(region, f"{region} {index}", 700000 + index * 10000, id_app=str(index))
+            row["geometry"] = Polygon(np.column_stack((row["geometry"].centroid.x + radii * np.cos(angles), 6600000 + radii * np.sin(angles))))
+            rows.append(row)
+        frame = gpd.GeoDataFrame(rows, geometry="geometry", crs="EPSG:2154")
+        budget = SimplificationBudget(max_coordinates=150, scope="total", max_simplify_m=400.0, resolution_m=10.0)
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            input_path = write_fixture(root / "stage1" / "aoc_regions.gpkg", frame)
+            with mock.patch("wine_pipeline.aoc_simplification.runner.write_plots", side_effect=fake_write_plots):
+                result = run_batch(input_path=input_path, run_id="budget", output_root=root / "out", budget=budget)
+            self.assertTrue(result.passed)
+            self.assertEqual(read_json(result.run_dir / "run.json")["simplification_budget"], budget.as_dict())
+            self.assertFalse(read_json(result.run_dir / "run.json")["canonical_parameter_set"])
+            limits = {}
+            for slug in ("alpha", "beta"):
+                params = read_json(result.run_dir / "regions" / slug / "params.json")
+                adaptive = params["adaptive_simplification"]
+                limits[slug] = adaptive["budget"]["max_coordinates"]
+                self.assertEqual(params["effective_parameters"]["simplify_m"], adaptive["chosen_simplify_m"])
+                self.assertLessEqual(adaptive["coordinate_count"], limits[slug])
+            self.assertEqual(limits, {"alpha": 50, "beta": 100})
+
+            with mock.patch("wine_pipeline.aoc_simplification.batch.run_single_region") as runner:
+                resumed = run_batch(input_path=input_path, run_id="budget", output_root=root / "out", budget=budget, resume=True)
+            runner.assert_not_called()
+            self.assertEqual(resumed.skipped_regions, ["Alpha", "Beta"])
+            with mock.patch("wine_pipeline.aoc_simplification.runner.write_plots", side_effect=fake_write_plots):
+                fixed = run_batch(input_path=input_path, run_id="budget", output_root=root / "out", resume=True)
+            self.assertEqual(fixed.completed_regions, ["Alpha", "Beta"])
+            self.assertIsNone(read_json(fixed.run_dir / "regions" / "alpha" / "params.json")["adaptive_simplification"])
+
+    def test_deferred_plots_stay_pending_until_rendered_and_resume_renders_them(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            input_path = write_fixture(root / "stage1" / "aoc_regions.gpkg")
+            with mock.patch("wine_pipeline.aoc_simplification.runner.write_plots", side_effect=RuntimeError("no display")):
+                deferred = run_batch(input_path=input_path, run_id="batch", output_root=root / "out", plots="deferred")
+            self.assertTrue(deferred.passed)
+            manifest = read_json(deferred.run_dir / "run.json")
+            self.assertEqual(manifest["plots"], "deferred")
+            self.assertEqual(manifest["pending_plot_regions"], ["Alpha", "Beta", "Gamma"])
+            self.assertEqual(manifest["plot_render_errors"], {"Alpha": "no display", "Beta": "no display", "Gamma": "no display"})
+            alpha = deferred.run_dir / "regions" / "alpha"
+            self.assertFalse((alpha / "preview.png").exists())
+            self.assertEqual(
+                sorted(path.name for path in (alpha / "plot_inputs").iterdir()),
+                ["partitioned.npz", "raw.npz", "removed_overlap.npz", "simplified.npz"],
+            )
+
+            with mock.patch("wine_pipeline.aoc_simplification.runner.write_plots", side_effect=fake_write_plots):
+                exit_code = pipeline_main(
+                    ["render-plots", "--run-id", "batch", "--output-root", str(root / "out"), "--region", "Alpha", "--quiet"]
+                )
+            self.assertEqual(exit_code, 0)
+            manifest = read_json(deferred.run_dir / "run.json")
+            self.assertEqual(manifest["pending_plot_regions"], ["Beta", "Gamma"])
+            self.assertEqual(manifest["plot_render_errors"], {"Beta": "no display", "Gamma": "no display"})
+
+            with mock.patch("wine_pipeline.aoc_simplification.batch.run_single_region") as runner, mock.patch(
+                "wine_pipeline.aoc_simplification.runner.write_plots", side_effect=fake_write_plots
+            ) as plots:
+                resumed = run_batch(input_path=input_path, run_id="batch", output_root=root / "out", resume=True, plots="deferred")
+            runner.assert_not_called()
+            self.assertEqual(plots.call_count, 2)
+            self.assertEqual(plots.call_args.kwargs["region"], "Gamma")
+            self.assertTrue(resumed.passed)
+            self.assertEqual(resumed.skipped_regions, ["Alpha", "Beta", "Gamma"])
+            self.assertEqual(read_json(resumed.run_dir / "run.json")["pending_plot_regions"], [])
+            self.assertEqual(read_json(resumed.run_dir / "run.json")["plot_render_errors"], {})
+            self.assertEqual((alpha / "preview.png").read_bytes(), b"fake preview_path")
+            self.assertFalse((alpha / "plot_inputs").exists())
+
+            with mock.patch("wine_pipeline.aoc_simplification.runner.write_plots") as plots:
+                off = real_run_single_region(region="Beta", input_path=input_path, run_id="off", output_root=root / "out", plots="off")
+            plots.assert_not_called()
+            self.assertEqual(off.plot_status, "off")
+            self.assertEqual(sorted(path.name for path in off.run_dir.iterdir()), ["candidate.geojson", "metrics.json", "params.json"])
+
+    def test_stage1_source_is_read_and_hashed_once_then_reused_from_shards(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            input_path = write_fixture(root / "stage1" / "aoc_regions.gpkg")
+            real_read_file = gpd.read_file
+            with mock.patch("wine_pipeline.aoc_simplification.runner.write_plots", side_effect=fake_write_plots), mock.patch(
+                "geopandas.read_file", wraps=real_read_file
+            ) as read_file, mock.patch("wine_pipeline.aoc_simplification.shards.sha256_file", wraps=sha256_file) as hasher, mock.patch(
+                "wine_pipeline.aoc_simplification.runner.sha256_file", wraps=sha256_file
+            ) as runner_hasher:
+                first = run_batch(input_path=input_path, run_id="batch", output_root=root / "out")
+                source_reads = [call for call in read_file.mock_calls if call.args and call.args[0] == input_path]
+                self.assertEqual(len(source_reads), 1)
+                self.assertEqual(hasher.call_count, 1)
+                runner_hasher.assert_not_called()
+                read_file.reset_mock()
+                second = run_batch(input_path=input_path, run_id="again", output_root=root / "out")
+                self.assertFalse([call for call in read_file.mock_calls if call.args and call.args[0] == input_path])
+            self.assertTrue(first.passed and second.passed)
+            self.assertEqual(
+                (first.run_dir / "regions" / "alpha" / "candidate.geojson").read_bytes(),
+                (second.run_dir / "regions" / "alpha" / "candidate.geojson").read_bytes(),
+            )
+            shards = shard_stage1_source(input_path, shard_root=root / "out" / ".stage1_shards")
+            self.assertEqual(shards.source_sha256, sha256_file(input_path))
+            self.assertEqual(shards.input_counts, {"Alpha": 2, "Beta": 1, "Gamma": 1})
+            self.assertEqual(read_json(first.run_dir / "regions" / "beta" / "params.json")["stage1_source_sha256"], shards.source_sha256)
+
+    def test_single_region_accepts_preselected_frame(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            input_path = write_fixture(root / "stage1" / "aoc_regions.gpkg")
+            frame = fixture_frame()
+            with mock.patch("wine_pipeline.aoc_simplification.runner.write_plots", side_effect=fake_write_plots):
+                from_path = real_run_single_region(region="Alpha", input_path=input_path, run_id="path", output_root=root / "out")
+                from_frame = real_run_single_region(
+                    region="Alpha",
+                    input_path=input_path,
+                    run_id="frame",
+                    output_root=root / "out",
+                    regional_source=frame.loc[frame["region"] == "Alpha"],
+                )
+            self.assertEqual(from_frame.candidate_path.read_bytes(), from_path.candidate_path.read_bytes())
+
     def test_normal_mode_refuses_existing_run(self) -> None:
         with tempfile.TemporaryDirectory() as tmp:
             root = Path(tmp)
@@ -169,6 +314,7 @@ class WineSimplificationBatchTests(unittest.TestCase):
             alpha_params = first.run_dir / "regions" / "alpha" / "params.json"
             params = read_json(alpha_params)
             params["stage1_source_sha256"] = "bad"
+            params["stage1_region_fingerprint"] = "bad"
             alpha_params.write_text(json.dumps(params), encoding="utf-8")
             beta_params = first.run_dir / "regions" / "beta" / "params.json"
             params = read_json(beta_params)
@@ -181,6 +327,101 @@ class WineSimplificationBatchTests(unittest.TestCase):
             self.assertTrue(result.passed)
             self.assertEqual([call.kwargs["region"] for call in runner.mock_calls], ["Alpha", "Beta"])
 
+    def test_resume_on_new_stage1_source_reuses_regions_with_unchanged_rows(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            first_input = write_fixture(root / "stage1" / "first" / "aoc_regions.gpkg")
+            with mock.patch("wine_pipeline.aoc_simplification.runner.write_plots", side_effect=fake_write_plots):
+                first = run_batch(input_path=first_input, run_id="batch", output_root=root / "out")
+            alpha_dir = first.run_dir / "regions" / "alpha"
+            alpha_candidate = (alpha_dir / "candidate.geojson").read_bytes()
+            first_hash = sha256_file(first_input)
+
+            changed = fixture_frame()
+            changed = changed[changed["region"] != "Gamma"].copy()
+            changed.loc[changed["region"] == "Beta", "geometry"] = square(710000, 6600000, 1600)
+            second_input = write_fixture(root / "stage1" / "second" / "aoc_regions.gpkg", changed)
+            with mock.patch("wine_pipeline.aoc_simplification.runner.write_plots", side_effect=fake_write_plots), mock.patch(
+                "wine_pipeline.aoc_simplification.batch.run_single_region", side_effect=real_run_single_region
+            ) as runner:
+                result = run_batch(input_path=second_input, run_id="batch", output_root=root / "out", resume=True)
+
+            self.assertTrue(result.passed)
+            self.assertEqual([call.kwargs["region"] for call in runner.mock_calls], ["Beta"])
+            self.assertEqual(result.skipped_regions, ["Alpha"])
+            self.assertEqual((alpha_dir / "candidate.geojson").read_bytes(), alpha_candidate)
+            alpha_params = read_json(alpha_dir / "params.json")
+            self.assertEqual(alpha_params["stage1_source_sha256"], sha256_file(second_input))
+            self.assertEqual(alpha_params["stage1_source_path"], str(second_input))
+            self.assertEqual(alpha_params["reused_from_stage1_source_sha256"], first_hash)
+            self.assertFalse((first.run_dir / "regions" / "gamma").exists())
+            self.assertFalse((first.run_dir / ".obsolete_regions").exists())
+            run = read_json(result.run_dir / "run.json")
+            self.assertEqual(run["reused_from_earlier_stage1_source"], {"Alpha": first_hash})
+            self.assertEqual(run["obsolete_regions_set_aside"], [])
+            self.assertEqual(run["expected_region_inventory"], ["Alpha", "Beta"])
+
+    def test_resume_regenerates_regions_stage1_reports_as_affected(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            first_input = write_fixture(root / "wine" / "first" / "candidates" / "aoc_regions.gpkg")
+            changed = fixture_frame()
+            changed.loc[changed["region"] == "Gamma", "geometry"] = square(720000, 6600000, 1400)
+            second_input = write_fixture(root / "wine" / "second" / "candidates" / "aoc_regions.gpkg", changed)
+            (root / "wine" / "second" / "run-report.json").write_text(
+                json.dumps(
+                    {
+                        "candidates": {"aoc_regions": str(second_input)},
+                        "appellation_changes": {"previous_run_id": "first", "affected_regions": ["Beta", "Gamma"]},
+                    }
+                ),
+                encoding="utf-8",
+            )
+            def run_id_from_layout(path: Path, *, project_root: Path) -> str:
+                return path.parent.parent.name
+
+            with mock.patch("wine_pipeline.aoc_simplification.runner.write_plots", side_effect=fake_write_plots), mock.patch(
+                "wine_pipeline.aoc_simplification.batch.infer_stage1_run_id", side_effect=run_id_from_layout
+            ), mock.patch("wine_pipeline.aoc_simplification.runner.infer_stage1_run_id", side_effect=run_id_from_layout):
+                run_batch(input_path=first_input, run_id="batch", output_root=root / "out")
+                with mock.patch("wine_pipeline.aoc_simplification.batch.run_single_region", side_effect=real_run_single_region) as runner:
+                    result = run_batch(input_path=second_input, run_id="batch", output_root=root / "out", resume=True)
+
+            self.assertTrue(result.passed)
+            self.assertEqual([call.kwargs["region"] for call in runner.mock_calls], ["Beta", "Gamma"])
+            self.assertEqual(result.skipped_regions, ["Alpha"])
+            run = read_json(result.run_dir / "run.json")
+            self.assertEqual(list(run["reused_from_earlier_stage1_source"]), ["Alpha"])
+            self.assertEqual(
+                run["stage1_appellation_changes"],
+                {
+                    "previous_stage1_run_id": "first",
+                    "affected_regions": ["Beta", "Gamma"],
+                    "regenerated_with_unchanged_rows": ["Beta"],
+                },
+            )
+
+    def test_failed_resume_keeps_obsolete_regions_set_aside(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            first_input = write_fixture(root / "stage1" / "first" / "aoc_regions.gpkg")
+            with mock.patch("wine_pipeline.aoc_simplification.runner.write_plots", side_effect=fake_write_plots):
+                first = run_batch(input_path=first_input, run_id="batch", output_root=root / "out")
+            gamma_candidate = (first.run_dir / "regions" / "gamma" / "candidate.geojson").read_bytes()
+
+            changed = fixture_frame()
+            changed = changed[changed["region"] != "Gamma"].copy()
+            changed.loc[changed["region"] == "Beta", "geometry"] = square(710000, 6600000, 1600)
+            second_input = write_fixture(root / "stage1" / "second" / "aoc_regions.gpkg", changed)
+            with mock.patch("wine_pipeline.aoc_simplification.batch.run_single_region", side_effect=RuntimeError("beta failed")):
+                result = run_batch(input_path=second_input, run_id="batch", output_root=root / "out", resume=True)
+
+            self.assertFalse(result.passed)
+            self.assertFalse((first.run_dir / "regions" / "gamma").exists())
+            aside = first.run_dir / ".obsolete_regions" / "gamma" / "candidate.geojson"
+            self.assertEqual(aside.read_bytes(), gamma_candidate)
+            self.assertEqual(read_json(result.run_dir / "run.json")["obsolete_regions_set_aside"], ["gamma"])
+
     def test_transactional_overwrite_preserves_prior_batch_on_failure(self) -> None:
         with tempfile.TemporaryDirectory() as tmp:
             root = Path(tmp)
@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+import csv
+import json
+from pathlib import Path
+import tempfile
+import unittest
+from unittest import mock
+
+import geopandas as gpd
+from pyproj import CRS
+from shapely.geometry import Polygon
+
+from wine_pipeline.aoc_simplification.stage_cache import StageCache, read_frame, stage_key, write_frame
+from wine_pipeline.aoc_simplification.sweep import SWEEP_COLUMNS, run_sweep
+from wine_pipeline.aoc_simplification.transform import SimplificationParameters, select_region, simplify_region
+
+
+def ring(x0: float, y0: float, size: float) -> Polygon:
+    return Polygon([
+        (x0, y0),
+        (x0 + size / 2, y0 - 40),
+        (x0 + size, y0),
+        (x0 + size + 30, y0 + size / 2),
+        (x0 + size, y0 + size),
+        (x0, y0 + size),
+    ])
+
+
+def fixture_frame() -> gpd.GeoDataFrame:
+    rows = []
+    for index, (region, app, geometry) in enumerate((
+        ("Alpha", "Alpha Broad", ring(700000, 6600000, 8000)),
+        ("Alpha", "Alpha Cru", ring(702000, 6602000, 2000)),
+        ("Alpha", "Alpha Cru", ring(702500, 6604500, 900)),
+        ("Beta", "Beta AOC", ring(720000, 6600000, 5000)),
+    ), start=1):
+        rows.append({
+            "id_app": str(index),
+            "app": app,
+            "display_name": app,
+            "dt": "Tours",
+            "region": region,
+            "region_method": "spatial_majority",
+            "overlap_ratio": 1.0,
+            "colour": "#123456",
+            "categorie": "AOP",
+            "geometry": geometry,
+        })
+    return gpd.GeoDataFrame(rows, geometry="geometry", crs="EPSG:2154")
+
+
+def write_fixture(path: Path) -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fixture_frame().to_file(path, layer="aocs_france", driver="GPKG", index=False)
+    return path
+
+
+def stage_snapshot(stages) -> dict[str, object]:
+    return {
+        name: (frame.drop(columns="geometry").to_dict("records"), [geometry.wkb for geometry in frame.geometry], str(frame.crs))
+        for name, frame in (
+            ("repaired", stages.repaired),
+            ("dissolved", stages.dissolved),
+            ("closed", stages.closed),
+            ("simplified", stages.simplified),
+            ("final", stages.final),
+        )
+    }
+
+
+class WineSimplificationSweepTests(unittest.TestCase):
+    def test_cached_stages_match_uncached_run_in_memory_and_on_disk(self) -> None:
+        selected = select_region(fixture_frame(), "Alpha")
+        parameters = SimplificationParameters(buffer_m=200.0, simplify_m=50.0)
+        expected = stage_snapshot(simplify_region(selected, parameters=parameters))
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp) / "stage_cache"
+            first = StageCache(root)
+            self.assertEqual(stage_snapshot(simplify_region(selected, parameters=parameters, stage_cache=first)), expected)
+            self.assertEqual(stage_snapshot(simplify_region(selected, parameters=parameters, stage_cache=first)), expected)
+            self.assertEqual(len(list(root.glob("*.npz"))), 4)
+
+            reloaded = StageCache(root)
+            self.assertEqual(stage_snapshot(simplify_region(selected, parameters=parameters, stage_cache=reloaded)), expected)
+            self.assertEqual(reloaded.hits, {"repaired": 1, "dissolved": 1, "closed": 1, "simplified": 1})
+            self.assertEqual(sum(reloaded.misses.values()), 0)
+
+    def test_written_frames_keep_a_custom_crs(self) -> None:
+        renamed = CRS("EPSG:2154").to_wkt().replace('"RGF93 v1 / Lambert-93"', '"Custom Lambert"', 1)
+        frame = select_region(fixture_frame(), "Alpha").set_crs(renamed, allow_override=True)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "frame.npz"
+            write_frame(path, frame)
+            self.assertEqual(read_frame(path).crs.to_wkt(), frame.crs.to_wkt())
+            write_frame(path, select_region(fixture_frame(), "Alpha"))
+            self.assertEqual(str(read_frame(path).crs), "EPSG:2154")
+
+    def test_stage_keys_change_with_pipeline_shapely_and_geos_versions(self) -> None:
+        key = stage_key("closed", "source", buffer_m=200.0)
+        for target, value in (
+            ("wine_pipeline.aoc_simplification.stage_cache.__version__", "0.0.0"),
+            ("wine_pipeline.aoc_simplification.stage_cache.shapely.__version__", "2.0.0"),
+            ("wine_pipeline.aoc_simplification.stage_cache.shapely.geos_version", (3, 10, 0)),
+        ):
+            with self.subTest(target=target), mock.patch(target, value):
+                self.assertNotEqual(stage_key("closed", "source", buffer_m=200.0), key)
+        self.assertEqual(stage_key("closed", "source", buffer_m=200.0), key)
+
+    def test_sweep_reuses_cached_prefixes_and_writes_comparison_table(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            source = write_fixture(root / "stage1" / "aoc_regions.gpkg")
+            result = run_sweep(
+                input_path=source,
+                sweep_run_id="fixture",
+                output_root=root / "sweeps",
+                buffers=[500.0, 0.0],
+                simplifies=[150.0, 50.0],
+                overlap_strategies=["smallest-wins", "none"],
+            )
+            self.assertEqual(result.failed_count, 0)
+            self.assertEqual(len(result.rows), 16)
+            self.assertEqual(result.cache_hits, {"repaired": 14, "dissolved": 14, "closed": 12, "simplified": 8})
+            self.assertEqual(
+                [(row["region"], row["buffer_m"], row["simplify_m"], row["overlap_strategy"]) for row in result.rows[:3]],
+                [("Alpha", 0.0, 50.0, "none"), ("Alpha", 0.0, 50.0, "smallest-wins"), ("Alpha", 0.0, 150.0, "none")],
+            )
+            canonical = [row for row in result.rows if row["canonical_parameter_set"]]
+            self.assertEqual([row["region"] for row in canonical], ["Alpha", "Beta"])
+            self.assertTrue(all(row["coordinate_count"] > 0 and row["approx_geojson_size_mb"] > 0 for row in result.rows))
+
+            payload = json.loads(result.json_path.read_text(encoding="utf-8"))
+            self.assertEqual(payload["region_inventory"], ["Alpha", "Beta"])
+            self.assertEqual(len(payload["parameter_sets"]), 8)
+            self.assertEqual({path.name for path in result.run_dir.iterdir()}, {"sweep.json", "sweep.csv"})
+            with result.csv_path.open(newline="", encoding="utf-8") as handle:
+                reader = csv.DictReader(handle)
+                self.assertEqual(reader.fieldnames, SWEEP_COLUMNS)
+                self.assertEqual(len(list(reader)), 16)
+
+    def test_sweep_rejects_unknown_region(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            source = write_fixture(root / "stage1" / "aoc_regions.gpkg")
+            with self.assertRaisesRegex(ValueError, "Unknown region 'Gamma'"):
+                run_sweep(input_path=source, output_root=root / "sweeps", regions=["Gamma"])
+            self.assertFalse((root / "sweeps").exists())
+
+
+if __name__ == "__main__":
+    unittest.main()